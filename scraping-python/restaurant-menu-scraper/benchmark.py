@@ -0,0 +1,70 @@
+import argparse
+import contextlib
+import functools
+import io
+import os
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from main import RestaurantMenuScraper
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.driver_pool import DriverPool  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server():
+    """Serve the fixtures directory on a free local port and return the server with its base URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=FIXTURES_DIR))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def time_category(driver, url, extraction, runs):
+    """Scrape the same category page repeatedly and return (rows, seconds per category)."""
+    scraper = RestaurantMenuScraper(driver, extraction=extraction)
+    elapsed = 0.0
+    rows = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = scraper.scrape_category_subcategories(url, 'Pizza')
+        elapsed += time.perf_counter() - start
+    return rows, elapsed / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare WebDriver and snapshot extraction on a local menu page.')
+    parser.add_argument('--runs', type=int, default=10, help='Times to scrape the category page in each mode.')
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    url = f'{base_url}/category_pizza.html'
+    pool = DriverPool(max_size=1)
+    try:
+        with pool.driver() as driver:
+            webdriver_rows, webdriver_time = time_category(driver, url, 'webdriver', args.runs)
+            snapshot_rows, snapshot_time = time_category(driver, url, 'snapshot', args.runs)
+    finally:
+        pool.close()
+        server.shutdown()
+
+    identical = webdriver_rows == snapshot_rows
+    print(f"rows: {len(snapshot_rows)} per category, identical: {identical}")
+    print(f"webdriver: {webdriver_time * 1000:8.1f} ms per category")
+    print(f"snapshot:  {snapshot_time * 1000:8.1f} ms per category")
+    print(f"speedup:   {webdriver_time / snapshot_time:.2f}x")
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,33 +1,93 @@
+import os
+import sys
 import time
-import pandas as pd
-from selenium.webdriver.common.by import By
-from seleniumbase import Driver
-from seleniumbase.common.exceptions import TimeoutException
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree, html
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.archive import PageArchive  # noqa: E402
+from scraping_common.driver_pool import DriverPool  # noqa: E402
+from scraping_common.exporters import open_exporter  # noqa: E402
+from scraping_common.lean_driver import Backoff, create_driver  # noqa: E402
+from scraping_common.metrics import METRICS  # noqa: E402
+from scraping_common.records import MenuItem, column_types  # noqa: E402
+
+MENU_COLUMNS = list(MenuItem.columns)
+
+# Precompiled selectors for single-snapshot extraction; they mirror the WebDriver XPaths used below
+SUBCATEGORY_SECTIONS_XPATH = etree.XPath('//section[contains(@class, "card category category-order__")]')
+SUBCATEGORY_NAME_XPATH = etree.XPath('(.//header//h2)[1]')
+PRODUCTS_XPATH = etree.XPath('.//div[contains(@class, "media--national-menu-product")]')
+PRODUCT_NAME_XPATH = etree.XPath('(.//h3[@class="media__title"]//a)[1]')
+PRODUCT_DESCRIPTION_XPATH = etree.XPath('(.//div[contains(@class,"media__product-description")])[1]')
+PRODUCT_PRICE_XPATH = etree.XPath('(.//div[@class="subtext " or @class="subtext media__product-price"])[1]')
+# Like WebDriver's .text, leave out the contents of elements that are never rendered
+TEXT_AND_BR_XPATH = etree.XPath('.//text()[not(ancestor::script or ancestor::style or ancestor::noscript)] | .//br')
+
+
+def element_text(elements):
+    """Return the first element's text the way WebDriver's .text renders it: <br> as line breaks, spaces collapsed."""
+    if not elements:
+        return ''
+    # Text nodes and <br> elements in document order; the tree is only read, so it can be parsed again
+    text = ''.join(part if isinstance(part, str) else '\n' for part in TEXT_AND_BR_XPATH(elements[0]))
+    lines = (' '.join(line.split()) for line in text.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def parse_archived_page(html_content, url, label):
+    """Parse an archived category page, whose label is the category name, in a re-parse worker process."""
+    return RestaurantMenuScraper.parse_category_page(html_content, label)
 
 
 class RestaurantMenuScraper:
-    def __init__(self):
-        """Initialize the Selenium driver."""
-        self.driver = Driver(headless2=True)
+    def __init__(self, driver=None, extraction='snapshot', archive=None):
+        """Initialize the Selenium driver, or use a driver leased from a DriverPool.
+
+        Args:
+            driver: An existing driver to use instead of launching a new one.
+            extraction (str): 'snapshot' parses one page-source snapshot per category with lxml;
+                'webdriver' queries every field through the driver.
+            archive (PageArchive): Optional archive that keeps every category page's source, so it can be
+                re-parsed later with --from-archive instead of being loaded in the browser again.
+        """
+        if extraction not in ('snapshot', 'webdriver'):
+            raise ValueError(f"Unknown extraction mode '{extraction}'. Choose 'snapshot' or 'webdriver'.")
+        self.owns_driver = driver is None
+        self.driver = driver or create_driver(headless2=True)
+        self.extraction = extraction
+        self.archive = archive
+        self.backoff = Backoff()
 
     def fetch_html(self, url, wait_element='body', retries=3, max_wait_time=15):
         """Fetch HTML content from the given URL with retry logic."""
+        # Selenium is only imported by the browser paths, so --from-archive and --help start without it
+        from selenium.webdriver.common.by import By
+        from seleniumbase.common.exceptions import TimeoutException
+
         for attempt in range(retries):
             try:
-                self.driver.open(url)
-                self.driver.wait_for_element(wait_element, by=By.XPATH, timeout=max_wait_time)
+                with METRICS.timer('navigate'):
+                    self.driver.open(url)
+                with METRICS.timer('wait_for_element'):
+                    self.driver.wait_for_element(wait_element, by=By.XPATH, timeout=max_wait_time)
                 return True
             except TimeoutException:
                 print(f"Attempt {attempt + 1} failed; retrying...")
-                time.sleep(2)
+                METRICS.count('fetch_retries')
+                time.sleep(self.backoff.delay(attempt))
         print(f"Failed to fetch page after {retries} attempts.")
+        METRICS.count('fetch_failures')
         return False
 
+    @METRICS.timed('parse_webdriver')
     def parse_subcategory_products(self, subcategory_section, category_name):
         """Parse product details within a specific subcategory section, adding category name."""
+        from selenium.webdriver.common.by import By
+
         subcategory_name = subcategory_section.find_element(By.XPATH, './/header//h2').text.strip()
         products = []
+        seen = set()
 
         product_elements = subcategory_section.find_elements(By.XPATH,
                                                              './/div[contains(@class, "media--national-menu-product")]')
@@ -38,20 +98,44 @@ class RestaurantMenuScraper:
             price = product.find_element(By.XPATH,
                                          './/div[@class="subtext " or @class="subtext media__product-price"]').text.strip() or 'N/A'
 
-            product_data = {
-                'Category': category_name,
-                'Subcategory': subcategory_name,
-                'Name': name,
-                'Description': description,
-                'Price': price
-            }
+            key = (name, description, price)
+            if name != "N/A" and price != "N/A" and key not in seen:
+                seen.add(key)
+                products.append(MenuItem(category_name, subcategory_name, name, description, price))
 
-            if name != "N/A" and price != "N/A" and product_data not in products:
-                products.append(product_data)
+        print(f"{subcategory_name} (Subcategory) -- Done Processing")
+        return products
+
+    @staticmethod
+    def parse_subcategory_products_lxml(subcategory_section, category_name):
+        """Parse product details within a subcategory section of a page-source snapshot, adding category name."""
+        subcategory_name = element_text(SUBCATEGORY_NAME_XPATH(subcategory_section))
+        products = []
+        seen = set()
+
+        for product in PRODUCTS_XPATH(subcategory_section):
+            name = element_text(PRODUCT_NAME_XPATH(product)) or 'N/A'
+            description = element_text(PRODUCT_DESCRIPTION_XPATH(product)) or 'N/A'
+            price = element_text(PRODUCT_PRICE_XPATH(product)) or 'N/A'
+
+            key = (name, description, price)
+            if name != "N/A" and price != "N/A" and key not in seen:
+                seen.add(key)
+                products.append(MenuItem(category_name, subcategory_name, name, description, price))
 
         print(f"{subcategory_name} (Subcategory) -- Done Processing")
         return products
 
+    @staticmethod
+    @METRICS.timed('parse')
+    def parse_category_page(html_content, category_name):
+        """Parse every subcategory of a category page from a single page-source snapshot."""
+        tree = html.fromstring(html_content)
+        all_products = []
+        for section in SUBCATEGORY_SECTIONS_XPATH(tree):
+            all_products.extend(RestaurantMenuScraper.parse_subcategory_products_lxml(section, category_name))
+        return all_products
+
     def scrape_category_subcategories(self, category_url, category_name):
         """Scrape products for subcategories within a single category."""
         all_products = []
@@ -61,6 +145,20 @@ class RestaurantMenuScraper:
 
         print(f"{category_name} (Category) -- Processing")
 
+        page_source = None
+        if self.extraction == 'snapshot' or self.archive:
+            # One page-source round-trip instead of 3N+1 WebDriver calls per subcategory
+            with METRICS.timer('page_source'):
+                page_source = self.driver.get_page_source()
+        if self.archive:
+            with METRICS.timer('archive'):
+                self.archive.put('restaurant', category_url, page_source, label=category_name)
+
+        if self.extraction == 'snapshot':
+            return self.parse_category_page(page_source, category_name)
+
+        from selenium.webdriver.common.by import By
+
         subcategory_sections = self.driver.find_elements(By.XPATH,
                                                          '//section[contains(@class, "card category category-order__")]')
         for section in subcategory_sections:
@@ -70,77 +168,91 @@ class RestaurantMenuScraper:
         return all_products
 
     def close(self):
-        """Close the Selenium driver."""
-        self.driver.quit()
+        """Close the Selenium driver unless it belongs to a pool."""
+        if self.owns_driver:
+            self.driver.quit()
 
 
-def get_categories(url):
+def get_categories(url, pool):
     """Fetch category URLs and names from the main menu page."""
-    category_card = '//div[contains(@class, "card__body category-panel")]'
-    temp_scraper = RestaurantMenuScraper()
-
-    if not temp_scraper.fetch_html(url, category_card):
-        temp_scraper.close()
-        return []
-
-    category_elements = temp_scraper.driver.find_elements(By.XPATH, f'{category_card}//a[@href]')
-    category_data = [
-        {
-            'url': el.get_attribute('href'),
-            'name': el.find_element(By.XPATH, './/h2[contains(@class, "media__title")]').text.strip()
-        }
-        for el in category_elements
-    ]
-
-    temp_scraper.close()
-    return category_data
-
+    from selenium.webdriver.common.by import By
 
-def main(url):
-    categories = get_categories(url)
-    print(f"Found {len(categories)} categories to process.")
+    category_card = '//div[contains(@class, "card__body category-panel")]'
 
-    all_products = []
+    with pool.driver() as driver:
+        temp_scraper = RestaurantMenuScraper(driver)
 
-    with ThreadPoolExecutor() as executor:
-        future_to_category = {
-            executor.submit(scrape_category_products, category['url'], category['name']): category
-            for category in categories
-        }
+        if not temp_scraper.fetch_html(url, category_card):
+            return []
 
-        for future in as_completed(future_to_category):
-            try:
-                category_products = future.result()
-                all_products.extend(category_products)
-            except Exception as e:
-                print(f"Error processing category: {e}")
+        category_elements = temp_scraper.driver.find_elements(By.XPATH, f'{category_card}//a[@href]')
+        category_data = [
+            {
+                'url': el.get_attribute('href'),
+                'name': el.find_element(By.XPATH, './/h2[contains(@class, "media__title")]').text.strip()
+            }
+            for el in category_elements
+        ]
 
-    save_to_excel(all_products)
+    return category_data
 
 
-def scrape_category_products(category_url, category_name):
-    """Creates a new scraper instance per category and processes products."""
-    scraper = RestaurantMenuScraper()
+def main(url, max_browsers=3, max_pages_per_browser=25, output='dominos_pizza_menu.xlsx', archive_dir=None):
+    # Browsers are reused across categories; at most max_browsers run at once, whatever the CPU count
+    pool = DriverPool(max_size=max_browsers, max_pages=max_pages_per_browser)
+    archive = PageArchive(archive_dir) if archive_dir else None
     try:
-        category_products = scraper.scrape_category_subcategories(category_url, category_name)
-        print(f"{category_name} (Category) -- Done Processing")
+        scrape_menu(url, pool, output, archive)
     finally:
-        scraper.close()
-    return category_products
+        pool.close()
+        pool.report()
+        if archive:
+            archive.close()
+
+
+def scrape_menu(url, pool, output='dominos_pizza_menu.xlsx', archive=None):
+    """Scrape every category on the menu page with drivers leased from the pool, streaming rows to output.
+
+    Categories are written alphabetically as soon as each one and those before it are done, so only the
+    categories still waiting on an earlier one are held in memory. With an archive, every category page's
+    source is kept for re-parsing with --from-archive.
+    """
+    categories = get_categories(url, pool)
+    print(f"Found {len(categories)} categories to process.")
+
+    with ThreadPoolExecutor(max_workers=pool.max_size) as executor:
+        futures = [
+            executor.submit(scrape_category_products, category['url'], category['name'], pool, archive)
+            for category in sorted(categories, key=lambda category: category['name'])  # Sort alphabetically
+        ]
 
+        with open_exporter(output, MENU_COLUMNS, types=column_types(MenuItem)) as exporter:
+            for future in futures:
+                try:
+                    category_products = future.result()
+                except Exception as e:
+                    print(f"Error processing category: {e}")
+                    continue
+                with METRICS.timer('export'):
+                    exporter.write_many(category_products)
+                METRICS.count('products', len(category_products))
 
-def save_to_excel(all_products):
-    """Save product details to an Excel file, sorted alphabetically by category."""
-    filename = "dominos_pizza_menu.xlsx"
-    if all_products:
-        df = pd.DataFrame(all_products)
-        df.sort_values(by="Category", inplace=True)  # Sort alphabetically by category
-        df.to_excel(filename, index=False)
-        print(f"Data saved to {filename}")
+    if exporter.rows_written:
+        print(f"Data saved to {output}")
     else:
         print("No products found to save.")
 
 
+def scrape_category_products(category_url, category_name, pool, archive=None):
+    """Processes one category's products with a driver leased from the pool."""
+    with pool.driver() as driver:
+        scraper = RestaurantMenuScraper(driver, archive=archive)
+        category_products = scraper.scrape_category_subcategories(category_url, category_name)
+        print(f"{category_name} (Category) -- Done Processing")
+    return category_products
+
+
 if __name__ == "__main__":
-    menu_url = 'https://www.dominospizza.ph/pages/order/menu'
-    main(menu_url)
+    # Same as python -m scraping_common.cli menu from the scraping-python folder
+    from scraping_common.cli import run
+    run(['menu', *sys.argv[1:]])
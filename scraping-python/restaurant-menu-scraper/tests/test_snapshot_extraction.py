@@ -0,0 +1,33 @@
+import importlib.util
+import os
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(PROJECT_DIR, 'fixtures')
+
+# Every project names its module main, so load this one under its own name to run next to the other projects' tests
+sys.path.insert(0, PROJECT_DIR)
+spec = importlib.util.spec_from_file_location('restaurant_main', os.path.join(PROJECT_DIR, 'main.py'))
+restaurant_main = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(restaurant_main)
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as file:
+        return file.read()
+
+
+def test_inline_script_style_and_noscript_are_not_text():
+    products = restaurant_main.RestaurantMenuScraper.parse_category_page(
+        read_fixture('category_inline_script.html'), 'Pizza')
+    assert [tuple(product) for product in products] == [
+        ('Pizza', 'Classic Pizzas', 'Hawaiian', 'Ham and pineapple\non our signature sauce.', '₱ 349.00')]
+
+
+def test_extraction_leaves_the_tree_unchanged():
+    from lxml import html
+
+    tree = html.fromstring(read_fixture('category_inline_script.html'))
+    before = html.tostring(tree)
+    restaurant_main.element_text([tree])
+    assert html.tostring(tree) == before
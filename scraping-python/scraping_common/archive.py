@@ -0,0 +1,184 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from scraping_common.exporters import open_exporter
+from scraping_common.metrics import METRICS
+
+_decompressor = None  # One per re-parse worker process; zstandard objects are not thread-safe
+
+
+class PageArchive:
+    """Content-addressed archive of raw page sources, so pages can be re-parsed later without a browser.
+
+    Each page is stored zstd-compressed under the SHA-256 of its content as pages/<2 hex>/<digest>.zst, so a page
+    fetched again unchanged, or identical pages under different URLs, are stored once. A SQLite index records
+    every fetch as (scraper, url, label, digest, fetched_at); the label is whatever the scraper needs besides the
+    page to parse it again, such as a category name. Safe to share between threads.
+    """
+
+    def __init__(self, root, level=9):
+        """Open (or create) the archive in the root directory.
+
+        Args:
+            root (str): Archive directory.
+            level (int): zstd compression level; pages are written off the browser's critical path, so a
+                higher level than zstd's default 3 costs little.
+        """
+        import zstandard
+
+        self.zstd = zstandard
+        self.root = root
+        self.level = level
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(root, 'pages'), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, 'index.sqlite3'), timeout=30, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                stored INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scraper TEXT NOT NULL,
+                url TEXT NOT NULL,
+                label TEXT,
+                digest TEXT NOT NULL REFERENCES blobs (digest),
+                fetched_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS pages_url ON pages (scraper, url, id);
+        ''')
+
+    def put(self, scraper, url, content, label=None):
+        """Archive one fetched page source and return its digest; the content is written only if it is new."""
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = blob_path(self.root, digest)
+        stored = None
+        if not os.path.exists(path):
+            with METRICS.timer('archive_compress'):
+                compressed = self.zstd.ZstdCompressor(level=self.level).compress(data)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written under a unique name and renamed, so a reader never sees a partial blob
+            temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temporary, 'wb') as file:
+                file.write(compressed)
+            os.replace(temporary, path)
+            stored = len(compressed)
+            METRICS.count('archive_pages_new')
+        else:
+            METRICS.count('archive_pages_duplicate')
+
+        with self.lock, self.conn:
+            if stored is not None:
+                self.conn.execute('INSERT OR IGNORE INTO blobs (digest, size, stored) VALUES (?, ?, ?)',
+                                  (digest, len(data), stored))
+            self.conn.execute('INSERT INTO pages (scraper, url, label, digest, fetched_at) VALUES (?, ?, ?, ?, ?)',
+                              (scraper, url, label, digest, datetime.now().isoformat(timespec='seconds')))
+        return digest
+
+    def latest(self, scraper):
+        """Return [(url, label, digest)] of the most recent fetch of every URL the scraper archived, by label and URL."""
+        with self.lock:
+            return self.conn.execute('''
+                SELECT url, label, digest FROM pages
+                WHERE id IN (SELECT MAX(id) FROM pages WHERE scraper = ? GROUP BY url)
+                ORDER BY label, url
+            ''', (scraper,)).fetchall()
+
+    def stats(self):
+        """Return the archive's fetch count, distinct pages, and raw and stored bytes of the distinct pages."""
+        with self.lock:
+            fetches, = self.conn.execute('SELECT COUNT(*) FROM pages').fetchone()
+            blobs, size, stored = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored), 0) FROM blobs').fetchone()
+        return {'fetches': fetches, 'pages': blobs, 'raw_bytes': size, 'stored_bytes': stored}
+
+    def close(self):
+        """Close the index database."""
+        with self.lock:
+            self.conn.close()
+
+
+def blob_path(root, digest):
+    """Return the path of the archived page with the given digest."""
+    return os.path.join(root, 'pages', digest[:2], f'{digest}.zst')
+
+
+def read_page(root, digest):
+    """Read and decompress one archived page source."""
+    global _decompressor
+    if _decompressor is None:
+        import zstandard
+        _decompressor = zstandard.ZstdDecompressor()
+    with open(blob_path(root, digest), 'rb') as file:
+        return _decompressor.decompress(file.read()).decode('utf-8')
+
+
+def parse_archived(root, parse, entry):
+    """Run in a worker process: parse one archived page and return its rows."""
+    url, label, digest = entry
+    return parse(read_page(root, digest), url, label)
+
+
+def reparse(root, scraper, parse, output, columns, workers=None, name=None, types=None):
+    """Parse the latest archived page of every URL the scraper fetched again, in worker processes, into one output.
+
+    No browser or network is involved, so a change of selectors or a new field can be applied to a whole crawl in
+    the time it takes to parse it. Pages are handed to the workers in chunks and their rows are written in the
+    archive's label and URL order.
+
+    Args:
+        root (str): Archive directory.
+        scraper (str): Name the pages were archived under.
+        parse (callable): Module-level function parse(html_content, url, label) returning rows; it runs in the
+            worker processes, so it must be importable from them.
+        output (str): Output file; its extension picks the format.
+        columns (list): Output columns.
+        workers (int): Worker processes; defaults to one per CPU.
+        name (str): Sheet or table name for formats that have one.
+        types (dict): Python type of each column, for the formats with typed columns.
+
+    Returns:
+        int: The number of rows written.
+    """
+    archive = PageArchive(root)
+    entries = archive.latest(scraper)
+    archive.close()
+    if not entries:
+        print(f"No {scraper} pages archived in {root}")
+        return 0
+
+    workers = workers or os.cpu_count()
+    chunksize = max(1, min(64, len(entries) // (workers * 4)))
+    start = time.perf_counter()
+    with METRICS.timer('reparse'), ProcessPoolExecutor(max_workers=workers) as executor, \
+            open_exporter(output, columns, name=name, types=types) as exporter:
+        for rows in executor.map(partial(parse_archived, root, parse), entries, chunksize=chunksize):
+            exporter.write_many(rows)
+    elapsed = time.perf_counter() - start
+
+    METRICS.count('pages_reparsed', len(entries))
+    print(f"Re-parsed {len(entries)} archived pages into {exporter.rows_written} rows in {elapsed:.1f}s "
+          f"({len(entries) / elapsed:.0f} pages/s) with {workers} processes; saved to {output}")
+    return exporter.rows_written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Show how many pages an archive holds and how well they compress.')
+    parser.add_argument('root', help='Archive directory.')
+    args = parser.parse_args()
+
+    page_archive = PageArchive(args.root)
+    summary = page_archive.stats()
+    page_archive.close()
+    ratio = summary['raw_bytes'] / summary['stored_bytes'] if summary['stored_bytes'] else 0
+    print(f"{summary['fetches']} fetches of {summary['pages']} distinct pages: "
+          f"{summary['raw_bytes'] / 2 ** 20:.1f} MiB raw, {summary['stored_bytes'] / 2 ** 20:.1f} MiB stored "
+          f"({ratio:.1f}x)")
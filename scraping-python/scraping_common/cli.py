@@ -0,0 +1,180 @@
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+from scraping_common.metrics import instrumented_run
+from scraping_common.records import column_types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subcommand -> project directory. Every project names its module main, so a process loads one project only.
+PROJECTS = {
+    'shop': 'shop-scrape-central',
+    'scores': 'sports-scores-scraper',
+    'menu': 'restaurant-menu-scraper',
+    'profiles': 'social-media-profile-scraper',
+}
+
+# Nothing heavy is imported here: each command imports its project's main module, which imports seleniumbase,
+# pandas, pyarrow or bs4 only in the code paths that use them, so a run that needs none of them starts without.
+
+
+def load_project(command):
+    """Put the command's project directory first on sys.path and import its main module."""
+    project_dir = os.path.join(ROOT, PROJECTS[command])
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+    import main
+    return main
+
+
+def parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d')
+
+
+def run_shop(args):
+    main = load_project('shop')
+    if args.from_archive:
+        from scraping_common.archive import reparse
+        with instrumented_run('shop-reparse'):
+            columns = ['Store', 'Collection'] + main.PRODUCT_COLUMNS
+            reparse(args.from_archive, 'shop', main.parse_archived_page, args.output, columns, args.workers,
+                    name='products', types=dict.fromkeys(columns, str))
+        return
+
+    archive = None
+    if args.archive:
+        from scraping_common.archive import PageArchive
+        archive = PageArchive(args.archive)
+    with instrumented_run('shop'):
+        scraper = main.ShopifyScraper(mode=args.mode, snapshot_db=args.snapshot_db, output_format=args.format,
+                                      archive=archive)
+        try:
+            if args.catalog:
+                scraper.scrape_catalog(args.url)
+            else:
+                scraper.scrape(args.url)
+        finally:
+            scraper.close()
+            if archive:
+                archive.close()
+
+
+def run_scores(args):
+    main = load_project('scores')
+    end = args.end or args.start
+    with instrumented_run('sports-scores'):
+        scraper = main.YahooSportsScoresScraper(parser=args.parser, parse_workers=args.parse_workers,
+                                                cache_dir=None if args.no_cache else args.cache_dir,
+                                                store_dir=args.store, max_rate=args.max_rate)
+        try:
+            scraper.scrape_historical_scores(args.start, end, output=args.output)
+        finally:
+            scraper.close()
+
+
+def run_menu(args):
+    main = load_project('menu')
+    if args.from_archive:
+        from scraping_common.archive import reparse
+        with instrumented_run('restaurant-menu-reparse'):
+            reparse(args.from_archive, 'restaurant', main.parse_archived_page, args.output, main.MENU_COLUMNS,
+                    args.workers, types=column_types(main.MenuItem))
+        return
+
+    with instrumented_run('restaurant-menu'):
+        main.main(args.url, args.browsers, args.pages_per_browser, args.output, args.archive)
+
+
+def run_profiles(args):
+    main = load_project('profiles')
+    from work_queue import parse_platform_options
+
+    with instrumented_run('social-profiles'):
+        number = main.scrape_profiles(args.input, args.output, args.browsers,
+                                      parse_platform_options(args.platform_limits, int),
+                                      parse_platform_options(args.platform_delays, float),
+                                      fast_path=not args.no_fast_path, journal_path=args.journal, resume=args.resume,
+                                      history_path=args.history or None, workers=args.workers, queue_path=args.queue)
+    print(f"Done Scraping {number} links")
+
+
+def build_parser():
+    """Return the argument parser with one subcommand per scraper."""
+    parser = argparse.ArgumentParser(prog='python -m scraping_common.cli',
+                                     description='Run any of the scrapers with its inputs given as arguments.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    shop = commands.add_parser('shop', help='Scrape the products of a Shopify collection or catalog.')
+    shop.add_argument('url', nargs='?', default='https://thursdayboots.com/collections/boots',
+                      help='Collection URL, or store URL with --catalog.')
+    shop.add_argument('--catalog', action='store_true', help="Scrape the store's whole catalog through products.json.")
+    shop.add_argument('--mode', choices=['json', 'rendered'], default='json', help='How to list the products.')
+    shop.add_argument('--format', choices=['xlsx', 'csv', 'jsonl', 'parquet', 'sqlite'], default='xlsx',
+                      help='Format of the saved file.')
+    shop.add_argument('--snapshot-db', default=None, help='SQLite snapshot store; save only the changes since last run.')
+    shop.add_argument('--archive', default=None, help='Keep every rendered page in this archive directory.')
+    shop.add_argument('--from-archive', default=None,
+                      help='Re-parse every page in this archive directory instead of scraping; no browser is used.')
+    shop.add_argument('--output', default='shopify_products_archive.xlsx', help='Output file for --from-archive.')
+    shop.add_argument('--workers', type=int, default=None, help='Re-parse processes; defaults to one per CPU.')
+    shop.set_defaults(run=run_shop)
+
+    yesterday = datetime.combine(datetime.now().date() - timedelta(days=1), datetime.min.time())
+    scores = commands.add_parser('scores', help='Scrape NBA scores over a date range.')
+    scores.add_argument('start', nargs='?', type=parse_date, default=yesterday,
+                        help='First date, YYYY-MM-DD; defaults to yesterday.')
+    scores.add_argument('end', nargs='?', type=parse_date, default=None, help='Last date; defaults to the first date.')
+    scores.add_argument('--output', choices=['store', 'csv', 'jsonl'], default='store',
+                        help="'store' writes the Parquet score store; csv and jsonl write one file without pandas.")
+    scores.add_argument('--store', default='nba_scores', help='Root directory of the score store.')
+    scores.add_argument('--parser', choices=['lxml', 'html.parser'], default='lxml', help='Parser backend.')
+    scores.add_argument('--parse-workers', type=int, default=None,
+                        help='Parse processes; defaults to one per CPU, 0 parses in this process.')
+    scores.add_argument('--max-rate', type=float, default=10.0, help='Requests per second allowed to the host.')
+    scores.add_argument('--cache-dir', default='.scoreboard_cache', help='Directory of the response cache.')
+    scores.add_argument('--no-cache', action='store_true', help='Fetch every page instead of using the cache.')
+    scores.set_defaults(run=run_scores)
+
+    menu = commands.add_parser('menu', help='Scrape every category of a restaurant menu.')
+    menu.add_argument('url', nargs='?', default='https://www.dominospizza.ph/pages/order/menu', help='Menu page URL.')
+    menu.add_argument('--browsers', type=int, default=3, help='Browsers to run at once.')
+    menu.add_argument('--pages-per-browser', type=int, default=25, help='Pages a browser loads before it is recycled.')
+    menu.add_argument('--output', default='dominos_pizza_menu.xlsx', help='Output file; its extension picks the format.')
+    menu.add_argument('--archive', default=None, help='Keep every category page in this archive directory.')
+    menu.add_argument('--from-archive', default=None,
+                      help='Re-parse every page in this archive directory instead of scraping; no browser is used.')
+    menu.add_argument('--workers', type=int, default=None, help='Re-parse processes; defaults to one per CPU.')
+    menu.set_defaults(run=run_menu)
+
+    profiles = commands.add_parser('profiles', help='Scrape the social media profiles listed in a text file.')
+    profiles.add_argument('input', nargs='?', default='social_media_profiles.txt',
+                          help='File with one profile URL per line.')
+    profiles.add_argument('output', nargs='?', default='social_media_profiles.xlsx',
+                          help='Output file; its extension picks the format.')
+    profiles.add_argument('--browsers', type=int, default=3, help='Warm browsers to run at once (0 for sequential).')
+    profiles.add_argument('--no-fast-path', action='store_true', help='Always scrape with a browser.')
+    profiles.add_argument('--platform-limits', default='', help='Browsers per platform, e.g. instagram=1,tiktok=2.')
+    profiles.add_argument('--platform-delays', default='', help='Seconds between profile starts per platform.')
+    profiles.add_argument('--resume', action='store_true',
+                          help='Continue the previous run of this input file, retrying only failed profiles.')
+    profiles.add_argument('--journal', default='social_media_profiles.journal.sqlite3',
+                          help='SQLite journal that every result is committed to as it finishes.')
+    profiles.add_argument('--history', default='social_media_profiles.history.sqlite3',
+                          help="SQLite follower history to append this run to; '' to skip it.")
+    profiles.add_argument('--workers', type=int, default=0,
+                          help='Scrape in this many worker processes over a shared queue instead of in this process.')
+    profiles.add_argument('--queue', default='social_media_profiles.queue.sqlite3',
+                          help='SQLite work queue shared with the workers.')
+    profiles.set_defaults(run=run_profiles)
+    return parser
+
+
+def run(argv=None):
+    """Parse the command line and run the chosen scraper."""
+    args = build_parser().parse_args(argv)
+    args.run(args)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,168 @@
+import os
+import queue
+import resource
+import threading
+from contextlib import contextmanager
+from scraping_common.lean_driver import create_driver
+from scraping_common.metrics import METRICS
+
+
+def default_driver():
+    """Launch a headless driver with the lean browser profile."""
+    return create_driver(headless2=True)
+
+
+def process_tree_rss(pid=None):
+    """Return the combined resident set size in bytes of a process and all of its descendants.
+
+    Browsers run as grandchildren (through chromedriver), so on Linux this walks /proc to include them.
+    Elsewhere it falls back to the peak RSS of this process alone.
+    """
+    pid = pid or os.getpid()
+    try:
+        children, rss = {}, {}
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as file:
+                    # The command name may contain spaces, so split after its closing parenthesis
+                    fields = file.read().rsplit(')', 1)[1].split()
+            except OSError:
+                continue
+            children.setdefault(int(fields[1]), []).append(int(entry))
+            rss[int(entry)] = int(fields[21]) * page_size
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += rss.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total
+
+
+class DriverPool:
+    """A fixed-size pool of reusable drivers, shared by the browser-based scrapers.
+
+    At most max_size browsers exist at once. Each lease loads one page; a driver is health-checked before it is
+    handed out, and it is quit and replaced after max_pages pages or as soon as a lease raises.
+    """
+
+    def __init__(self, factory=None, max_size=3, max_pages=25, rss_sample_interval=0.5):
+        """Create an empty pool; drivers are launched lazily on first use.
+
+        Args:
+            factory (callable): Returns a new driver; defaults to a headless driver with the lean browser profile.
+            max_size (int): Most drivers alive at once.
+            max_pages (int): Leases a driver serves before it is quit and replaced.
+            rss_sample_interval (float): Seconds between samples of the process tree's RSS.
+        """
+        self.factory = factory or default_driver
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.idle = queue.LifoQueue()
+        self.lock = threading.Lock()
+        self.pages = {}
+        self.launches = 0
+        self.leases = 0
+        self.recycled = 0
+        self.peak_rss = 0
+        self.stop_sampling = threading.Event()
+        self.sampler = threading.Thread(target=self.sample_rss, args=(rss_sample_interval,), daemon=True)
+        self.sampler.start()
+
+    def sample_rss(self, interval):
+        """Track the peak RSS of this process and its browsers until the pool is closed."""
+        while True:
+            self.peak_rss = max(self.peak_rss, process_tree_rss())
+            if self.stop_sampling.wait(interval):
+                break
+
+    def launch(self):
+        """Start a new driver from the factory."""
+        with METRICS.timer('browser_launch'):
+            driver = self.factory()
+        with self.lock:
+            self.launches += 1
+            self.pages[id(driver)] = 0
+        return driver
+
+    def discard(self, driver):
+        """Quit a driver and forget it, ignoring errors from browsers that already crashed."""
+        with self.lock:
+            self.pages.pop(id(driver), None)
+            self.recycled += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def is_healthy(self, driver):
+        """Check that an idle driver's browser still responds."""
+        try:
+            driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
+
+    def checkout(self):
+        """Take a healthy idle driver, or launch one if none is idle."""
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                return self.launch()
+            if self.is_healthy(driver):
+                return driver
+            self.discard(driver)
+
+    @contextmanager
+    def driver(self):
+        """Lease a driver for one page, blocking while max_size drivers are in use."""
+        with METRICS.timer('pool_wait'):
+            self.slots.acquire()
+        driver = None
+        try:
+            driver = self.checkout()
+            with self.lock:
+                self.leases += 1
+                self.pages[id(driver)] += 1
+            yield driver
+        except Exception:
+            # A failed lease may have left the browser in an unknown state, so replace it
+            if driver is not None:
+                self.discard(driver)
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                if self.pages.get(id(driver), 0) >= self.max_pages:
+                    self.discard(driver)
+                else:
+                    self.idle.put(driver)
+            self.slots.release()
+
+    def close(self):
+        """Quit every idle driver and stop RSS sampling."""
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.stop_sampling.set()
+        self.sampler.join()
+
+    def report(self):
+        """Print how many browser launches the pool saved and the peak RSS of the run."""
+        saved = self.leases - self.launches
+        print(f"Driver pool: {self.launches} launches for {self.leases} pages "
+              f"(saved {saved} launches, recycled {self.recycled}), "
+              f"peak RSS {self.peak_rss / (1024 * 1024):.0f} MiB")
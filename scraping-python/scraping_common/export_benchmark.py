@@ -0,0 +1,72 @@
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from scraping_common.exporters import EXPORTERS, open_exporter
+
+COLUMNS = ['Category', 'Subcategory', 'Name', 'Description', 'Price']
+EXTENSIONS = {'xlsx': '.xlsx', 'csv': '.csv', 'jsonl': '.jsonl', 'parquet': '.parquet', 'sqlite': '.sqlite3',
+              'pandas-xlsx': '.xlsx'}
+
+
+def generate_rows(count):
+    """Yield menu-like rows one at a time, as a scraper produces them."""
+    for i in range(count):
+        yield {
+            'Category': f'Category {i % 12}',
+            'Subcategory': f'Subcategory {i % 40}',
+            'Name': f'Product {i}',
+            'Description': f'Hand-tossed crust with tomato sauce, mozzarella and topping number {i % 97}',
+            'Price': f'{199 + i % 500}.00'
+        }
+
+
+def write(fmt, path, count):
+    """Write count rows in one format; pandas-xlsx is the previous list, DataFrame and openpyxl path."""
+    if fmt == 'pandas-xlsx':
+        import pandas as pd
+        pd.DataFrame(list(generate_rows(count))).to_excel(path, index=False, engine='openpyxl')
+        return
+    with open_exporter(path, COLUMNS, fmt, name='menu') as exporter:
+        exporter.write_many(generate_rows(count))
+
+
+def run_child(fmt, path, count):
+    """Write in this process and print the elapsed seconds and peak RSS in MiB."""
+    start = time.perf_counter()
+    write(fmt, path, count)
+    elapsed = time.perf_counter() - start
+    print(f'{elapsed} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure write time and peak RSS of each streaming exporter.')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows to write per format.')
+    parser.add_argument('--formats', nargs='+', default=list(EXPORTERS), choices=list(EXTENSIONS),
+                        help='Formats to measure; add pandas-xlsx for the DataFrame baseline.')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.path, args.rows)
+        return
+
+    print(f"{'Format':<12} {'Rows':>9} {'Seconds':>8} {'Rows/s':>9} {'Peak RSS MiB':>13} {'File MiB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in args.formats:
+            path = os.path.join(directory, f'menu_{fmt}{EXTENSIONS[fmt]}')
+            # Each format runs in a fresh interpreter so its peak RSS is not inherited from the previous one
+            output = subprocess.run([sys.executable, '-m', 'scraping_common.export_benchmark', '--child', fmt,
+                                     '--path', path, '--rows', str(args.rows)],
+                                    check=True, capture_output=True, text=True).stdout
+            elapsed, peak_rss = map(float, output.split())
+            print(f"{fmt:<12} {args.rows:>9} {elapsed:>8.1f} {args.rows / elapsed:>9.0f} {peak_rss:>13.0f} "
+                  f"{os.path.getsize(path) / 2 ** 20:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
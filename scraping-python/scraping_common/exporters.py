@@ -0,0 +1,263 @@
+import csv
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+
+# Output formats by file extension
+FORMATS = {
+    '.xlsx': 'xlsx',
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.parquet': 'parquet',
+    '.sqlite': 'sqlite',
+    '.sqlite3': 'sqlite',
+    '.db': 'sqlite',
+}
+
+
+class Exporter(ABC):
+    """Streaming writer for scraped rows: rows are written as they are produced, never collected in memory.
+
+    Subclasses write one format. Rows can be dicts keyed by column name or sequences in column order, and an
+    exporter is a context manager that closes (and finalizes) its file on exit. name is the sheet or table
+    name for the formats that have one, and is ignored by the others. types maps column names to the Python
+    type of their values (str, int, float or bool), as records.column_types returns; formats with typed
+    columns use it instead of guessing from the first rows.
+    """
+
+    def __init__(self, path, columns, name=None, types=None):
+        self.path = path
+        self.columns = list(columns)
+        self.name = name
+        self.types = dict(types or {})
+        self.rows_written = 0
+
+    def values(self, row):
+        """Return the row's values in column order."""
+        if isinstance(row, Mapping):
+            return [row.get(column) for column in self.columns]
+        return list(row)
+
+    def write(self, row):
+        """Write one row."""
+        self.write_many([row])
+
+    @abstractmethod
+    def write_many(self, rows):
+        """Write every row of an iterable."""
+
+    @abstractmethod
+    def close(self):
+        """Flush and close the output file."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ExcelExporter(Exporter):
+    """Write rows to an .xlsx sheet with xlsxwriter in constant_memory mode, which flushes each row to disk."""
+
+    def __init__(self, path, columns, name=None, types=None):
+        import xlsxwriter
+
+        super().__init__(path, columns, name, types)
+        self.workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        # Excel caps sheet names at 31 characters
+        self.worksheet = self.workbook.add_worksheet((name or 'Sheet1')[:31])
+        self.worksheet.write_row(0, 0, self.columns, self.workbook.add_format({'bold': True}))
+
+    def write_many(self, rows):
+        for row in rows:
+            self.rows_written += 1
+            self.worksheet.write_row(self.rows_written, 0, self.values(row))
+
+    def close(self):
+        self.workbook.close()
+
+
+class CsvExporter(Exporter):
+    """Write rows to a CSV file with a header line."""
+
+    def __init__(self, path, columns, name=None, types=None):
+        super().__init__(path, columns, name, types)
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+
+    def write_many(self, rows):
+        for row in rows:
+            self.writer.writerow(self.values(row))
+            self.rows_written += 1
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesExporter(Exporter):
+    """Write each row as one JSON object per line."""
+
+    def __init__(self, path, columns, name=None, types=None):
+        super().__init__(path, columns, name, types)
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write_many(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(dict(zip(self.columns, self.values(row))), ensure_ascii=False) + '\n')
+            self.rows_written += 1
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetExporter(Exporter):
+    """Write rows to a Parquet file in row groups of batch_size rows.
+
+    Every column's type is fixed when the first row group is written: from schema if one is given, else from
+    types, else from the first batch's values. A column whose first values are all None, or mix types (like a
+    score that can be 'N/A'), is written as text. Later values are converted to their column's type, so a
+    None-only first batch or an int among strings does not fail the export.
+    """
+
+    def __init__(self, path, columns, name=None, types=None, batch_size=50_000, schema=None):
+        import pyarrow.parquet as pq
+
+        super().__init__(path, columns, name, types)
+        self.pq = pq
+        self.batch_size = batch_size
+        self.schema = schema
+        self.converters = None
+        self.writer = None
+        self.batch = []
+
+    def write_many(self, rows):
+        for row in rows:
+            self.batch.append(self.values(row))
+            if len(self.batch) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one row group."""
+        if not self.batch:
+            return
+        import pyarrow as pa
+
+        columns = list(zip(*self.batch))
+        if self.writer is None:
+            if self.schema is None:
+                self.schema = pa.schema([(column, arrow_type(self.types.get(column) or infer_type(values)))
+                                         for column, values in zip(self.columns, columns)])
+            self.converters = [converter_for(field.type) for field in self.schema]
+            self.writer = self.pq.ParquetWriter(self.path, self.schema)
+        arrays = [pa.array([value if value is None else convert(value) for value in values], type=field.type)
+                  for convert, field, values in zip(self.converters, self.schema, columns)]
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self.rows_written += len(self.batch)
+        self.batch = []
+
+    def close(self):
+        self.flush()
+        if self.writer is None:
+            # No rows: still leave a readable file with every column
+            import pyarrow as pa
+            schema = self.schema or pa.schema([(column, arrow_type(self.types.get(column, str)))
+                                               for column in self.columns])
+            self.writer = self.pq.ParquetWriter(self.path, schema)
+        self.writer.close()
+
+
+def infer_type(values):
+    """Return the Python type a Parquet column of these values is written as; None-only and mixed columns are text."""
+    kinds = {type(value) for value in values if value is not None}
+    if kinds == {bool}:
+        return bool
+    if kinds == {int}:
+        return int
+    if kinds and kinds <= {int, float}:
+        return float
+    return str
+
+
+def arrow_type(python_type):
+    """Return the Arrow type a column of the given Python type (str, int, float or bool) is written as."""
+    import pyarrow as pa
+
+    return {int: pa.int64(), float: pa.float64(), bool: pa.bool_()}.get(python_type, pa.string())
+
+
+def converter_for(data_type):
+    """Return the function that converts a non-None value to a column of the given Arrow type."""
+    import pyarrow as pa
+
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        return str
+    if pa.types.is_integer(data_type):
+        return int
+    if pa.types.is_floating(data_type):
+        return float
+    if pa.types.is_boolean(data_type):
+        return bool
+    return lambda value: value
+
+
+class SqliteExporter(Exporter):
+    """Write rows to a table of a SQLite database, committing every batch_size rows."""
+
+    def __init__(self, path, columns, name=None, types=None, batch_size=10_000):
+        super().__init__(path, columns, name, types)
+        table = name or 'rows'
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        quoted = ', '.join(f'"{column}"' for column in self.columns)
+        self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self.conn.execute(f'CREATE TABLE "{table}" ({quoted})')
+        self.insert = f'INSERT INTO "{table}" ({quoted}) VALUES ({", ".join("?" * len(self.columns))})'
+        self.batch = []
+
+    def write_many(self, rows):
+        for row in rows:
+            self.batch.append(self.values(row))
+            if len(self.batch) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Insert and commit the buffered rows."""
+        with self.conn:
+            self.conn.executemany(self.insert, self.batch)
+        self.rows_written += len(self.batch)
+        self.batch = []
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+EXPORTERS = {
+    'xlsx': ExcelExporter,
+    'csv': CsvExporter,
+    'jsonl': JsonLinesExporter,
+    'parquet': ParquetExporter,
+    'sqlite': SqliteExporter,
+}
+
+
+def open_exporter(path, columns, fmt=None, name=None, types=None, **options):
+    """Open a streaming exporter for path, choosing the format from its extension unless fmt is given.
+
+    Args:
+        path (str): The output file.
+        columns (list): Column names, in output order.
+        fmt (str): One of xlsx, csv, jsonl, parquet or sqlite.
+        name (str): The sheet name for xlsx or the table name for sqlite.
+        types (dict): Python type of each column's values, e.g. records.column_types(Product), for the formats
+            with typed columns (parquet).
+        **options: Format-specific options, e.g. batch_size for parquet and sqlite.
+    """
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown output format for '{path}'. Choose from: {', '.join(FORMATS)}")
+    return EXPORTERS[fmt](path, columns, name, types, **options)
@@ -0,0 +1,54 @@
+import argparse
+import statistics
+from scraping_common.lean_driver import LeanProfile, create_driver
+
+# Sums what the page pulled over the network and reads its load milestones from the Performance API. Cross-origin
+# resources without Timing-Allow-Origin report a transferSize of 0, so bytes are a lower bound in both profiles.
+PAGE_STATS_SCRIPT = '''
+const navigation = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    bytes: resources.reduce((total, entry) => total + entry.transferSize, navigation.transferSize),
+    requests: resources.length + 1,
+    dom_ready_ms: navigation.domContentLoadedEventEnd,
+    load_ms: navigation.loadEventEnd,
+};
+'''
+
+
+def measure(url, lean, runs, uc=False):
+    """Load a URL repeatedly with the lean profile on or off and return the per-run page stats."""
+    driver = create_driver(LeanProfile(enabled=lean), headless2=True, uc=uc)
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+        stats = []
+        for _ in range(runs):
+            driver.get(url)
+            stats.append(driver.execute_script(PAGE_STATS_SCRIPT))
+        return stats
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure bytes transferred and page-ready latency with the lean '
+                                                 'browser profile on and off.')
+    parser.add_argument('urls', nargs='+', help='Pages to load, e.g. a menu category or collection page.')
+    parser.add_argument('--runs', type=int, default=3, help='Loads per URL and profile.')
+    parser.add_argument('--uc', action='store_true', help='Use undetected-chromedriver mode, as the profile scraper does.')
+    args = parser.parse_args()
+
+    print(f"{'URL':<60} {'Profile':<8} {'KiB':>9} {'Requests':>9} {'DOM ready ms':>13} {'Load ms':>9}")
+    for url in args.urls:
+        for lean in (False, True):
+            stats = measure(url, lean, args.runs, args.uc)
+            print(f"{url[:60]:<60} {'lean' if lean else 'default':<8} "
+                  f"{statistics.median(s['bytes'] for s in stats) / 1024:>9.0f} "
+                  f"{statistics.median(s['requests'] for s in stats):>9.0f} "
+                  f"{statistics.median(s['dom_ready_ms'] for s in stats):>13.0f} "
+                  f"{statistics.median(s['load_ms'] for s in stats):>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
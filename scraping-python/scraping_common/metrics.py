@@ -0,0 +1,170 @@
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+class Metrics:
+    """Thread-safe stage timers and event counters for one scraper run.
+
+    Wrap a stage in timer(stage), or decorate a function with timed(stage), to record how long every call took;
+    count(event) tallies things like retries, cache hits and fallbacks. The summary can be printed, written as
+    JSON, or written as a Prometheus textfile for node_exporter's textfile collector.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = defaultdict(list)
+        self.counters = Counter()
+
+    @contextmanager
+    def timer(self, stage):
+        """Time the enclosed block as one call of the stage, whether or not it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """Decorator that times every call of the function as the stage."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe(self, stage, seconds):
+        """Record one call of the stage that took the given seconds, e.g. when it was timed in another process."""
+        with self.lock:
+            self.durations[stage].append(seconds)
+
+    def count(self, event, amount=1):
+        """Add to an event counter."""
+        with self.lock:
+            self.counters[event] += amount
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self.lock:
+            self.durations.clear()
+            self.counters.clear()
+
+    def summary(self):
+        """Return {'stages': {stage: statistics}, 'counters': {event: count}}, with times in seconds."""
+        with self.lock:
+            durations = {stage: sorted(values) for stage, values in self.durations.items()}
+            counters = dict(self.counters)
+        stages = {}
+        for stage, values in sorted(durations.items()):
+            stages[stage] = {
+                'calls': len(values),
+                'total': sum(values),
+                'mean': sum(values) / len(values),
+                'p50': percentile(values, 0.5),
+                'p95': percentile(values, 0.95),
+                'max': values[-1],
+            }
+        return {'stages': stages, 'counters': dict(sorted(counters.items()))}
+
+    def report(self):
+        """Print the time spent in every stage, largest total first, and the event counters."""
+        summary = self.summary()
+        if summary['stages']:
+            print(f"{'Stage':<24} {'Calls':>7} {'Total s':>9} {'Mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'Max ms':>9}")
+            for stage, stats in sorted(summary['stages'].items(), key=lambda item: -item[1]['total']):
+                print(f"{stage:<24} {stats['calls']:>7} {stats['total']:>9.2f} {stats['mean'] * 1000:>9.1f} "
+                      f"{stats['p50'] * 1000:>9.1f} {stats['p95'] * 1000:>9.1f} {stats['max'] * 1000:>9.1f}")
+        for event, count in summary['counters'].items():
+            print(f"{event}: {count}")
+
+    def write_json(self, path, scraper):
+        """Write the summary as JSON."""
+        with open(path, 'w') as file:
+            json.dump({'scraper': scraper, **self.summary()}, file, indent=2)
+
+    def write_prometheus(self, path, scraper):
+        """Write the summary in the Prometheus text format, replacing the file atomically."""
+        summary = self.summary()
+        lines = [
+            '# HELP scraper_stage_seconds Time spent in each scraper stage.',
+            '# TYPE scraper_stage_seconds summary',
+        ]
+        for stage, stats in summary['stages'].items():
+            labels = f'scraper="{scraper}",stage="{stage}"'
+            lines.append(f'scraper_stage_seconds{{{labels},quantile="0.5"}} {stats["p50"]}')
+            lines.append(f'scraper_stage_seconds{{{labels},quantile="0.95"}} {stats["p95"]}')
+            lines.append(f'scraper_stage_seconds_sum{{{labels}}} {stats["total"]}')
+            lines.append(f'scraper_stage_seconds_count{{{labels}}} {stats["calls"]}')
+        lines += [
+            '# HELP scraper_events_total Events counted during the scraper run.',
+            '# TYPE scraper_events_total counter',
+        ]
+        lines += [f'scraper_events_total{{scraper="{scraper}",event="{event}"}} {count}'
+                  for event, count in summary['counters'].items()]
+        # The textfile collector may read at any moment, so never let it see a half-written file
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+        os.replace(temp_path, path)
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+# Shared by every module of a scraper, so one run is summarized in one place
+METRICS = Metrics()
+
+
+@contextmanager
+def instrumented_run(scraper):
+    """Report stage metrics when the enclosed run ends and optionally profile it, as set in the environment.
+
+    SCRAPER_METRICS names a file to write the summary to: Prometheus text if it ends in .prom, JSON otherwise.
+    SCRAPER_PROFILE=cprofile saves <scraper>.prof and prints the top functions by cumulative time;
+    SCRAPER_PROFILE=pyinstrument saves an HTML call tree to <scraper>_profile.html (pyinstrument must be installed).
+    """
+    profiler_name = os.environ.get('SCRAPER_PROFILE')
+    if profiler_name not in (None, '', 'cprofile', 'pyinstrument'):
+        raise ValueError(f"Unknown SCRAPER_PROFILE '{profiler_name}'. Choose 'cprofile' or 'pyinstrument'.")
+    profiler = None
+    if profiler_name == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif profiler_name == 'pyinstrument':
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+
+    try:
+        with METRICS.timer('run'):
+            yield METRICS
+    finally:
+        if profiler_name == 'cprofile':
+            profiler.disable()
+            profiler.dump_stats(f'{scraper}.prof')
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+            print(f"Profile saved to {scraper}.prof")
+        elif profiler_name == 'pyinstrument':
+            profiler.stop()
+            with open(f'{scraper}_profile.html', 'w') as file:
+                file.write(profiler.output_html())
+            print(f"Profile saved to {scraper}_profile.html")
+
+        METRICS.report()
+        metrics_path = os.environ.get('SCRAPER_METRICS')
+        if metrics_path:
+            if metrics_path.endswith('.prom'):
+                METRICS.write_prometheus(metrics_path, scraper)
+            else:
+                METRICS.write_json(metrics_path, scraper)
+            print(f"Metrics saved to {metrics_path}")
@@ -0,0 +1,304 @@
+import argparse
+import contextlib
+import functools
+import hashlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+import types
+from collections import namedtuple
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from scraping_common.metrics import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, 'scraping_common', 'parser_baselines.json')
+
+# One benchmark case: the project it lives in, its recorded fixtures (relative to the project), a loader that
+# imports the parser and returns (parse, pages, close), whether it drives a browser against the local fixture
+# site, and its default number of pages to parse.
+# parse(page) returns the page's rows, and close, if not None, releases what the loader started.
+Case = namedtuple('Case', ['project', 'fixtures', 'load', 'browser', 'pages'])
+
+
+def read_fixture(path):
+    with open(path, encoding='utf-8') as file:
+        return file.read()
+
+
+# Loaders run in the case's own process, after its project directory is put first on sys.path, so each one
+# imports that project's main module; the projects all name it main, which is why every case gets a process.
+
+def load_shop_parse_products(paths, base_url):
+    from main import ShopifyScraper
+    return ShopifyScraper().parse_products, [read_fixture(path) for path in paths], None
+
+
+def load_shop_parse_products_json(paths, base_url):
+    from main import ShopifyScraper
+    return ShopifyScraper().parse_products_json, [json.loads(read_fixture(path))['products'] for path in paths], None
+
+
+def load_sports_parse_scores(parser):
+    def load(paths, base_url):
+        from main import PARSERS
+        pages = [(read_fixture(path), os.path.basename(path)[len('scoreboard_'):-len('.html')]) for path in paths]
+        return lambda page: PARSERS[parser](*page), pages, None
+    return load
+
+
+def load_sports_parse_game_page(paths, base_url):
+    from games import parse_game_page
+    pages = [(read_fixture(path), os.path.basename(path)[len('game_'):-len('.html')]) for path in paths]
+    return lambda page: parse_game_page(*page)['player_stats'], pages, None
+
+
+def load_restaurant_parse_category_page(paths, base_url):
+    from main import RestaurantMenuScraper
+    scraper = RestaurantMenuScraper(driver=types.SimpleNamespace(), extraction='snapshot')  # Parsing needs no browser
+    return lambda page: scraper.parse_category_page(page, 'Pizza'), [read_fixture(path) for path in paths], None
+
+
+def load_restaurant_webdriver(paths, base_url):
+    from main import RestaurantMenuScraper
+    from scraping_common.lean_driver import create_driver
+    driver = create_driver(headless2=True)
+    scraper = RestaurantMenuScraper(driver, extraction='webdriver')
+    pages = [f'{base_url}/{os.path.basename(path)}' for path in paths]
+    return lambda url: scraper.scrape_category_subcategories(url, 'Pizza'), pages, driver.quit
+
+
+def load_social_fast_path(paths, base_url):
+    from lxml import html
+    from fast_path import EXTRACTORS
+    pages = [(os.path.basename(path).split('_')[0], read_fixture(path)) for path in paths]
+    return lambda page: [result for result in [EXTRACTORS[page[0]](html.fromstring(page[1]))] if result], pages, None
+
+
+def load_social_scrape_profile(paths, base_url):
+    from main import get_driver, scrape_profile
+    driver = get_driver()
+    # The platform's host in the path lets check_platform recognize the fixture URLs
+    hosts = {'instagram': 'www.instagram.com', 'facebook': 'www.facebook.com', 'tiktok': 'www.tiktok.com'}
+    pages = [f'{base_url}/{hosts[os.path.basename(path).split("_")[0]]}/{os.path.basename(path)}' for path in paths]
+    return lambda url: [row for row in [scrape_profile(url, driver)] if row], pages, driver.quit
+
+
+SOCIAL_FIXTURES = ['fixtures/facebook_profile.html', 'fixtures/instagram_profile.html', 'fixtures/tiktok_profile.html']
+SCOREBOARD_FIXTURES = ['fixtures/scoreboard_2024-08-01.html', 'fixtures/scoreboard_2024-10-22.html']
+
+CASES = {
+    'shop.parse_products': Case('shop-scrape-central', ['fixtures/collection_mens-boots.html'],
+                                load_shop_parse_products, False, 2000),
+    'shop.parse_products_json': Case('shop-scrape-central', ['fixtures/products_mens-boots.json'],
+                                     load_shop_parse_products_json, False, 2000),
+    'sports.parse_scores[lxml]': Case('sports-scores-scraper', SCOREBOARD_FIXTURES,
+                                      load_sports_parse_scores('lxml'), False, 2000),
+    'sports.parse_scores[html.parser]': Case('sports-scores-scraper', SCOREBOARD_FIXTURES,
+                                             load_sports_parse_scores('html.parser'), False, 500),
+    'sports.parse_game_page': Case('sports-scores-scraper',
+                                   ['fixtures/game_new-york-knicks-boston-celtics-2024102202.html'],
+                                   load_sports_parse_game_page, False, 2000),
+    'restaurant.parse_category_page': Case('restaurant-menu-scraper', ['fixtures/category_pizza.html'],
+                                           load_restaurant_parse_category_page, False, 2000),
+    'restaurant.webdriver': Case('restaurant-menu-scraper', ['fixtures/category_pizza.html'],
+                                 load_restaurant_webdriver, True, 20),
+    'social.fast_path': Case('social-media-profile-scraper', SOCIAL_FIXTURES, load_social_fast_path, False, 2000),
+    'social.scrape_profile': Case('social-media-profile-scraper', SOCIAL_FIXTURES, load_social_scrape_profile,
+                                  True, 20),
+}
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Serve a fixture by the last segment of the request path, whatever directories precede it."""
+
+    def translate_path(self, path):
+        return os.path.join(self.directory, os.path.basename(path.split('?', 1)[0]))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(directory):
+    """Serve a fixtures directory on a free local port and return the server with its base URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(FixtureHandler, directory=directory))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def current_rss():
+    """Return this process's resident set size in bytes."""
+    with open('/proc/self/statm') as file:
+        return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def reset_peak_rss():
+    """Reset this process's peak RSS to its current RSS (Linux), so the next peak covers only what follows."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+    except OSError:
+        pass  # Elsewhere the peak keeps covering the imports and set-up too
+
+
+def peak_rss():
+    """Return this process's peak resident set size in bytes since start, or since reset_peak_rss."""
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def fixture_versions(case):
+    """Return {fixture path: short sha256} of a case's fixtures, which pin the baseline to their content."""
+    versions = {}
+    for fixture in case.fixtures:
+        with open(os.path.join(ROOT, case.project, fixture), 'rb') as file:
+            versions[fixture] = hashlib.sha256(file.read()).hexdigest()[:16]
+    return versions
+
+
+def run_case(name, page_count, rounds=5):
+    """Run one case in this process and return its measurements.
+
+    The pages are parsed in rounds, and pages/sec is taken from the fastest round: interference from the rest
+    of the machine only ever slows a round down, so the best round is the most repeatable measurement.
+    """
+    case = CASES[name]
+    project = os.path.join(ROOT, case.project)
+    sys.path.insert(0, project)
+    paths = [os.path.join(project, fixture) for fixture in case.fixtures]
+    server, base_url = start_fixture_server(os.path.join(project, 'fixtures')) if case.browser else (None, None)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parse, pages, close = case.load(paths, base_url)
+        rows = sum(len(parse(page) or ()) for page in pages)  # Warm-up pass, which also counts rows per fixture set
+        rss_before = current_rss()
+        reset_peak_rss()
+        latencies = []
+        round_rates = []
+        round_size = max(1, page_count // rounds)
+        for round_start in range(0, page_count, round_size):
+            start = time.perf_counter()
+            for index in range(round_start, min(page_count, round_start + round_size)):
+                page_start = time.perf_counter()
+                parse(pages[index % len(pages)])
+                latencies.append(time.perf_counter() - page_start)
+            round_rates.append((min(page_count, round_start + round_size) - round_start) / (time.perf_counter() - start))
+        peak = peak_rss()
+        if close:
+            close()
+    if server:
+        server.shutdown()
+
+    latencies.sort()
+    return {
+        'rows': rows,
+        'pages': page_count,
+        'pages_per_sec': max(round_rates),
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'peak_rss_mib': peak / 2 ** 20,
+        # Growth over the loaded, warmed-up parser: the most memory parsing itself held at once
+        'parse_mib': max(0, peak - rss_before) / 2 ** 20,
+    }
+
+
+def check(name, result, baseline, tolerance, memory_slack):
+    """Return the reasons a case regressed against its baseline entry, or [] if it did not."""
+    problems = []
+    if baseline['fixtures'] != result['fixtures']:
+        return ['fixtures changed since the baseline was recorded; rerun with --update-baseline']
+    if result['rows'] != baseline['rows']:
+        problems.append(f"rows {result['rows']} != baseline {baseline['rows']}")
+    if result['pages_per_sec'] < baseline['pages_per_sec'] * (1 - tolerance):
+        problems.append(f"pages/sec {result['pages_per_sec']:.1f} < baseline {baseline['pages_per_sec']:.1f}")
+    if result['p50_ms'] > baseline['p50_ms'] * (1 + tolerance):
+        problems.append(f"p50 {result['p50_ms']:.2f} ms > baseline {baseline['p50_ms']:.2f} ms")
+    if result['parse_mib'] > baseline['parse_mib'] * (1 + tolerance) + memory_slack:
+        problems.append(f"parse memory {result['parse_mib']:.1f} MiB > baseline {baseline['parse_mib']:.1f} MiB")
+    return problems
+
+
+def load_baselines(path):
+    """Read the stored baselines, or an empty set if none were recorded yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['cases']
+
+
+def save_baselines(path, baselines):
+    """Write the baselines, one case per key in a stable order so that diffs stay readable."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'python': sys.version.split()[0], 'cases': dict(sorted(baselines.items()))}, file, indent=2)
+        file.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every scraper parser on its recorded fixtures.')
+    parser.add_argument('cases', nargs='*', help=f"Cases to run (default: all without a browser): {', '.join(CASES)}.")
+    parser.add_argument('--browser', action='store_true', help='Also run the cases that drive a browser.')
+    parser.add_argument('--pages', type=int, default=None, help="Pages per case instead of each case's default.")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline file to compare with.')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the new baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help='Allowed relative slowdown in pages/sec and p50, and growth in parse memory.')
+    parser.add_argument('--memory-slack', type=float, default=2.0, help='Extra parse memory allowed, in MiB.')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(args.child, args.pages or CASES[args.child].pages)))
+        return
+
+    names = args.cases or [name for name, case in CASES.items() if args.browser or not case.browser]
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+    baselines = load_baselines(args.baseline)
+
+    print(f"{'Case':<34} {'Rows':>5} {'Pages/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Peak MiB':>9} "
+          f"{'Parse MiB':>9}  Baseline")
+    failed = False
+    for name in names:
+        # Each case runs in a fresh interpreter: the projects' modules share names, and peak RSS is per process
+        output = subprocess.run([sys.executable, '-m', 'scraping_common.parser_benchmark', '--child', name]
+                                + (['--pages', str(args.pages)] if args.pages else []),
+                                cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.splitlines()[-1])
+        result['fixtures'] = fixture_versions(CASES[name])
+
+        if args.update_baseline:
+            verdict = 'updated'
+            baselines[name] = {key: round(value, 3) if isinstance(value, float) else value
+                               for key, value in result.items()}
+        elif name not in baselines:
+            verdict = 'none recorded'
+        else:
+            problems = check(name, result, baselines[name], args.tolerance, args.memory_slack)
+            verdict = 'REGRESSED: ' + '; '.join(problems) if problems else 'ok'
+            failed = failed or bool(problems)
+        print(f"{name:<34} {result['rows']:>5} {result['pages_per_sec']:>9.1f} {result['p50_ms']:>8.2f} "
+              f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['peak_rss_mib']:>9.1f} "
+              f"{result['parse_mib']:>9.1f}  {verdict}")
+
+    if args.update_baseline:
+        save_baselines(args.baseline, baselines)
+        print(f"Baseline saved to {args.baseline}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from collections import namedtuple
+from scraping_common.records import GameScore, MenuItem, Product, Profile, to_arrow, to_columns
+
+# One benchmark case: the record type, a function returning the field values of row i, and how the row was held
+# before the record types ('dict' keyed by column name, or a positional 'list').
+Case = namedtuple('Case', ['record_type', 'values', 'legacy'])
+
+COLORS = ['Natural', 'Black', 'Brown', 'Cognac', 'Tobacco', 'Olive', 'Navy', 'Burgundy']
+TEAMS = [f'Team {number}' for number in range(30)]
+CATEGORIES = ['Pizza', 'Pasta', 'Sides', 'Drinks', 'Desserts', 'Chicken']
+SUBCATEGORIES = ['Classic', 'Premium', 'Signature', 'Value']
+PLATFORMS = ['Instagram', 'TikTok', 'Facebook', 'X']
+
+
+def fresh(value):
+    """Return an equal but new string, as every parsed page yields its own copy of a repeated name."""
+    return value.encode().decode()
+
+
+CASES = {
+    'products': Case(Product, lambda i: (
+        str(7_000_000_000 + i), f'Captain Boot {i}', fresh(COLORS[i % len(COLORS)]), f'${199 + i % 100}.00'), 'dict'),
+    'scores': Case(GameScore, lambda i: (
+        fresh(f'2024-{1 + i // 3000 % 12:02d}-{1 + i // 100 % 28:02d}'), fresh(TEAMS[i % 30]), 100 + i % 30,
+        fresh(TEAMS[(i + 7) % 30]), 95 + i % 25, f'https://sports.yahoo.com/nba/game-{i}/'), 'dict'),
+    'menu': Case(MenuItem, lambda i: (
+        fresh(CATEGORIES[i % len(CATEGORIES)]), fresh(SUBCATEGORIES[i % len(SUBCATEGORIES)]), f'Item {i}',
+        f'Freshly made item number {i} with our house sauce', f'₱{299 + i % 400}.00'), 'dict'),
+    'profiles': Case(Profile, lambda i: (
+        f'user_{i}', f'{i % 1000}.{i % 10}K', f'{i % 500}K', str(i % 2000), f'https://example.com/user_{i}',
+        fresh(PLATFORMS[i % len(PLATFORMS)])), 'list'),
+}
+
+
+def measure(build, rows):
+    """Build rows with build(i) and return (bytes per row, the rows)."""
+    gc.collect()
+    tracemalloc.start()
+    built = [build(i) for i in range(rows)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / rows, built
+
+
+def run_case(name, rows):
+    """Hold the case's rows the old way and as records, and report the memory of each and the batch conversions."""
+    case = CASES[name]
+    columns, values = case.record_type.columns, case.values
+    if case.legacy == 'dict':
+        legacy = lambda i: dict(zip(columns, values(i)))  # noqa: E731
+    else:
+        legacy = lambda i: list(values(i))  # noqa: E731
+    legacy_bytes, built = measure(legacy, rows)
+    del built
+    record_type = case.record_type
+    record_bytes, records = measure(lambda i: record_type(*values(i)), rows)
+
+    start = time.perf_counter()
+    to_columns(records, record_type)
+    columns_seconds = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        to_arrow(records, record_type)
+        arrow_seconds = time.perf_counter() - start
+    except ImportError:
+        arrow_seconds = None
+    del records
+
+    arrow = f'{arrow_seconds:.2f}s' if arrow_seconds is not None else 'no pyarrow'
+    print(f"{name:<9} {case.legacy:>4} {legacy_bytes:4.0f} B/row  record {record_bytes:4.0f} B/row  "
+          f"-{1 - record_bytes / legacy_bytes:.0%}  to_columns {columns_seconds:.2f}s  to_arrow {arrow}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the memory of scraped rows held as dicts or lists and as '
+                                                 'slotted records.')
+    parser.add_argument('cases', nargs='*', help=f"Cases to run (default: all): {', '.join(CASES)}.")
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows per case.')
+    args = parser.parse_args()
+
+    names = args.cases or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+    print(f"{args.rows} rows per case; bytes per row include every string the row holds")
+    for name in names:
+        run_case(name, args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from sys import intern
+from typing import ClassVar, Optional, Union, get_args, get_type_hints
+
+
+class Record:
+    """Base of the compact row types the scrapers produce instead of one dict per row.
+
+    A record subclass is a dataclass(slots=True): one slot per field instead of a per-row dict repeating every
+    column name. Iterating a record yields its values in column order, so exporters write it like a sequence
+    row, and to_columns/to_arrow turn a batch of records into column arrays for DataFrame and Arrow writers.
+    Low-cardinality string fields (categories, teams, platforms) are interned in __post_init__, so every row of
+    a category shares one string object however many pages it came from. str() drops str subclasses such as
+    lxml's smart strings, which keep a reference to their whole document tree.
+    """
+
+    __slots__ = ()
+    columns: ClassVar[tuple] = ()  # Output column names, in field order
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # dataclass(slots=True) re-creates the class with one slot per field; read them in order at C speed
+        slots = cls.__dict__.get('__slots__', ())
+        if slots:
+            cls._get_values = staticmethod(attrgetter(*slots))
+
+    def values(self):
+        """Return the field values as a tuple in column order."""
+        return self._get_values(self)
+
+    def __iter__(self):
+        return iter(self._get_values(self))
+
+    def as_dict(self):
+        """Return the record as a dict keyed by column name."""
+        return dict(zip(self.columns, self._get_values(self)))
+
+
+@dataclass(slots=True)
+class Product(Record):
+    columns: ClassVar[tuple] = ('Product ID', 'Name', 'Color', 'Price')
+
+    product_id: Optional[str]
+    name: str
+    color: str
+    price: str
+
+    def __post_init__(self):
+        self.color = intern(str(self.color))
+
+
+@dataclass(slots=True)
+class GameScore(Record):
+    columns: ClassVar[tuple] = ('Date', 'Home Team', 'Home Score', 'Away Team', 'Away Score', 'Highlights Link')
+
+    date: str
+    home_team: str
+    home_score: Union[int, str]  # 'N/A' on the placeholder row of a date without games
+    away_team: str
+    away_score: Union[int, str]
+    highlights_link: str
+
+    def __post_init__(self):
+        self.date = intern(str(self.date))
+        self.home_team = intern(str(self.home_team))
+        self.away_team = intern(str(self.away_team))
+
+
+@dataclass(slots=True)
+class MenuItem(Record):
+    columns: ClassVar[tuple] = ('Category', 'Subcategory', 'Name', 'Description', 'Price')
+
+    category: str
+    subcategory: str
+    name: str
+    description: str
+    price: str
+
+    def __post_init__(self):
+        self.category = intern(str(self.category))
+        self.subcategory = intern(str(self.subcategory))
+
+
+@dataclass(slots=True)
+class Profile(Record):
+    columns: ClassVar[tuple] = ('Name', 'Followers', 'Likes', 'Following', 'Link', 'Social Media Platform')
+
+    name: Optional[str]
+    followers: Optional[str]
+    likes: Optional[str]
+    following: Optional[str]
+    link: str
+    platform: str
+
+    def __post_init__(self):
+        self.platform = intern(str(self.platform))
+
+
+def to_columns(records, record_type):
+    """Transpose a batch of records into {column: list of values}, ready for pandas or pyarrow."""
+    records = records if isinstance(records, list) else list(records)
+    return {column: list(map(attrgetter(name), records))
+            for column, name in zip(record_type.columns, record_type.__slots__)}
+
+
+def column_types(record_type):
+    """Return {column: Python type} of a record type for the exporters; a field that mixes types is text."""
+    hints = get_type_hints(record_type)
+    types = {}
+    for column, field in zip(record_type.columns, fields(record_type)):
+        # Optional[X] is Union[X, None]; any other union, like an int score that can be 'N/A', is written as text
+        kinds = [kind for kind in get_args(hints[field.name]) if kind is not type(None)] or [hints[field.name]]
+        types[column] = kinds[0] if len(kinds) == 1 else str
+    return types
+
+
+def to_arrow(records, record_type, schema=None):
+    """Convert a batch of records to a pyarrow Table, one column per record column, optionally cast to schema."""
+    import pyarrow as pa
+
+    columns = to_columns(records, record_type)
+    if schema is not None:
+        columns = {name: columns[name] for name in schema.names}
+    return pa.Table.from_pydict(columns, schema=schema)
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))  # For scraping_common
+from scraping_common.exporters import Exporter, open_exporter  # noqa: E402
+from scraping_common.records import GameScore, Profile, column_types  # noqa: E402
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def test_parquet_null_first_batch_then_values(tmp_path):
+    path = str(tmp_path / 'profiles.parquet')
+    with open_exporter(path, ['Name', 'Likes'], batch_size=2) as exporter:
+        exporter.write_many([('x', None), ('y', None), ('z', '1.2K')])
+    table = pq.read_table(path)
+    assert str(table.schema.field('Likes').type) == 'string'
+    assert table.column('Likes').to_pylist() == [None, None, '1.2K']
+
+
+def test_parquet_mixed_str_and_int_column(tmp_path):
+    path = str(tmp_path / 'scores.parquet')
+    rows = [GameScore('2024-10-22', 'Celtics', 132, 'Knicks', 109, 'link'),
+            GameScore('2024-10-23', 'N/A', 'N/A', 'N/A', 'N/A', 'N/A')]
+    with open_exporter(path, GameScore.columns, types=column_types(GameScore), batch_size=1) as exporter:
+        exporter.write_many(rows)
+    assert pq.read_table(path).column('Home Score').to_pylist() == ['132', 'N/A']
+
+
+def test_parquet_infers_mixed_column_as_text(tmp_path):
+    path = str(tmp_path / 'mixed.parquet')
+    with open_exporter(path, ['Score']) as exporter:
+        exporter.write_many([(132,), ('N/A',)])
+    assert pq.read_table(path).column('Score').to_pylist() == ['132', 'N/A']
+
+
+def test_parquet_declared_types_without_rows(tmp_path):
+    path = str(tmp_path / 'empty.parquet')
+    with open_exporter(path, Profile.columns, types=column_types(Profile)):
+        pass
+    assert pq.read_table(path).column_names == list(Profile.columns)
+
+
+def test_exporter_without_close_cannot_be_created(tmp_path):
+    class RowsOnly(Exporter):
+        def write_many(self, rows):
+            pass
+
+    with pytest.raises(TypeError):
+        RowsOnly(str(tmp_path / 'rows'), ['Name'])
@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+from main import PRODUCT_COLUMNS, ShopifyScraper, shop_name_of
+from snapshots import CHANGE_COLUMNS, CatalogSnapshotStore
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.archive import PageArchive  # noqa: E402
+from scraping_common.exporters import open_exporter  # noqa: E402
+from scraping_common.metrics import METRICS, instrumented_run  # noqa: E402
+
+
+def domain_of(url):
+    """Return the domain politeness limits are kept for, e.g. thursdayboots.com."""
+    return urlparse(url).netloc
+
+
+class DomainLimiter:
+    """Per-domain politeness: at most max_per_domain crawl tasks at once and a minimum delay between requests.
+
+    The task cap is enforced by MultiStoreCrawler when it submits tasks, so no worker ever waits on a domain.
+    """
+
+    def __init__(self, max_per_domain=2, delay=1.0):
+        self.max_per_domain = max_per_domain
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.next_request = defaultdict(float)
+
+    def wait(self, url):
+        """Block until the URL's domain may receive its next request."""
+        domain = domain_of(url)
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_request[domain])
+            self.next_request[domain] = start + self.delay
+        time.sleep(start - now)
+
+
+class MultiStoreCrawler:
+    """Crawl many Shopify stores and collections concurrently into one consolidated output.
+
+    The config lists stores and, optionally, their collections; a store without collections is crawled as a
+    whole catalog. A global worker cap bounds total concurrency, and tasks wait in per-domain queues until their
+    domain has a free slot, so one store with many collections cannot occupy every worker. A DomainLimiter
+    spaces each storefront's requests, and per-store timings are reported at the end so slow storefronts stand out. Each task's rows are streamed
+    to the output as soon as it finishes, in whatever format the output file's extension names.
+    """
+
+    def __init__(self, config):
+        """Create the crawler from a config dict (see stores.example.json)."""
+        self.stores = config['stores']
+        self.max_concurrency = config.get('max_concurrency', 8)
+        self.mode = config.get('mode', 'json')
+        self.output = config.get('output', 'shopify_products.xlsx')
+        self.limiter = DomainLimiter(config.get('max_per_domain', 2), config.get('delay', 1.0))
+        # With a snapshot store, only new, removed and repriced products are written out
+        self.snapshots = CatalogSnapshotStore(config['snapshot_db']) if config.get('snapshot_db') else None
+        # Rendered pages are kept for offline re-parsing with main.py --from-archive
+        self.archive = PageArchive(config['archive_dir']) if config.get('archive_dir') else None
+        self.local = threading.local()
+        self.scrapers = []
+        self.scrapers_lock = threading.Lock()
+        self.timings = defaultdict(lambda: {'tasks': 0, 'products': 0, 'busy': 0.0, 'first': None, 'last': None})
+
+    def scraper(self):
+        """Return this worker thread's scraper, so pooled sessions and any rendered-mode browser are reused."""
+        if not hasattr(self.local, 'scraper'):
+            self.local.scraper = ShopifyScraper(mode=self.mode, limiter=self.limiter, archive=self.archive)
+            with self.scrapers_lock:
+                self.scrapers.append(self.local.scraper)
+        return self.local.scraper
+
+    def tasks(self):
+        """Yield (store URL, collection handle or None) for every crawl task in the config."""
+        for store in self.stores:
+            store_url = store['url'].rstrip('/')
+            for handle in store.get('collections') or [None]:
+                yield store_url, handle
+
+    def crawl_task(self, store_url, handle):
+        """Crawl one collection (or a whole catalog) and return its rows tagged with store and collection."""
+        started = time.perf_counter()
+        scraper = self.scraper()
+        if handle:
+            products = scraper.collect_products(f'{store_url}/collections/{handle}')
+        else:
+            products = scraper.collect_catalog(store_url)
+        finished = time.perf_counter()
+
+        # A failed load must not reach the snapshot store, where it would look like every product was removed
+        if products is None:
+            raise RuntimeError('collection could not be loaded')
+        products_found = len(products)
+        if self.snapshots:
+            with METRICS.timer('snapshot_diff'):
+                products = self.snapshots.apply(shop_name_of(store_url), handle or 'catalog', products)
+
+        store, collection = shop_name_of(store_url), handle or 'catalog'
+        if self.snapshots:
+            rows = [{'Store': store, 'Collection': collection, **change} for change in products]
+        else:
+            rows = [(store, collection, *product) for product in products]
+        with self.scrapers_lock:
+            timing = self.timings[store_url]
+            timing['tasks'] += 1
+            timing['products'] += products_found
+            timing['busy'] += finished - started
+            timing['first'] = started if timing['first'] is None else min(timing['first'], started)
+            timing['last'] = finished if timing['last'] is None else max(timing['last'], finished)
+        print(f"{store_url} {handle or 'catalog'} -- {products_found} products in {finished - started:.1f}s")
+        return rows
+
+    def submit_ready(self, executor, queues, running, future_to_task):
+        """Submit queued tasks, one domain after another, while the pool and the task's domain have a free slot."""
+        submitted = True
+        while submitted and len(future_to_task) < self.max_concurrency:
+            submitted = False
+            for domain, queue in queues.items():
+                if not queue or running[domain] >= self.limiter.max_per_domain:
+                    continue
+                if len(future_to_task) >= self.max_concurrency:
+                    break
+                task = queue.popleft()
+                running[domain] += 1
+                future_to_task[executor.submit(self.crawl_task, *task)] = task
+                submitted = True
+
+    def crawl(self):
+        """Run every task under the global and per-domain concurrency caps, streaming all rows to one output file.
+
+        Returns:
+            int: The number of rows written.
+        """
+        columns = ['Store', 'Collection'] + (CHANGE_COLUMNS if self.snapshots else PRODUCT_COLUMNS)
+        try:
+            # Every crawled column is text; declared so that a column missing from the first rows is typed right
+            with open_exporter(self.output, columns, name='products', types=dict.fromkeys(columns, str)) as exporter, \
+                    ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                queues = defaultdict(deque)
+                for store_url, handle in self.tasks():
+                    queues[domain_of(store_url)].append((store_url, handle))
+                running = Counter()
+                future_to_task = {}
+                self.submit_ready(executor, queues, running, future_to_task)
+                while future_to_task:
+                    done, _ = wait(future_to_task, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task = future_to_task.pop(future)
+                        running[domain_of(task[0])] -= 1
+                        try:
+                            rows = future.result()
+                        except Exception as e:
+                            print(f"Error crawling {task}: {e}")
+                            METRICS.count('task_failures')
+                            continue
+                        with METRICS.timer('export'):
+                            exporter.write_many(rows)
+                    self.submit_ready(executor, queues, running, future_to_task)
+        finally:
+            for scraper in self.scrapers:
+                scraper.close()
+            if self.snapshots:
+                self.snapshots.close()
+            if self.archive:
+                self.archive.close()
+
+        if exporter.rows_written:
+            print(f"Data saved to {self.output}")
+        else:
+            print("No changes since the previous run." if self.snapshots else "No products found.")
+        self.report()
+        return exporter.rows_written
+
+    def report(self):
+        """Print per-store timing, slowest storefront first."""
+        print(f"{'Store':<40} {'Tasks':>5} {'Products':>8} {'Busy s':>8} {'Wall s':>8} {'s/task':>7}")
+        for store_url, timing in sorted(self.timings.items(), key=lambda item: -item[1]['busy']):
+            wall = timing['last'] - timing['first']
+            print(f"{store_url:<40} {timing['tasks']:>5} {timing['products']:>8} {timing['busy']:>8.1f} "
+                  f"{wall:>8.1f} {timing['busy'] / timing['tasks']:>7.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Crawl the Shopify stores listed in a JSON config.')
+    parser.add_argument('config', nargs='?', default='stores.example.json', help='Path to the stores config file.')
+    args = parser.parse_args()
+
+    with open(args.config) as file:
+        config = json.load(file)
+    with instrumented_run('shop-crawler'):
+        MultiStoreCrawler(config).crawl()
@@ -1,15 +1,100 @@
+import os
+import sys
 import time
-import pandas as pd
-from selenium.webdriver.common.by import By
-from seleniumbase import Driver
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+import requests
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from lxml import html
-from seleniumbase.common.exceptions import TimeoutException
+from snapshots import CHANGE_COLUMNS, CatalogSnapshotStore
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.exporters import open_exporter  # noqa: E402
+from scraping_common.lean_driver import Backoff, create_driver  # noqa: E402
+from scraping_common.metrics import METRICS  # noqa: E402
+from scraping_common.records import Product, column_types  # noqa: E402
+
+COLOR_OPTION_NAMES = ('color', 'colour')
+DEFAULT_MONEY_FORMAT = '${{amount}}'  # Shopify's default shop money format
+PRODUCT_COLUMNS = list(Product.columns)
+
+
+def store_url_of(url):
+    """Return the store origin of any store URL, e.g. https://thursdayboots.com."""
+    parsed_url = urlparse(url)
+    return f'{parsed_url.scheme}://{parsed_url.netloc}'
+
+
+def shop_name_of(url):
+    """Return the shop name used in output file names, e.g. thursdayboots for https://www.thursdayboots.com."""
+    netloc = urlparse(url).netloc
+    return netloc[4:].split('.')[0] if netloc.startswith('www.') else netloc.split('.')[0]
+
+
+def format_money(amount, money_format=DEFAULT_MONEY_FORMAT):
+    """Format a products.json price such as '1134.5' the way the storefront renders it, e.g. $1,134.50."""
+    try:
+        return money_format.replace('{{amount}}', f'{Decimal(amount):,.2f}')
+    except (InvalidOperation, TypeError):
+        return 'N/A'
+
+
+def parse_archived_page(html_content, url, label):
+    """Parse an archived category page into rows tagged with store and collection, in a re-parse worker process."""
+    store = shop_name_of(url)
+    return [(store, label, *product) for product in ShopifyScraper.parse_products(html_content)]
 
 
 class ShopifyScraper:
-    def __init__(self):
-        """Initialize the Selenium driver in headless mode."""
-        self.driver = Driver(headless2=True)
+    def __init__(self, mode='json', page_size=250, timeout=15, limiter=None, snapshot_db=None,
+                 output_format='xlsx', archive=None, money_format=DEFAULT_MONEY_FORMAT):
+        """Initialize the scraper; the headless Selenium driver is only launched when a page must be rendered.
+
+        Args:
+            mode (str): 'json' pages through the store's products.json endpoint and falls back to the rendered page
+                when the endpoint is blocked; 'rendered' always loads the page in the browser.
+            page_size (int): Products requested per products.json page (Shopify allows up to 250).
+            timeout (float): Timeout in seconds for each products.json request.
+            limiter: Optional politeness limiter whose wait(url) is called before every request to a store.
+            snapshot_db (str): Path of a SQLite snapshot store; when set, runs write only the new, removed and
+                repriced products since the previous run instead of the whole catalog.
+            output_format (str): Format of the saved files: xlsx, csv, jsonl, parquet or sqlite.
+            archive (PageArchive): Optional archive that keeps every rendered category page, so it can be
+                re-parsed later with --from-archive instead of being loaded in the browser again.
+            money_format (str): The store's money format, used to render products.json prices like the
+                storefront does, so both modes return the same prices.
+        """
+        self.mode = mode
+        self.limiter = limiter
+        self.page_size = page_size
+        self.timeout = timeout
+        self._driver = None
+        self.backoff = Backoff()
+        self.session = self.create_session()
+        self.snapshots = CatalogSnapshotStore(snapshot_db) if snapshot_db else None
+        self.output_format = output_format
+        self.archive = archive
+        self.money_format = money_format
+
+    @property
+    def driver(self):
+        """The headless Selenium driver with the lean browser profile, launched on first use."""
+        if self._driver is None:
+            self._driver = create_driver(headless2=True)
+        return self._driver
+
+    def create_session(self):
+        """Create a pooled keep-alive session with retry and backoff for the JSON endpoints."""
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(['GET']), raise_on_status=False)
+        adapter = HTTPAdapter(pool_maxsize=10, max_retries=retry)
+        session = requests.Session()
+        session.headers.update({'User-Agent': 'Mozilla/5.0', 'Accept': 'application/json'})
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
 
     def fetch_html(self, url, wait_element='body', retries=3, max_wait_time=15):
         """Fetch HTML content from the given URL with retry logic.
@@ -23,20 +108,35 @@ class ShopifyScraper:
         Returns:
             str: The HTML content of the page or None if failed.
         """
+        # Selenium is only imported once a page has to be rendered, so JSON-mode runs start without it
+        from selenium.webdriver.common.by import By
+        from seleniumbase.common.exceptions import TimeoutException
+
         for attempt in range(retries):
+            if self.limiter:
+                with METRICS.timer('politeness_wait'):
+                    self.limiter.wait(url)
             try:
-                self.driver.open(url)
-                self.driver.wait_for_element(wait_element, by=By.XPATH, timeout=max_wait_time)  # Extend wait time
-                return self.driver.get_page_source()
+                with METRICS.timer('navigate'):
+                    self.driver.open(url)
+                with METRICS.timer('wait_for_element'):
+                    self.driver.wait_for_element(wait_element, by=By.XPATH, timeout=max_wait_time)  # Extend wait time
+                with METRICS.timer('page_source'):
+                    return self.driver.get_page_source()
             except TimeoutException:
                 print(f"Attempt {attempt + 1} failed; retrying...")
-                time.sleep(2)
+                METRICS.count('fetch_retries')
+                time.sleep(self.backoff.delay(attempt))
         print(f"Failed to fetch page after {retries} attempts.")
+        METRICS.count('fetch_failures')
         return None
 
-    def parse_products(self, html_content):
-        """Parse product details from the HTML content of a category page."""
+    @staticmethod
+    @METRICS.timed('parse')
+    def parse_products(html_content):
+        """Parse the HTML content of a category page into Product records."""
         products = []
+        seen = set()
         tree = html.fromstring(html_content)
 
         product_list = tree.xpath('//ul[contains(@class, "products")]/li[contains(@class, "product")]')
@@ -49,58 +149,185 @@ class ShopifyScraper:
             price = product.xpath('.//p[contains(@class, "price")]/span[contains(@class, "money")]/text()')
             price = price[0].strip() if price else 'N/A'
 
-            product = {
-                'Product ID': product_id,
-                'Name': name,
-                'Color': color,
-                'Price': price
-            }
-
-            if name == "N/A" or color == "N/A" or price == "N/A" or product in products:
+            key = (product_id, name, color, price)
+            if name == "N/A" or color == "N/A" or price == "N/A" or key in seen:
                 continue
 
-            products.append(product)
+            seen.add(key)
+            products.append(Product(product_id, name, color, price))
 
         if not products:
             print("No products found in this category.")
 
         return products
 
+    def fetch_products_json(self, store_url, collection_handle=None):
+        """Page through a store's products.json endpoint, for one collection or the whole catalog.
+
+        Args:
+            store_url (str): The store origin, e.g. https://thursdayboots.com.
+            collection_handle (str): The collection to list, or None for every product in the catalog.
+
+        Returns:
+            list: The raw product objects, or None if the endpoint is blocked or does not return JSON.
+        """
+        path = f'/collections/{collection_handle}/products.json' if collection_handle else '/products.json'
+        products = []
+        page = 1
+        while True:
+            if self.limiter:
+                with METRICS.timer('politeness_wait'):
+                    self.limiter.wait(store_url)
+            try:
+                with METRICS.timer('fetch_json_page'):
+                    response = self.session.get(f'{store_url}{path}', params={'limit': self.page_size, 'page': page},
+                                                timeout=self.timeout)
+                response.raise_for_status()
+                page_products = response.json()['products']
+            except (requests.RequestException, ValueError, KeyError) as e:
+                print(f"products.json unavailable for {store_url}{path} (page {page}): {e}")
+                return None
+
+            products.extend(page_products)
+            print(f"Fetched page {page} of {path} ({len(page_products)} products)")
+            if len(page_products) < self.page_size:
+                return products
+            page += 1
+
+    @METRICS.timed('parse_json')
+    def parse_products_json(self, json_products):
+        """Map products.json objects to the same Product records as parse_products.
+
+        Each distinct color of a product becomes one row, matching the one-tile-per-color collection pages,
+        priced from that color's first variant in the store's money format. Products without a color option
+        are skipped, as parse_products skips tiles without a color.
+        """
+        products = []
+        seen = set()
+
+        for product in json_products:
+            color_position = next((option['position'] for option in product.get('options', [])
+                                   if option.get('name', '').lower() in COLOR_OPTION_NAMES), None)
+            product_id = str(product['id'])
+            name = product.get('title', '').strip() or 'N/A'
+            if name == "N/A" or color_position is None:
+                continue
+
+            for variant in product.get('variants', []):
+                color = (variant.get(f'option{color_position}') or 'N/A').strip()
+                key = (product_id, color)
+                # Every size of a color is its own variant; only the first one kept per color needs its price formatted
+                if color == "N/A" or key in seen:
+                    continue
+                price = format_money(variant.get('price'), self.money_format)
+                if price == "N/A":
+                    continue
+
+                seen.add(key)
+                products.append(Product(product_id, name, color, price))
+
+        return products
+
     def save_to_excel(self, shop_name, category_name, all_products):
-        """Save product details to an Excel file."""
-        df = pd.DataFrame(all_products)
-        filename = f"{shop_name}_{category_name}.xlsx"
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name=category_name, index=False)
+        """Save product details to an Excel file, or to the configured output_format, row by row."""
+        filename = f"{shop_name}_{category_name}.{self.output_format}"
+        with METRICS.timer('export'), open_exporter(filename, PRODUCT_COLUMNS, name=category_name,
+                                                          types=column_types(Product)) as exporter:
+            exporter.write_many(all_products)
         print(f"Data saved to {filename} with sheet '{category_name}'")
 
-    def scrape(self, category_url):
-        """Main function to fetch and print product details for a specific category."""
-        base_url = "https://thursdayboots.com"
+    def save_changes(self, shop_name, category_name, all_products):
+        """Record a scrape in the snapshot store and save only its changes since the previous run to Excel."""
+        with METRICS.timer('snapshot_diff'):
+            changes = self.snapshots.apply(shop_name, category_name, all_products)
+        if not changes:
+            print(f"No changes in {shop_name}/{category_name} since the previous run.")
+            return
 
-        # Adjusted to wait for a specific category section
-        category_html = self.fetch_html(category_url, wait_element='//section[contains(@class, "product-group")]', max_wait_time=20)
+        filename = f"{shop_name}_{category_name}_changes_{time.strftime('%Y%m%d_%H%M%S')}.{self.output_format}"
+        with METRICS.timer('export'), open_exporter(filename, CHANGE_COLUMNS, name=category_name,
+                                                          types=dict.fromkeys(CHANGE_COLUMNS, str)) as exporter:
+            exporter.write_many(changes)
+        counts = Counter(change['Change'] for change in changes)
+        print(f"Changes saved to {filename}: {counts.get('new', 0)} new, {counts.get('removed', 0)} removed, "
+              f"{counts.get('repriced', 0)} repriced")
 
-        if not category_html:
-            print("Unable to load category page.")
-            return
+    def save(self, shop_name, category_name, all_products):
+        """Save the full product list, or only its delta when a snapshot store is configured."""
+        if self.snapshots:
+            self.save_changes(shop_name, category_name, all_products)
+        else:
+            self.save_to_excel(shop_name, category_name, all_products)
 
-        all_products = self.parse_products(category_html)
+    def collect_products(self, category_url):
+        """Fetch and parse the products of one category, through products.json or the rendered page.
 
-        if all_products:
-            shop_name = base_url.split('//')[1].split('.')[0]
+        Returns:
+            list: The product rows, or None if the category page could not be loaded.
+        """
+        all_products = None
+
+        if self.mode == 'json':
+            json_products = self.fetch_products_json(store_url_of(category_url), category_url.rstrip('/').split('/')[-1])
+            if json_products is not None:
+                all_products = self.parse_products_json(json_products)
+            else:
+                print("Falling back to the rendered category page.")
+                METRICS.count('json_fallbacks')
+
+        if all_products is None:
+            # Adjusted to wait for a specific category section
+            category_html = self.fetch_html(category_url, wait_element='//section[contains(@class, "product-group")]', max_wait_time=20)
+
+            if not category_html:
+                print("Unable to load category page.")
+                return None
+            if self.archive:
+                with METRICS.timer('archive'):
+                    self.archive.put('shop', category_url, category_html, label=category_url.rstrip('/').split('/')[-1])
+
+            all_products = self.parse_products(category_html)
+
+        return all_products
+
+    def collect_catalog(self, store_url):
+        """Fetch and parse every product in a store's catalog through products.json, or None if it is blocked."""
+        json_products = self.fetch_products_json(store_url.rstrip('/'))
+        if json_products is None:
+            return None
+        return self.parse_products_json(json_products)
+
+    def scrape(self, category_url):
+        """Main function to fetch and print product details for a specific category."""
+        all_products = self.collect_products(category_url)
+
+        if all_products or (all_products is not None and self.snapshots):
             category_name = category_url.split('/')[-1]  # Get the last part of the category URL
-            self.save_to_excel(shop_name, category_name, all_products)
+            self.save(shop_name_of(category_url), category_name, all_products)
+        elif all_products is not None:
+            print("No products found.")
+
+    def scrape_catalog(self, store_url):
+        """Fetch every product in a store's catalog through products.json and save it to Excel."""
+        all_products = self.collect_catalog(store_url)
+
+        if all_products is None:
+            print("Unable to load the catalog; scrape its collections in rendered mode instead.")
+        elif all_products or self.snapshots:
+            self.save(shop_name_of(store_url), 'catalog', all_products)
         else:
             print("No products found.")
 
     def close(self):
-        """Close the Selenium driver."""
-        self.driver.quit()
+        """Close the Selenium driver, if one was launched, and the HTTP session."""
+        if self._driver is not None:
+            self._driver.quit()
+        self.session.close()
+        if self.snapshots:
+            self.snapshots.close()
 
 
 if __name__ == "__main__":
-    category = 'https://thursdayboots.com/collections/boots'  # Change this to your desired category URL
-    shop_scraper = ShopifyScraper()
-    shop_scraper.scrape(category)
-    shop_scraper.close()
+    # Same as python -m scraping_common.cli shop from the scraping-python folder
+    from scraping_common.cli import run
+    run(['shop', *sys.argv[1:]])
@@ -0,0 +1,142 @@
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+CHANGE_COLUMNS = ['Change', 'Product ID', 'Name', 'Color', 'Old Price', 'New Price']
+NON_AMOUNT_CHARACTERS = re.compile(r'[^0-9.,\-]')
+
+
+class CatalogSnapshotStore:
+    """Local SQLite snapshot of every scraped catalog, keyed by store, collection and product.
+
+    apply() compares a fresh scrape with the stored snapshot in one transaction, upserts it in bulk and returns
+    only the delta: new, removed and repriced products. Every change is also appended to a changes table, so the
+    history of a catalog can be queried without keeping old workbooks around.
+    """
+
+    def __init__(self, db_path='catalog_snapshots.sqlite3'):
+        """Open (or create) the snapshot database."""
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS products (
+                store TEXT NOT NULL,
+                collection TEXT NOT NULL,
+                product_id TEXT NOT NULL,
+                color TEXT NOT NULL,
+                name TEXT NOT NULL,
+                price TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                PRIMARY KEY (store, collection, product_id, color)
+            );
+            CREATE TABLE IF NOT EXISTS changes (
+                run_at TEXT NOT NULL,
+                store TEXT NOT NULL,
+                collection TEXT NOT NULL,
+                change TEXT NOT NULL,
+                product_id TEXT NOT NULL,
+                color TEXT NOT NULL,
+                name TEXT NOT NULL,
+                old_price TEXT,
+                new_price TEXT
+            );
+            CREATE INDEX IF NOT EXISTS changes_store_run ON changes (store, collection, run_at);
+        ''')
+        self.conn.commit()
+
+    def apply(self, store, collection, products):
+        """Record a fresh scrape of one collection and return its changes against the previous snapshot.
+
+        Products are Product records, keyed by Product ID and Color, since one product can be listed once per color.
+        Prices are compared as amounts, so '$1,134.50' from a rendered page and '1134.5' stored by an older JSON
+        run are the same price.
+
+        Returns:
+            list: One dict per new, removed or repriced product, with Change, Product ID, Name, Color,
+            Old Price and New Price.
+        """
+        run_at = datetime.now().isoformat(timespec='seconds')
+        # Rendered tiles without a data-product-id fall back to their name as the key
+        current = {(product.product_id or product.name, product.color): product for product in products}
+
+        with self.lock:
+            previous = {
+                (product_id, color): (name, price)
+                for product_id, color, name, price in self.conn.execute(
+                    'SELECT product_id, color, name, price FROM products WHERE store = ? AND collection = ?',
+                    (store, collection))
+            }
+
+            changes = []
+            for key, product in current.items():
+                if key not in previous:
+                    changes.append(change_row('new', key[0], product.name, product.color, None, product.price))
+                elif price_amount(previous[key][1]) != price_amount(product.price):
+                    changes.append(change_row('repriced', key[0], product.name, product.color,
+                                              previous[key][1], product.price))
+            removed = [key for key in previous if key not in current]
+            for product_id, color in removed:
+                name, price = previous[(product_id, color)]
+                changes.append(change_row('removed', product_id, name, color, price, None))
+
+            with self.conn:
+                self.conn.executemany('''
+                    INSERT INTO products (store, collection, product_id, color, name, price, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (store, collection, product_id, color)
+                    DO UPDATE SET name = excluded.name, price = excluded.price, last_seen = excluded.last_seen
+                ''', [(store, collection, product_id, color, product.name, product.price, run_at, run_at)
+                      for (product_id, color), product in current.items()])
+                self.conn.executemany(
+                    'DELETE FROM products WHERE store = ? AND collection = ? AND product_id = ? AND color = ?',
+                    [(store, collection, product_id, color) for product_id, color in removed])
+                self.conn.executemany(
+                    'INSERT INTO changes (run_at, store, collection, change, product_id, color, name, old_price,'
+                    ' new_price) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(run_at, store, collection, change['Change'], change['Product ID'], change['Color'],
+                      change['Name'], change['Old Price'], change['New Price']) for change in changes])
+
+        return changes
+
+    def close(self):
+        """Close the snapshot database."""
+        with self.lock:
+            self.conn.close()
+
+
+def price_amount(price):
+    """Return a price string as a Decimal without currency symbols or separators, or as is if it has no amount.
+
+    Both '$1,234.56' and '1.234,56 €' are 1234.56: of '.' and ',' the last one is the decimal separator,
+    unless it occurs more than once or is followed by exactly three digits, which makes it a thousands
+    separator, as in '1.234 €'.
+    """
+    digits = NON_AMOUNT_CHARACTERS.sub('', price)
+    separators = [character for character in digits if character in '.,']
+    if separators:
+        decimal = separators[-1]
+        if separators.count(decimal) > 1 or len(digits) - digits.rindex(decimal) - 1 == 3:
+            decimal = None
+        thousands = ''.join(character for character in '.,' if character != decimal)
+        digits = digits.translate(str.maketrans('', '', thousands))
+        if decimal:
+            digits = digits.replace(decimal, '.')
+    try:
+        return Decimal(digits)
+    except InvalidOperation:
+        return price
+
+
+def change_row(change, product_id, name, color, old_price, new_price):
+    """Build one row of a catalog delta."""
+    return {
+        'Change': change,
+        'Product ID': product_id,
+        'Name': name,
+        'Color': color,
+        'Old Price': old_price,
+        'New Price': new_price
+    }
@@ -0,0 +1,52 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+from crawler import MultiStoreCrawler, domain_of  # noqa: E402
+
+
+class RecordingCrawler(MultiStoreCrawler):
+    """Crawler whose tasks only sleep, recording how many run at once per domain and when each one starts."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.lock = threading.Lock()
+        self.running = Counter()
+        self.peak = Counter()
+        self.started = []
+
+    def crawl_task(self, store_url, handle):
+        domain = domain_of(store_url)
+        with self.lock:
+            self.running[domain] += 1
+            self.peak[domain] = max(self.peak[domain], self.running[domain])
+            self.started.append(domain)
+        time.sleep(0.02)
+        with self.lock:
+            self.running[domain] -= 1
+        return []
+
+    def report(self):
+        pass
+
+
+def test_busy_store_does_not_hold_every_worker(tmp_path):
+    config = {
+        'stores': [{'url': 'https://big.example.com', 'collections': [f'c{number}' for number in range(12)]},
+                   {'url': 'https://small.example.com', 'collections': ['a', 'b']}],
+        'max_concurrency': 4,
+        'max_per_domain': 1,
+        'delay': 0,
+        'output': str(tmp_path / 'products.csv'),
+    }
+    crawler = RecordingCrawler(config)
+    crawler.crawl()
+
+    assert crawler.peak == {'big.example.com': 1, 'small.example.com': 1}
+    # Both of the small store's tasks start before the big store's queue drains
+    assert crawler.started.index('small.example.com') < 2
+    assert max(index for index, domain in enumerate(crawler.started) if domain == 'small.example.com') < 4
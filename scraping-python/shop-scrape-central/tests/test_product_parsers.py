@@ -0,0 +1,38 @@
+import importlib.util
+import json
+import os
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(PROJECT_DIR, 'fixtures')
+
+# Every project names its module main, so load this one under its own name to run next to the other projects' tests
+sys.path.insert(0, PROJECT_DIR)
+spec = importlib.util.spec_from_file_location('shop_main', os.path.join(PROJECT_DIR, 'main.py'))
+shop_main = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(shop_main)
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as file:
+        return file.read()
+
+
+def test_json_and_rendered_paths_return_identical_rows():
+    rendered = shop_main.ShopifyScraper.parse_products(read_fixture('collection_mens-boots.html'))
+    products = json.loads(read_fixture('products_mens-boots.json'))['products']
+    from_json = shop_main.ShopifyScraper().parse_products_json(products)
+    assert rendered
+    assert from_json == rendered
+
+
+def test_products_without_a_color_are_skipped():
+    products = [{'id': 1, 'title': 'Gift Card', 'options': [{'name': 'Denomination', 'position': 1}],
+                 'variants': [{'option1': '$50', 'price': '50.00'}]}]
+    assert shop_main.ShopifyScraper().parse_products_json(products) == []
+
+
+def test_format_money():
+    assert shop_main.format_money('1134.5') == '$1,134.50'
+    assert shop_main.format_money('199.00', '€{{amount}}') == '€199.00'
+    assert shop_main.format_money(None) == 'N/A'
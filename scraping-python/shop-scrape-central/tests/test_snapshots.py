@@ -0,0 +1,43 @@
+import os
+import sys
+from decimal import Decimal
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.append(os.path.join(PROJECT_DIR, os.pardir))  # For scraping_common
+from scraping_common.records import Product  # noqa: E402
+from snapshots import CatalogSnapshotStore, price_amount  # noqa: E402
+
+
+def test_price_format_change_is_not_a_reprice():
+    store = CatalogSnapshotStore(':memory:')
+    store.apply('shop', 'boots', [Product('1', 'Captain', 'Brown', '1134.5'),
+                                  Product('2', 'Cavalier', 'Black', '199.00')])
+    changes = store.apply('shop', 'boots', [Product('1', 'Captain', 'Brown', '$1,134.50'),
+                                            Product('2', 'Cavalier', 'Black', '$209.00')])
+    store.close()
+    assert [(change['Change'], change['Product ID'], change['New Price']) for change in changes] == [
+        ('repriced', '2', '$209.00')]
+
+
+@pytest.mark.parametrize('price, amount', [
+    ('1.234,56 €', '1234.56'),
+    ('12,50 €', '12.50'),
+    ('1 234,56 €', '1234.56'),
+    ('$1,134.50', '1134.50'),
+    ('1134.5', '1134.5'),
+    ('1.234 €', '1234'),
+])
+def test_price_amount_reads_either_decimal_separator(price, amount):
+    assert price_amount(price) == Decimal(amount)
+
+
+def test_european_price_change_is_a_reprice():
+    store = CatalogSnapshotStore(':memory:')
+    store.apply('shop', 'boots', [Product('1', 'Captain', 'Brown', '12,50 €')])
+    assert store.apply('shop', 'boots', [Product('1', 'Captain', 'Brown', '12,50 €')]) == []
+    changes = store.apply('shop', 'boots', [Product('1', 'Captain', 'Brown', '1.250,00 €')])
+    store.close()
+    assert [(change['Old Price'], change['New Price']) for change in changes] == [('12,50 €', '1.250,00 €')]
@@ -0,0 +1,159 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from fast_path import FastProfileFetcher
+from main import check_platform, get_driver, scrape_profile, to_row
+from scheduler import ProfileScheduler
+from work_queue import coordinate
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.driver_pool import DriverPool  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class FixtureProfileHandler(BaseHTTPRequestHandler):
+    """Serve the recorded profile page for whichever platform appears in the request path."""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # Avoid delayed-ACK stalls between header and body writes on kept-alive sockets
+    page_delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.page_delay)  # Simulated network and server time of a real profile page
+        platform = check_platform(self.path)
+        path = os.path.join(FIXTURES_DIR, f'{platform}_profile.html')
+        if not os.path.exists(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as file:
+            body = file.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server():
+    """Start the fixture site on a free local port and return the server with its base URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureProfileHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def fixture_urls(base_url, count):
+    """Build profile URLs on the fixture site; the platform host in the path keeps check_platform working."""
+    hosts = ['www.tiktok.com/@user', 'www.facebook.com/page', 'www.instagram.com/account']
+    return [f'{base_url}/{hosts[i % len(hosts)]}{i}' for i in range(count)]
+
+
+def bench_browsers(args):
+    server, base_url = start_fixture_server()
+    urls = fixture_urls(base_url, args.profiles)
+    no_pacing = {'instagram': 0.0, 'facebook': 0.0, 'tiktok': 0.0}
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sequential_rows = [scrape_profile(url) for url in urls]
+    sequential_rate = len(urls) / (time.perf_counter() - start) * 60
+    print(f"sequential (driver per profile): {sequential_rate:8.1f} profiles/min")
+
+    pool = DriverPool(get_driver, max_size=args.browsers)
+    scheduler = ProfileScheduler(pool, check_platform, platform_delays=no_pacing)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        pooled_rows = scheduler.run(urls, scrape_profile)
+    pooled_rate = len(urls) / (time.perf_counter() - start) * 60
+    pool.close()
+    print(f"pooled ({args.browsers} warm browsers):       {pooled_rate:8.1f} profiles/min")
+    print(f"speedup: {pooled_rate / sequential_rate:.2f}x, same rows in input order: {pooled_rows == sequential_rows}")
+    pool.report()
+
+    server.shutdown()
+
+
+def bench_fast_path(args):
+    server, base_url = start_fixture_server()
+    urls = fixture_urls(base_url, args.profiles)
+    fetcher = FastProfileFetcher()
+
+    start = time.perf_counter()
+    rows = []
+    for url in urls:
+        platform = check_platform(url)
+        result = fetcher.fetch(url, platform)
+        rows.append(to_row(url, platform, result) if result else None)
+    rate = len(urls) / (time.perf_counter() - start) * 60
+
+    for row in rows[:len(set(map(check_platform, urls)))]:
+        print(row)
+    print(f"fast path: {rate:8.1f} profiles/min")
+    fetcher.report()
+    fetcher.close()
+    server.shutdown()
+
+
+def bench_workers(args):
+    FixtureProfileHandler.page_delay = args.page_delay
+    server, base_url = start_fixture_server()
+    urls = fixture_urls(base_url, args.profiles)
+    no_pacing = {'instagram': 0.0, 'facebook': 0.0, 'tiktok': 0.0}
+
+    baseline = None
+    for processes in args.processes:
+        rows = {}
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                unfinished = coordinate(urls, lambda url, row, error: rows.__setitem__(url, row), processes,
+                                        os.path.join(directory, 'queue.sqlite3'), quiet=True, poll=0.2,
+                                        max_browsers=args.browsers, fast_path=not args.no_fast_path,
+                                        platform_delays=no_pacing)
+            rate = len(urls) / (time.perf_counter() - start) * 60
+        baseline = baseline or rate
+        scraped = sum(1 for row in rows.values() if row)
+        print(f"{processes:>2} worker processes: {rate:8.1f} profiles/min ({rate / baseline:.2f}x), "
+              f"{scraped}/{len(urls)} scraped, {unfinished} unfinished")
+
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks for the profile scraper against a local fixture site.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    browsers_parser = subparsers.add_parser('browsers', help='Compare sequential and pooled browser scraping.')
+    browsers_parser.add_argument('--profiles', type=int, default=30, help='Number of profiles to scrape in each mode.')
+    browsers_parser.add_argument('--browsers', type=int, default=3, help='Size of the warm driver pool.')
+    browsers_parser.set_defaults(func=bench_browsers)
+
+    fast_parser = subparsers.add_parser('fast-path', help='Extract the recorded profiles over plain HTTP.')
+    fast_parser.add_argument('--profiles', type=int, default=30, help='Number of profiles to fetch.')
+    fast_parser.set_defaults(func=bench_fast_path)
+
+    workers_parser = subparsers.add_parser('workers', help='Scale the queue-based worker mode from 1 to N processes.')
+    workers_parser.add_argument('--profiles', type=int, default=300, help='Number of profiles to scrape per run.')
+    workers_parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4],
+                                help='Worker process counts to compare.')
+    workers_parser.add_argument('--browsers', type=int, default=1, help='Warm browsers per worker.')
+    workers_parser.add_argument('--page-delay', type=float, default=0.25,
+                                help='Seconds the fixture site takes to serve each profile page.')
+    workers_parser.add_argument('--no-fast-path', action='store_true', help='Scrape every profile with a browser.')
+    workers_parser.set_defaults(func=bench_workers)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import json
+import re
+import threading
+from collections import Counter
+import requests
+from lxml import etree, html
+from requests.adapters import HTTPAdapter
+
+# Selectors for data that platforms ship in the initial HTML, before any JavaScript runs
+META_XPATH = etree.XPath('//meta[@property=$name]/@content')
+TIKTOK_STATE_XPATH = etree.XPath('//script[@id="__UNIVERSAL_DATA_FOR_REHYDRATION__"]/text()')
+
+COUNT = r'([\d.,]+\s?[KMB]?)'
+INSTAGRAM_COUNTS = re.compile(COUNT + r' Followers, ' + COUNT + r' Following', re.IGNORECASE)
+INSTAGRAM_USERNAME = re.compile(r'\(@([\w.]+)\)')
+FACEBOOK_LIKES = re.compile(COUNT + r' likes', re.IGNORECASE)
+FACEBOOK_FOLLOWERS = re.compile(COUNT + r' followers', re.IGNORECASE)
+FACEBOOK_FOLLOWING = re.compile(COUNT + r' following', re.IGNORECASE)
+
+
+def meta_content(tree, name):
+    """Return the content of an og: meta tag, or None if the page has none."""
+    content = META_XPATH(tree, name=name)
+    return content[0].strip() if content else None
+
+
+def search(pattern, text):
+    """Return the first group of a regex match with spaces removed, or None."""
+    match = pattern.search(text or '')
+    return match.group(1).replace(' ', '') if match else None
+
+
+def extract_tiktok(tree):
+    """Read (name, followers, likes, following) from TikTok's embedded rehydration JSON."""
+    state = TIKTOK_STATE_XPATH(tree)
+    if state:
+        try:
+            user_info = json.loads(state[0])['__DEFAULT_SCOPE__']['webapp.user-detail']['userInfo']
+            stats = user_info['stats']
+            return (user_info['user']['uniqueId'], str(stats['followerCount']), str(stats['heartCount']),
+                    str(stats['followingCount']))
+        except (ValueError, KeyError, TypeError):
+            pass
+    return None
+
+
+def extract_instagram(tree):
+    """Read (name, followers, None) from Instagram's og: tags; Instagram has no likes field."""
+    title = meta_content(tree, 'og:title')
+    counts = INSTAGRAM_COUNTS.search(meta_content(tree, 'og:description') or '')
+    username = search(INSTAGRAM_USERNAME, title)
+    if username and counts:
+        return username, counts.group(1).replace(' ', ''), None
+    return None
+
+
+def extract_facebook(tree):
+    """Read (name, followers, likes, following) from Facebook's og: tags."""
+    name = meta_content(tree, 'og:title')
+    description = meta_content(tree, 'og:description')
+    likes = search(FACEBOOK_LIKES, description)
+    followers = search(FACEBOOK_FOLLOWERS, description)
+    if name and likes and followers:
+        return name, followers, likes, search(FACEBOOK_FOLLOWING, description) or "N/A"
+    return None
+
+
+EXTRACTORS = {
+    'tiktok': extract_tiktok,
+    'instagram': extract_instagram,
+    'facebook': extract_facebook,
+}
+
+
+class FastProfileFetcher:
+    """Fetch profiles over plain pooled HTTP and extract their counts without a browser.
+
+    fetch() returns the same tuple as the matching scrape_* function, or None when the page is blocked or the
+    counts are not in the initial HTML, in which case the caller falls back to the Selenium scraper. Hits and
+    misses are counted per platform.
+    """
+
+    def __init__(self, timeout=10, max_connections=10):
+        """Create a keep-alive session shared by all fast-path requests."""
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                          '(KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+        adapter = HTTPAdapter(pool_connections=len(EXTRACTORS), pool_maxsize=max_connections)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def fetch(self, url, platform):
+        """Try to extract a profile from its initial HTML; return the scrape_* style tuple, or None on a miss."""
+        extractor = EXTRACTORS.get(platform)
+        if extractor is None:
+            return None
+
+        result = None
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            if response.status_code == 200:
+                result = extractor(html.fromstring(response.content))
+        except (requests.RequestException, etree.ParserError) as e:
+            print(f"Fast path failed for {url}: {e}")
+
+        with self.lock:
+            (self.hits if result else self.misses)[platform] += 1
+        return result
+
+    def report(self):
+        """Print the fast-path hit rate for each platform."""
+        for platform in sorted(set(self.hits) | set(self.misses)):
+            hits, misses = self.hits[platform], self.misses[platform]
+            print(f"Fast path {platform}: {hits} hits, {misses} misses ({hits / (hits + misses):.0%} hit rate)")
+
+    def close(self):
+        """Close the HTTP session."""
+        self.session.close()
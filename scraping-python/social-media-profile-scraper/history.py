@@ -0,0 +1,127 @@
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import pandas as pd
+from normalize import to_records
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.exporters import open_exporter  # noqa: E402
+
+
+class ProfileHistory:
+    """Per-profile time series of normalized follower, like and following counts in SQLite.
+
+    Every run appends one snapshot per profile, keyed by profile URL and observation time, so re-saving the
+    same run replaces its snapshot instead of duplicating it. growth() computes the change of every tracked
+    profile over a window in one pass, instead of one spreadsheet per account.
+    """
+
+    def __init__(self, db_path='social_media_profiles.history.sqlite3'):
+        """Open (or create) the history database."""
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS snapshots (
+                url TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                observed_at TEXT NOT NULL,
+                name TEXT,
+                followers INTEGER,
+                likes INTEGER,
+                following INTEGER,
+                PRIMARY KEY (url, observed_at)
+            );
+        ''')
+        self.conn.commit()
+
+    def append(self, df, observed_at):
+        """Record one snapshot per row of a normalized profile DataFrame (see normalize.normalize_rows).
+
+        Args:
+            df (pandas.DataFrame): Rows with Name, Followers, Likes, Following, Link and Social Media Platform.
+            observed_at (str): ISO timestamp of the run the rows come from.
+        """
+        columns = df[['Link', 'Social Media Platform', 'Name', 'Followers', 'Likes', 'Following']]
+        with self.lock, self.conn:
+            self.conn.executemany('''
+                INSERT OR REPLACE INTO snapshots (url, platform, observed_at, name, followers, likes, following)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [(url, platform, observed_at, name, followers, likes, following)
+                  for url, platform, name, followers, likes, following in to_records(columns)])
+
+    def snapshots(self):
+        """Return every snapshot as a DataFrame sorted by profile and time."""
+        with self.lock:
+            df = pd.read_sql_query('SELECT * FROM snapshots ORDER BY url, observed_at', self.conn)
+        df['observed_at'] = pd.to_datetime(df['observed_at'])
+        for column in ('followers', 'likes', 'following'):
+            df[column] = df[column].astype('Int64')
+        return df
+
+    def growth(self, days=30):
+        """Compute follower growth of every profile over the last `days` days of its history.
+
+        Each profile's latest snapshot is compared with its latest snapshot at least `days` days older, or with
+        its first snapshot if the history is shorter.
+
+        Returns:
+            pandas.DataFrame: Link, Platform, Name, Followers, Followers Before, Change, Growth %,
+            Per Day and Days, fastest growing profiles first.
+        """
+        df = self.snapshots().dropna(subset=['followers'])
+        if df.empty:
+            return pd.DataFrame(columns=['Link', 'Platform', 'Name', 'Followers', 'Followers Before', 'Change',
+                                         'Growth %', 'Per Day', 'Days'])
+
+        latest = df.groupby('url').tail(1).copy()
+        latest['cutoff'] = latest['observed_at'] - pd.Timedelta(days=days)
+        first = df.groupby('url').head(1).set_index('url')
+
+        # For every profile, the last snapshot at or before its cutoff, found for all profiles in one as-of join
+        baseline = pd.merge_asof(
+            latest[['url', 'cutoff']].sort_values('cutoff'),
+            df[['url', 'observed_at', 'followers']].sort_values('observed_at'),
+            left_on='cutoff', right_on='observed_at', by='url', direction='backward',
+        ).set_index('url')
+        baseline['observed_at'] = baseline['observed_at'].fillna(first['observed_at'])
+        baseline['followers'] = baseline['followers'].fillna(first['followers'])
+
+        latest = latest.set_index('url')
+        before = baseline.loc[latest.index]
+        elapsed_days = (latest['observed_at'] - before['observed_at']).dt.total_seconds() / 86400
+        change = latest['followers'] - before['followers']
+        report = pd.DataFrame({
+            'Link': latest.index,
+            'Platform': latest['platform'].values,
+            'Name': latest['name'].values,
+            'Followers': latest['followers'].values,
+            'Followers Before': before['followers'].values,
+            'Change': change.values,
+            'Growth %': (change / before['followers'].replace(0, pd.NA) * 100).astype('Float64').round(2).values,
+            'Per Day': (change / elapsed_days.where(elapsed_days > 0)).astype('Float64').round(1).values,
+            'Days': elapsed_days.round(1).values,
+        })
+        return report.sort_values('Growth %', ascending=False, na_position='last', kind='stable')
+
+    def close(self):
+        """Close the history database."""
+        with self.lock:
+            self.conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report follower growth of every tracked profile.')
+    parser.add_argument('--days', type=int, default=30, help='Window to compute growth over.')
+    parser.add_argument('--history', default='social_media_profiles.history.sqlite3', help='History database.')
+    parser.add_argument('--output', default='social_media_growth.xlsx',
+                        help='Report file (.xlsx, .csv, .jsonl, .parquet or .sqlite3).')
+    args = parser.parse_args()
+
+    history = ProfileHistory(args.history)
+    report = history.growth(args.days)
+    history.close()
+    with open_exporter(args.output, list(report.columns), name='growth') as exporter:
+        exporter.write_many(to_records(report))
+    print(f"Growth of {len(report)} profiles over {args.days} days saved to {args.output}")
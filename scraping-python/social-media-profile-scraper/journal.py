@@ -0,0 +1,91 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+
+class ProfileJournal:
+    """Append-only SQLite journal of profile results, so a long run can be resumed after a crash or a kill.
+
+    Every scraped or failed profile is committed as soon as it finishes. A run is one pass over an input file;
+    resuming continues the latest run of that file, skipping profiles that are already done and retrying the
+    failures. The latest entry for a URL wins, and the output file is built from the journal, not from memory.
+    """
+
+    def __init__(self, db_path='social_media_profiles.journal.sqlite3'):
+        """Open (or create) the journal database."""
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                input_file TEXT NOT NULL,
+                started_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id INTEGER NOT NULL REFERENCES runs (id),
+                url TEXT NOT NULL,
+                status TEXT NOT NULL,
+                row TEXT,
+                error TEXT,
+                recorded_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_run_url ON results (run_id, url);
+        ''')
+        self.conn.commit()
+
+    def start_run(self, input_file, resume=False):
+        """Return the run to record into: the latest run of input_file when resuming, otherwise a new one."""
+        with self.lock:
+            if resume:
+                latest = self.conn.execute('SELECT MAX(id) FROM runs WHERE input_file = ?', (input_file,)).fetchone()[0]
+                if latest is not None:
+                    return latest
+            with self.conn:
+                cursor = self.conn.execute('INSERT INTO runs (input_file, started_at) VALUES (?, ?)',
+                                           (input_file, datetime.now().isoformat(timespec='seconds')))
+            return cursor.lastrowid
+
+    def started_at(self, run_id):
+        """Return the ISO timestamp at which the run started."""
+        with self.lock:
+            return self.conn.execute('SELECT started_at FROM runs WHERE id = ?', (run_id,)).fetchone()[0]
+
+    def record(self, run_id, url, row, error=None):
+        """Append one profile's outcome: done with its output row, or failed with an optional error message."""
+        status = 'done' if row else 'failed'
+        with self.lock, self.conn:
+            self.conn.execute(
+                'INSERT INTO results (run_id, url, status, row, error, recorded_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (run_id, url, status, json.dumps(list(row)) if row else None, error,
+                 datetime.now().isoformat(timespec='seconds')))
+
+    def latest(self, run_id):
+        """Return {url: (status, row)} with the latest entry for every URL recorded in the run."""
+        with self.lock:
+            entries = self.conn.execute('''
+                SELECT url, status, row FROM results
+                WHERE seq IN (SELECT MAX(seq) FROM results WHERE run_id = ? GROUP BY url)
+            ''', (run_id,)).fetchall()
+        return {url: (status, json.loads(row) if row else None) for url, status, row in entries}
+
+    def done_urls(self, run_id):
+        """Return the set of URLs whose latest entry in the run is done."""
+        return {url for url, (status, _) in self.latest(run_id).items() if status == 'done'}
+
+    def rows(self, run_id, urls):
+        """Return the output rows of the run's done profiles, in the order of urls."""
+        latest = self.latest(run_id)
+        return [latest[url][1] for url in urls if url in latest and latest[url][0] == 'done']
+
+    def counts(self, run_id, urls):
+        """Return (done, failed, pending) profile counts of the run for the given input URLs."""
+        latest = self.latest(run_id)
+        statuses = [latest[url][0] if url in latest else 'pending' for url in dict.fromkeys(urls)]
+        return statuses.count('done'), statuses.count('failed'), statuses.count('pending')
+
+    def close(self):
+        """Close the journal database."""
+        with self.lock:
+            self.conn.close()
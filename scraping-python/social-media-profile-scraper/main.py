@@ -1,11 +1,20 @@
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
+import os
 import re
-import pandas as pd
-from seleniumbase import Driver
+import sys
 import traceback
+from fast_path import FastProfileFetcher
+from journal import ProfileJournal
+from scheduler import ProfileScheduler
+from work_queue import coordinate
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.driver_pool import DriverPool  # noqa: E402
+from scraping_common.exporters import open_exporter  # noqa: E402
+from scraping_common.lean_driver import create_driver  # noqa: E402
+from scraping_common.metrics import METRICS  # noqa: E402
+from scraping_common.records import Profile, column_types  # noqa: E402
+
+PROFILE_COLUMNS = list(Profile.columns)
 
 
 # Function to check the social media platform based on the URL
@@ -21,14 +30,23 @@ def check_platform(url):
 
 
 # Function to get a new WebDriver instance
+@METRICS.timed('browser_launch')
 def get_driver():
-    return Driver(uc=True, headless2=True)  # Using undetected-chromedriver
+    return create_driver(uc=True, headless2=True)  # Using undetected-chromedriver with the lean profile
 
 
-# Function to scrape TikTok profile
-def scrape_tiktok(url):
+# Function to scrape TikTok profile. Like the other scrape_* functions, it imports Selenium itself, so worker
+# processes whose profiles all take the fast path never load it
+def scrape_tiktok(url, driver=None):
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    owns_driver = driver is None
     try:
-        driver = get_driver()  # Get a new driver for each profile
+        if owns_driver:
+            driver = get_driver()  # Get a new driver for each profile unless one is lent by the pool
         driver.get(url)
 
         # Get Account Name
@@ -65,7 +83,6 @@ def scrape_tiktok(url):
             print("Likes count not found.")
             likes_count = "N/A"
 
-        driver.quit()
         return name_text, followers_count, likes_count, following_count
 
     except Exception as e:
@@ -73,11 +90,22 @@ def scrape_tiktok(url):
         traceback.print_exc()  # Log the stack trace for debugging
         return None
 
+    finally:
+        if owns_driver and driver is not None:
+            driver.quit()
+
 
 # Function to scrape Instagram profile
-def scrape_instagram(url):
+def scrape_instagram(url, driver=None):
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    owns_driver = driver is None
     try:
-        driver = get_driver()  # Get a new driver for each profile
+        if owns_driver:
+            driver = get_driver()  # Get a new driver for each profile unless one is lent by the pool
         driver.get(url)
 
         # Check if "Something went wrong" message appears
@@ -86,7 +114,6 @@ def scrape_instagram(url):
                 EC.presence_of_element_located((By.XPATH, "//span[contains(text(), 'Something went wrong')]"))
             )
             print(f"Instagram not available for {url}, skipping...")
-            driver.quit()
             return None  # Instagram not available
         except:
             pass  # No error means Instagram is accessible
@@ -110,7 +137,6 @@ def scrape_instagram(url):
             print("Followers count not found.")
             followers_count = "N/A"
 
-        driver.quit()
         return account_name, followers_count, None  # Instagram has no likes field
 
     except Exception as e:
@@ -118,11 +144,22 @@ def scrape_instagram(url):
         traceback.print_exc()  # Log the stack trace for debugging
         return None
 
+    finally:
+        if owns_driver and driver is not None:
+            driver.quit()
+
 
 # Function to scrape Facebook profile
-def scrape_facebook(url):
+def scrape_facebook(url, driver=None):
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    owns_driver = driver is None
     try:
-        driver = get_driver()  # Get a new driver for each profile
+        if owns_driver:
+            driver = get_driver()  # Get a new driver for each profile unless one is lent by the pool
         driver.get(url)
 
         # Get Account Name
@@ -162,7 +199,6 @@ def scrape_facebook(url):
             print("Following count not found.")
             following_count = "N/A"
 
-        driver.quit()
         return name_text, followers_count, likes_count, following_count
 
     except Exception as e:
@@ -170,14 +206,19 @@ def scrape_facebook(url):
         traceback.print_exc()  # Log the stack trace for debugging
         return None
 
+    finally:
+        if owns_driver and driver is not None:
+            driver.quit()
 
-# Function to parse the number from text (removing words like 'likes' or 'followers')
+
+# Function to parse the number from text (removing words like 'likes' or 'followers'); separators are kept
+# so that normalize_counts can read '1,234' and '1.2K' alike
 def parse_number_from_text(text):
-    # Use regex to extract the number part and check for 'K' or 'M'
-    match = re.search(r'([\d\.]+)([KM]?)', text)
+    # Use regex to extract the number part and check for 'K', 'M' or 'B'
+    match = re.search(r'(\d[\d.,]*)\s*([KMB]?)', text, re.IGNORECASE)
     if match:
-        number = match.group(1)  # Get the number part
-        unit = match.group(2).upper()  # Get the unit part ('K' or 'M')
+        number = match.group(1).rstrip('.,')  # Get the number part
+        unit = match.group(2).upper()  # Get the unit part ('K', 'M' or 'B')
         return f"{number}{unit}"
     return None
 
@@ -189,55 +230,137 @@ def read_urls_from_file(file_path):
     return urls
 
 
-# Function to save the results to an Excel file using pandas with xlsxwriter
+# Function to save the results to an Excel file (or CSV, JSONL, Parquet or SQLite, by extension), row by row
 def save_to_excel(results, output_file):
-    # Create a pandas DataFrame from the results
-    df = pd.DataFrame(results, columns=['Name', 'Followers', 'Likes', 'Following', 'Link', 'Social Media Platform'])
+    with open_exporter(output_file, PROFILE_COLUMNS, types=column_types(Profile)) as exporter:
+        exporter.write_many(results)
 
-    # Write the DataFrame to an Excel file with xlsxwriter engine
-    with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False)
 
-# Main function to process profiles sequentially
-def scrape_profiles(file_path, output_file):
-    urls = read_urls_from_file(file_path)
-    results = []
+# Function to turn a scrape_* result into a Profile record
+def to_row(url, platform, result):
+    if platform == "instagram":
+        account_name, followers_count, _ = result
+        return Profile(account_name, followers_count, "", "", url, "instagram")
 
-    for url in urls:
-        platform = check_platform(url)
-        print(f"Scraping URL: {url}")
+    name_text, followers_count, likes_count, following_count = result
+    return Profile(name_text, followers_count, likes_count, following_count, url, platform)
 
-        if platform == "instagram":
-            result = scrape_instagram(url)
-            if result:
-                account_name, followers_count, _ = result
-                results.append([account_name, followers_count, "", "", url, "instagram"])
 
+# Function to scrape a single profile URL into a result row, using a pooled driver if one is given
+def scrape_profile(url, driver=None):
+    platform = check_platform(url)
+    print(f"Scraping URL: {url}")
+
+    if platform not in ("instagram", "facebook", "tiktok"):
+        print(f"Unknown platform for {url}")
+        return None
+
+    with METRICS.timer(f'browser_scrape_{platform}'):
+        if platform == "instagram":
+            result = scrape_instagram(url, driver)
         elif platform == "facebook":
-            result = scrape_facebook(url)
-            if result:
-                name_text, followers_count, likes_count, following_count = result
-                results.append([name_text, followers_count, likes_count, following_count, url, "facebook"])
+            result = scrape_facebook(url, driver)
+        else:
+            result = scrape_tiktok(url, driver)
+
+    return to_row(url, platform, result) if result else None
 
-        elif platform == "tiktok":
-            result = scrape_tiktok(url)
-            if result:
-                name_text, followers_count, likes_count, following_count = result
-                results.append([name_text, followers_count, likes_count, following_count, url, "tiktok"])
 
+# Function to scrape batches of profile URLs, concurrently over a pool of warm browsers unless max_browsers is 0.
+# With fast_path, each profile is first tried over plain HTTP and only sent to a browser when that fails.
+# The browsers and HTTP session are kept across batches, and record(url, row, error) is called for every
+# profile as soon as it finishes.
+def scrape_batches(batches, record, max_browsers=3, platform_limits=None, platform_delays=None, fast_path=True):
+    fetcher = FastProfileFetcher() if fast_path else None
+
+    def scrape_fast(url):
+        platform = check_platform(url)
+        with METRICS.timer('fast_path'):
+            result = fetcher.fetch(url, platform)
+        if result:
+            print(f"Scraped URL without a browser: {url}")
+            return to_row(url, platform, result)
+        return None
+
+    pool = DriverPool(get_driver, max_size=max_browsers) if max_browsers else None
+    try:
+        if pool:
+            scheduler = ProfileScheduler(pool, check_platform, platform_limits, platform_delays)
+            for urls in batches:
+                scheduler.run(urls, scrape_profile, fast=scrape_fast if fetcher else None, on_result=record)
         else:
-            print(f"Unknown platform for {url}")
+            for urls in batches:
+                for url in urls:
+                    record(url, (fetcher and scrape_fast(url)) or scrape_profile(url))
+    finally:
+        if pool:
+            pool.close()
+            pool.report()
+        if fetcher:
+            fetcher.report()
+            fetcher.close()
+
+
+# Main function to process profiles. Every result is committed to the journal as it finishes, and the Excel file
+# is built from the journal; with resume, profiles already done in the previous run of the same file are skipped
+# and only failures are retried. With workers, the profiles are queued in queue_path and scraped by that many
+# worker processes (and any started on other hosts), and their results are merged into the journal as they land.
+# Counts are normalized to integers, and each run's counts are appended to the history for growth reports;
+# pandas is only imported for that last step, so worker processes never load it.
+def scrape_profiles(file_path, output_file, max_browsers=3, platform_limits=None, platform_delays=None,
+                    fast_path=True, journal_path='social_media_profiles.journal.sqlite3', resume=False,
+                    history_path='social_media_profiles.history.sqlite3', workers=0,
+                    queue_path='social_media_profiles.queue.sqlite3'):
+    urls = read_urls_from_file(file_path)
+    journal = ProfileJournal(journal_path)
+    run_id = journal.start_run(os.path.abspath(file_path), resume)
+    done = journal.done_urls(run_id)
+    pending = [url for url in dict.fromkeys(urls) if url not in done]
+    if done:
+        print(f"Resuming run {run_id}: {len(done)} profiles already done, {len(pending)} to scrape")
+
+    def record(url, row, error=None):
+        METRICS.count('profiles_scraped' if row else 'profile_failures')
+        with METRICS.timer('journal'):
+            journal.record(run_id, url, row, error)
+
+    if workers and pending:
+        # Browser counts, platform limits and pacing apply to each worker
+        coordinate(pending, record, workers, queue_path, max_browsers=max_browsers, fast_path=fast_path,
+                   platform_limits=platform_limits, platform_delays=platform_delays)
+    elif pending:
+        scrape_batches([pending], record, max_browsers, platform_limits, platform_delays, fast_path)
+
+    from history import ProfileHistory
+    from normalize import normalize_rows, to_records
+
+    # Rows come back from the journal in input order; all counts are normalized in one pass
+    with METRICS.timer('normalize'):
+        results = normalize_rows([Profile(*row) for row in journal.rows(run_id, urls)], Profile)
+    _, failed_count, pending_count = journal.counts(run_id, urls)
+    observed_at = journal.started_at(run_id)
+    journal.close()
+
+    if history_path:
+        history = ProfileHistory(history_path)
+        history.append(results, observed_at)
+        history.close()
+    if failed_count:
+        print(f"{failed_count} profiles failed; rerun with --resume to retry only those")
+    if pending_count:
+        print(f"{pending_count} profiles were not scraped; rerun with --resume to scrape them")
 
     print("Saving results to excel")
 
     # Save the results to an Excel file
-    save_to_excel(results, output_file)
+    with METRICS.timer('export'):
+        save_to_excel(to_records(results), output_file)
 
     return len(urls)
 
 
 # Ensure the script runs only when executed as the main program
 if __name__ == '__main__':
-    # Example usage: Pass the file path containing Instagram/Facebook URLs and output Excel file
-    number = scrape_profiles('social_media_profiles.txt', 'social_media_profiles.xlsx')
-    print(f"Done Scraping {number} links")
+    # Same as python -m scraping_common.cli profiles from the scraping-python folder
+    from scraping_common.cli import run
+    run(['profiles', *sys.argv[1:]])
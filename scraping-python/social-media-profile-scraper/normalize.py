@@ -0,0 +1,65 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.records import to_columns  # noqa: E402
+
+COUNT_COLUMNS = ['Followers', 'Likes', 'Following']
+MULTIPLIERS = {'K': 1e3, 'M': 1e6, 'B': 1e9}
+
+# A number with optional thousands/decimal separators (',', '.', spaces, apostrophes) and a K/M/B suffix
+COUNT_PATTERN = r"(?P<number>\d[\d.,'\s]*)\s*(?P<unit>[KMB])?"
+
+
+def normalize_counts(values):
+    """Turn follower-style counts such as '1.2K', '3,4 M', '1,234,567', '1.234.567' or '62M followers' into integers.
+
+    The whole column is parsed in one vectorized pass. With a single ',' or '.', the separator is read as a
+    decimal point unless exactly three digits follow it and there is no K/M/B suffix ('1,234' is 1234, '1,5K'
+    is 1500); when both appear, the last one is the decimal point. Values without a number become <NA>.
+
+    Args:
+        values: A sequence or Series of strings (or numbers).
+
+    Returns:
+        pandas.Series: Nullable Int64 counts, aligned with the input.
+    """
+    text = pd.Series(values, dtype='object').astype('string').str.upper()
+    parts = text.str.extract(COUNT_PATTERN)
+    number = parts['number'].str.replace(r"[\s']", '', regex=True).str.rstrip('.,')  # \s covers no-break spaces too
+    unit = parts['unit']
+
+    commas = number.str.count(',')
+    dots = number.str.count(r'\.')
+    tail = number.str.extract(r'[.,](\d*)$')[0]
+    has_unit = unit.notna()
+    decimal = ((commas > 0) & (dots > 0)) | (((commas + dots) == 1) & ~((tail.str.len() == 3) & ~has_unit))
+    decimal = decimal.fillna(False).astype(bool)
+
+    digits = number.str.replace(r'[.,]', '', regex=True)
+    whole = number.str.replace(r'[.,]\d*$', '', regex=True).str.replace(r'[.,]', '', regex=True)
+    as_decimal = whole + '.' + tail
+    parsed = pd.to_numeric(pd.Series(np.where(decimal, as_decimal, digits), index=text.index), errors='coerce')
+
+    multiplier = unit.map(MULTIPLIERS).astype('float64').fillna(1.0)
+    return (parsed * multiplier).round().astype('Int64')
+
+
+def normalize_rows(records, record_type):
+    """Return the records as a DataFrame with every count column normalized to nullable integers.
+
+    The records are transposed into column arrays in one batch, so no per-row dicts or lists are built.
+    """
+    df = pd.DataFrame(to_columns(records, record_type), columns=list(record_type.columns))
+    for column in COUNT_COLUMNS:
+        if column in df:
+            df[column] = normalize_counts(df[column])
+    return df
+
+
+def to_records(df):
+    """Yield the DataFrame's rows as lists of plain Python values, with missing values as None."""
+    for row in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+        yield list(row)
@@ -0,0 +1,92 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Concurrent browsers allowed per platform, and minimum seconds between profile starts on that platform
+PLATFORM_LIMITS = {'instagram': 1, 'facebook': 2, 'tiktok': 2}
+PLATFORM_DELAYS = {'instagram': 3.0, 'facebook': 1.0, 'tiktok': 1.0}
+
+
+class Pacer:
+    """Space out the start times of calls by at least min_interval seconds across threads."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+    def wait(self):
+        """Block until this caller's start slot comes up."""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.min_interval
+        time.sleep(start - now)
+
+
+class ProfileScheduler:
+    """Run profile scrapes concurrently over a DriverPool with a separate cap and pacing for each platform.
+
+    Each platform gets its own executor sized to its limit, so a slow or strictly paced platform never blocks
+    the others, while the pool bounds the total number of browsers. Results are returned in input order.
+    """
+
+    def __init__(self, pool, platform_of, platform_limits=None, platform_delays=None):
+        """Schedule over the given pool; platform_of maps a URL to its platform name."""
+        self.pool = pool
+        self.platform_of = platform_of
+        self.platform_limits = {**PLATFORM_LIMITS, **(platform_limits or {})}
+        self.platform_delays = {**PLATFORM_DELAYS, **(platform_delays or {})}
+        self.pacers = {platform: Pacer(self.platform_delays.get(platform, 0.0)) for platform in self.platform_limits}
+
+    def scrape_one(self, url, platform, scrape, fast=None):
+        """Wait for the platform's pacing slot, try the fast path, then scrape the URL with a leased driver."""
+        self.pacers[platform].wait()
+        if fast:
+            result = fast(url)
+            if result:
+                return result
+        with self.pool.driver() as driver:
+            return scrape(url, driver)
+
+    def run(self, urls, scrape, fast=None, on_result=None):
+        """Scrape every URL with scrape(url, driver) and return the results in input order.
+
+        If fast is given, fast(url) is tried first and a browser is leased only when it returns nothing.
+        If on_result is given, on_result(url, result, error) is called from the worker thread as soon as each
+        URL finishes, and a URL that raises is reported there as a failure instead of aborting the run.
+        """
+        def task(url, platform):
+            if platform is None:
+                # Unknown platforms need no browser; scrape() reports them without a driver
+                result = scrape(url, None)
+            elif on_result is None:
+                return self.scrape_one(url, platform, scrape, fast)
+            else:
+                try:
+                    result = self.scrape_one(url, platform, scrape, fast)
+                except Exception as e:
+                    print(f"Error scraping {url}: {e}")
+                    on_result(url, None, str(e))
+                    return None
+            if on_result:
+                on_result(url, result, None)
+            return result
+
+        executors = {
+            platform: ThreadPoolExecutor(max_workers=limit, thread_name_prefix=f'{platform}-scraper')
+            for platform, limit in self.platform_limits.items()
+        }
+        try:
+            futures = []
+            for url in urls:
+                platform = self.platform_of(url)
+                if platform in executors:
+                    futures.append(executors[platform].submit(task, url, platform))
+                else:
+                    futures.append(None)
+
+            return [future.result() if future else task(url, None) for url, future in zip(urls, futures)]
+        finally:
+            for executor in executors.values():
+                executor.shutdown()
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+from work_queue import WorkQueue  # noqa: E402
+
+
+def test_stalled_task_is_requeued_despite_heartbeats(tmp_path):
+    queue = WorkQueue(str(tmp_path / 'queue.sqlite3'))
+    job_id = queue.create_job(['https://example.com/a'])
+    assert queue.claim(job_id, 'stuck', 1, lease=0.2, max_lease=0.5) == ['https://example.com/a']
+
+    # The stuck worker's heartbeat thread keeps running while its scrape makes no progress
+    deadline = time.time() + 0.8
+    while time.time() < deadline:
+        queue.heartbeat('stuck', 0.2)
+        time.sleep(0.05)
+
+    assert queue.claim(job_id, 'other', 1, lease=60) == ['https://example.com/a']
+    attempts, = queue.conn.execute('SELECT attempts FROM tasks WHERE job_id = ?', (job_id,)).fetchone()
+    assert attempts == 2
+    queue.close()
+
+
+def test_heartbeats_keep_a_lease_alive_before_its_deadline(tmp_path):
+    queue = WorkQueue(str(tmp_path / 'queue.sqlite3'))
+    job_id = queue.create_job(['https://example.com/a'])
+    queue.claim(job_id, 'busy', 1, lease=0.2, max_lease=60)
+    for _ in range(6):
+        time.sleep(0.1)
+        queue.heartbeat('busy', 0.2)
+    assert queue.claim(job_id, 'other', 1, lease=0.2) == []
+    queue.close()
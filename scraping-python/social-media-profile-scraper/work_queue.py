@@ -0,0 +1,290 @@
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'worker.py')
+
+
+class WorkQueue:
+    """SQLite work queue of profile URLs shared by a coordinator and any number of worker processes.
+
+    The coordinator creates a job with one task per URL. Workers claim small batches of tasks under a lease,
+    heartbeat to extend the leases while they scrape, and complete each task with its row or error. A task whose
+    lease runs out (its worker crashed, was killed or lost its host) goes back to the queue for the next claim,
+    up to max_attempts leases, after which it fails. Heartbeats never extend a lease past the claim's max_lease,
+    so the tasks of a scrape that hangs in a worker that is otherwise alive are requeued too. Completed tasks are
+    appended to a results log that the coordinator merges from.
+
+    Lease times are wall-clock times, so workers on other hosts need synchronized clocks, and the database must
+    live on a filesystem with working locks (a local disk, or a network filesystem that supports them).
+    """
+
+    def __init__(self, db_path='social_media_profiles.queue.sqlite3', max_attempts=3):
+        """Open (or create) the queue database."""
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        # Autocommit mode: writes go through transaction(), which takes the write lock up front with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tasks (
+                job_id INTEGER NOT NULL REFERENCES jobs (id),
+                position INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                lease_expires REAL,
+                lease_deadline REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (job_id, url)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (job_id, status, position);
+            CREATE TABLE IF NOT EXISTS results (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER NOT NULL REFERENCES jobs (id),
+                url TEXT NOT NULL,
+                row TEXT,
+                error TEXT,
+                worker TEXT
+            );
+            CREATE TABLE IF NOT EXISTS workers (
+                id TEXT PRIMARY KEY,
+                job_id INTEGER NOT NULL REFERENCES jobs (id),
+                host TEXT NOT NULL,
+                pid INTEGER NOT NULL,
+                started_at REAL NOT NULL,
+                heartbeat_at REAL NOT NULL
+            );
+        ''')
+        # Queues created before leases were capped lack the deadline column
+        if 'lease_deadline' not in [column[1] for column in self.conn.execute('PRAGMA table_info(tasks)')]:
+            self.conn.execute('ALTER TABLE tasks ADD COLUMN lease_deadline REAL')
+
+    @contextmanager
+    def transaction(self):
+        """Hold the lock inside one write transaction, taking SQLite's write lock up front."""
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+
+    def create_job(self, urls):
+        """Queue one task per distinct URL, in order, and return the new job's id."""
+        with self.transaction():
+            cursor = self.conn.execute('INSERT INTO jobs (created_at) VALUES (?)',
+                                       (datetime.now().isoformat(timespec='seconds'),))
+            job_id = cursor.lastrowid
+            self.conn.executemany('INSERT INTO tasks (job_id, position, url) VALUES (?, ?, ?)',
+                                  [(job_id, position, url) for position, url in enumerate(dict.fromkeys(urls))])
+        return job_id
+
+    def latest_job(self):
+        """Return the id of the most recently created job, or None."""
+        with self.lock:
+            return self.conn.execute('SELECT MAX(id) FROM jobs').fetchone()[0]
+
+    def register(self, worker_id, job_id):
+        """Announce a worker joining the job."""
+        now = time.time()
+        with self.transaction():
+            self.conn.execute('INSERT OR REPLACE INTO workers (id, job_id, host, pid, started_at, heartbeat_at) '
+                              'VALUES (?, ?, ?, ?, ?, ?)', (worker_id, job_id, socket.gethostname(), os.getpid(), now, now))
+
+    def claim(self, job_id, worker_id, count, lease, max_lease=None):
+        """Lease up to count tasks to the worker for lease seconds and return their URLs in input order.
+
+        Heartbeats extend the leases up to max_lease seconds after this claim (no limit if None). Expired leases
+        are reclaimed first: their tasks are queued again, or failed after max_attempts leases.
+        """
+        now = time.time()
+        deadline = None if max_lease is None else now + max_lease
+        with self.transaction():
+            expired = self.conn.execute('''
+                SELECT url, attempts, worker FROM tasks
+                WHERE job_id = ? AND status = 'leased' AND lease_expires < ?
+            ''', (job_id, now)).fetchall()
+            for url, attempts, worker in expired:
+                if attempts >= self.max_attempts:
+                    self.finish(job_id, url, None, f'lease expired {attempts} times, last held by {worker}', worker)
+                else:
+                    self.conn.execute("UPDATE tasks SET status = 'pending', worker = NULL "
+                                      "WHERE job_id = ? AND url = ?", (job_id, url))
+
+            urls = [url for url, in self.conn.execute('''
+                SELECT url FROM tasks WHERE job_id = ? AND status = 'pending' ORDER BY position LIMIT ?
+            ''', (job_id, count))]
+            self.conn.executemany('''
+                UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, lease_deadline = ?,
+                    attempts = attempts + 1
+                WHERE job_id = ? AND url = ?
+            ''', [(worker_id, now + lease if deadline is None else min(now + lease, deadline), deadline, job_id, url)
+                  for url in urls])
+        return urls
+
+    def heartbeat(self, worker_id, lease):
+        """Mark the worker alive and extend the leases of every task it holds by lease seconds, up to their deadlines.
+
+        A heartbeat only shows that the worker is alive, not that its scrapes are moving, so a task still held at
+        its lease deadline is left to expire and be requeued.
+        """
+        now = time.time()
+        with self.transaction():
+            self.conn.execute('UPDATE workers SET heartbeat_at = ? WHERE id = ?', (now, worker_id))
+            self.conn.execute("UPDATE tasks SET lease_expires = MIN(?, COALESCE(lease_deadline, ?)) "
+                              "WHERE worker = ? AND status = 'leased'", (now + lease, now + lease, worker_id))
+
+    def finish(self, job_id, url, row, error, worker_id):
+        """Mark a task done or failed and log its result; the caller holds the lock inside a transaction."""
+        self.conn.execute('UPDATE tasks SET status = ?, worker = ? WHERE job_id = ? AND url = ?',
+                          ('done' if row else 'failed', worker_id, job_id, url))
+        self.conn.execute('INSERT INTO results (job_id, url, row, error, worker) VALUES (?, ?, ?, ?, ?)',
+                          (job_id, url, json.dumps(list(row)) if row else None, error, worker_id))
+
+    def complete(self, job_id, url, row, error, worker_id):
+        """Record a leased task's row, or its failure; results for tasks already finished are ignored."""
+        with self.transaction():
+            status = self.conn.execute('SELECT status FROM tasks WHERE job_id = ? AND url = ?',
+                                       (job_id, url)).fetchone()
+            # A worker that outlived its lease may still finish; the first result for a task wins
+            if status and status[0] in ('pending', 'leased'):
+                self.finish(job_id, url, row, error, worker_id)
+
+    def results(self, job_id, after=0):
+        """Return [(seq, url, row, error)] of the job's results logged after seq `after`."""
+        with self.lock:
+            entries = self.conn.execute('SELECT seq, url, row, error FROM results WHERE job_id = ? AND seq > ? '
+                                        'ORDER BY seq', (job_id, after)).fetchall()
+        return [(seq, url, json.loads(row) if row else None, error) for seq, url, row, error in entries]
+
+    def remaining(self, job_id):
+        """Return the number of the job's tasks that are pending or leased."""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status IN ('pending', 'leased')",
+                                     (job_id,)).fetchone()[0]
+
+    def live_workers(self, job_id, within):
+        """Return the ids of the job's workers that sent a heartbeat in the last `within` seconds."""
+        with self.lock:
+            return [worker for worker, in self.conn.execute('SELECT id FROM workers WHERE job_id = ? AND heartbeat_at >= ?',
+                                                             (job_id, time.time() - within))]
+
+    def close(self):
+        """Close the queue database."""
+        with self.lock:
+            self.conn.close()
+
+
+def format_platform_options(options):
+    """Format {platform: value} as 'platform=value,...' for the worker command line."""
+    return ','.join(f'{platform}={value}' for platform, value in options.items())
+
+
+def parse_platform_options(text, convert):
+    """Parse 'platform=value,...' from the worker command line into {platform: convert(value)}."""
+    return {platform: convert(value) for platform, value in (item.split('=', 1) for item in text.split(',') if item)}
+
+
+def worker_command(queue_path, job_id, max_browsers=3, fast_path=True, platform_limits=None, platform_delays=None,
+                   lease=120.0, max_lease=900.0):
+    """Return the command line that starts a worker on the job, on this host or any other."""
+    command = [sys.executable, WORKER_SCRIPT, '--queue', queue_path, '--job', str(job_id),
+               '--browsers', str(max_browsers), '--lease', str(lease), '--max-lease', str(max_lease)]
+    if not fast_path:
+        command.append('--no-fast-path')
+    if platform_limits:
+        command += ['--platform-limits', format_platform_options(platform_limits)]
+    if platform_delays:
+        command += ['--platform-delays', format_platform_options(platform_delays)]
+    return command
+
+
+def coordinate(urls, on_result, workers, queue_path='social_media_profiles.queue.sqlite3', max_restarts=None,
+               poll=1.0, quiet=False, **worker_options):
+    """Queue the URLs as a job, run local worker processes on it, and merge their results as they land.
+
+    on_result(url, row, error) is called in this process for every finished task, in completion order. Workers
+    on other hosts can join the job with the printed command while it runs. A local worker that exits before the
+    job is finished is replaced, up to max_restarts times (default: twice the number of workers); the tasks it
+    held are requeued once their leases expire.
+
+    Args:
+        urls (list): Profile URLs to scrape.
+        on_result (callable): Called with (url, row, error) for each finished task.
+        workers (int): Number of local worker processes.
+        queue_path (str): SQLite queue database shared with the workers.
+        max_restarts (int): Replacement workers allowed for ones that died.
+        poll (float): Seconds between checks for new results.
+        quiet (bool): Discard the workers' output.
+        **worker_options: max_browsers, fast_path, platform_limits, platform_delays, lease and max_lease for
+                worker_command.
+
+    Returns:
+        int: Number of tasks left unfinished, which is 0 unless the restart budget ran out.
+    """
+    queue = WorkQueue(queue_path)
+    job_id = queue.create_job(urls)
+    command = worker_command(queue_path, job_id, **worker_options)
+    print(f"Queued job {job_id} with {len(set(urls))} profiles; join from another host with: "
+          f"python worker.py --queue {queue_path} --job {job_id}")
+
+    # Workers report their own metrics; keep them from overwriting the coordinator's metrics or profile files
+    env = {key: value for key, value in os.environ.items() if key not in ('SCRAPER_METRICS', 'SCRAPER_PROFILE')}
+    output = subprocess.DEVNULL if quiet else None
+
+    def start_worker():
+        return subprocess.Popen(command, env=env, stdout=output, stderr=output)
+
+    processes = [start_worker() for _ in range(workers)]
+    restarts = workers * 2 if max_restarts is None else max_restarts
+    merged, remaining = 0, len(set(urls))
+    try:
+        while True:
+            for seq, url, row, error in queue.results(job_id, merged):
+                on_result(url, row, error)
+                merged = seq
+            remaining = queue.remaining(job_id)
+            if not remaining:
+                break
+
+            for index, process in enumerate(processes):
+                if process.poll() is not None and process.returncode != 0:
+                    if not restarts:
+                        continue
+                    restarts -= 1
+                    print(f"Worker {process.pid} exited with code {process.returncode}; starting a replacement")
+                    processes[index] = start_worker()
+            # Heartbeats come every third of a lease, so a worker silent for a whole lease is gone
+            if (all(process.poll() is not None for process in processes)
+                    and not queue.live_workers(job_id, worker_options.get('lease', 120.0))):
+                print(f"No workers left with {remaining} profiles unfinished")
+                break
+            time.sleep(poll)
+    finally:
+        for process in processes:
+            if remaining:
+                process.terminate()  # Interrupted, or gave up; the unfinished tasks stay queued
+            try:
+                process.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        # Merge anything that finished while the workers were shutting down
+        for seq, url, row, error in queue.results(job_id, merged):
+            on_result(url, row, error)
+        remaining = queue.remaining(job_id)
+        queue.close()
+    return remaining
@@ -0,0 +1,89 @@
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+from main import scrape_batches
+from work_queue import WorkQueue, parse_platform_options
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.metrics import METRICS, instrumented_run  # noqa: E402
+
+
+def run_worker(queue_path, job_id=None, max_browsers=3, fast_path=True, platform_limits=None, platform_delays=None,
+               lease=120.0, batch_size=None, poll=0.5, max_lease=900.0):
+    """Scrape tasks of a queued job until none are left, and return the number of profiles this worker finished.
+
+    Tasks are claimed in batches of batch_size (default: twice max_browsers) and scraped with the same browsers,
+    fast path and per-platform scheduling as a single-process run. A heartbeat thread keeps the worker's leases
+    alive every third of a lease, but for no more than max_lease seconds after each claim, so the tasks of a scrape
+    that hangs are requeued even though the worker itself is alive. While other workers still hold tasks, the
+    worker keeps polling, so it takes over the tasks of any worker whose leases expire.
+    """
+    queue = WorkQueue(queue_path)
+    job_id = job_id or queue.latest_job()
+    if job_id is None:
+        print(f"No job queued in {queue_path}")
+        return 0
+    worker_id = f'{socket.gethostname()}:{os.getpid()}'
+    batch_size = batch_size or max(4, 2 * max_browsers)
+    queue.register(worker_id, job_id)
+    print(f"Worker {worker_id} joined job {job_id}")
+
+    stopped = threading.Event()
+
+    def heartbeat():
+        while not stopped.wait(lease / 3):
+            queue.heartbeat(worker_id, lease)
+
+    def claimed_batches():
+        while True:
+            urls = queue.claim(job_id, worker_id, batch_size, lease, max_lease)
+            if urls:
+                yield urls
+            elif queue.remaining(job_id):
+                time.sleep(poll)  # Other workers hold the rest; wait for them to finish or for their leases to expire
+            else:
+                return
+
+    finished = 0
+
+    def record(url, row, error=None):
+        nonlocal finished
+        finished += 1
+        METRICS.count('profiles_scraped' if row else 'profile_failures')
+        with METRICS.timer('queue_complete'):
+            queue.complete(job_id, url, row, error, worker_id)
+
+    heartbeat_thread = threading.Thread(target=heartbeat, name='worker-heartbeat', daemon=True)
+    heartbeat_thread.start()
+    try:
+        scrape_batches(claimed_batches(), record, max_browsers, platform_limits, platform_delays, fast_path)
+    finally:
+        stopped.set()
+        heartbeat_thread.join()
+        queue.close()
+    print(f"Worker {worker_id} finished {finished} profiles")
+    return finished
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Scrape profiles from a shared work queue.')
+    parser.add_argument('--queue', default='social_media_profiles.queue.sqlite3', help='SQLite work queue.')
+    parser.add_argument('--job', type=int, default=None, help='Job to work on; defaults to the latest job.')
+    parser.add_argument('--browsers', type=int, default=3, help='Warm browsers in this worker (0 for sequential).')
+    parser.add_argument('--lease', type=float, default=120.0,
+                        help='Seconds a claimed task stays leased without a heartbeat before it is requeued.')
+    parser.add_argument('--max-lease', type=float, default=900.0,
+                        help='Seconds after a claim that its leases stop being extended, so hung scrapes are requeued.')
+    parser.add_argument('--batch', type=int, default=None, help='Tasks to claim at a time.')
+    parser.add_argument('--no-fast-path', action='store_true', help='Always scrape with a browser.')
+    parser.add_argument('--platform-limits', default='', help='Browsers per platform, e.g. instagram=1,tiktok=2.')
+    parser.add_argument('--platform-delays', default='', help='Seconds between profile starts per platform.')
+    args = parser.parse_args()
+
+    with instrumented_run('social-profiles-worker'):
+        run_worker(args.queue, args.job, args.browsers, not args.no_fast_path,
+                   parse_platform_options(args.platform_limits, int), parse_platform_options(args.platform_delays, float),
+                   args.lease, args.batch, max_lease=args.max_lease)
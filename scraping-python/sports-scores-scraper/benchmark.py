@@ -0,0 +1,320 @@
+import argparse
+import contextlib
+import io
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import requests
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin, urlparse
+from games import crawl_game_details, game_id_of, parse_game_page
+from main import PARSERS, YahooSportsScoresScraper
+from store import GameStore
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+STUB_PAGE = b'<html><body><ul><li class="Bgc(bg-mod) Pos(r) Mb(20px) D(ib)"></li></ul></body></html>'
+
+
+class StubScoreboardHandler(BaseHTTPRequestHandler):
+    """Serve a fixed scoreboard page over keep-alive HTTP/1.1."""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # Avoid delayed-ACK stalls between header and body writes on kept-alive sockets
+    connect_delay = 0.0
+    page = STUB_PAGE
+
+    def setup(self):
+        # Simulate the TCP+TLS handshake cost once per new connection
+        time.sleep(self.connect_delay)
+        super().setup()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(self.page)))
+        self.end_headers()
+        self.wfile.write(self.page)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThrottlingScoreboardHandler(StubScoreboardHandler):
+    """Serve the stub page like a rate-limited host: 429 with Retry-After beyond rate requests/sec or max_in_flight."""
+    rate = 20.0
+    max_in_flight = 4
+    retry_after = 1
+    service_time = 0.02
+    lock = threading.Lock()
+    tokens = 0.0
+    last_refill = 0.0
+    in_flight = 0
+    served = 0
+    throttled = 0
+
+    @classmethod
+    def reset(cls):
+        with cls.lock:
+            cls.tokens, cls.last_refill, cls.in_flight, cls.served, cls.throttled = cls.rate, time.monotonic(), 0, 0, 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            now = time.monotonic()
+            cls.tokens = min(cls.rate, cls.tokens + (now - cls.last_refill) * cls.rate)
+            cls.last_refill = now
+            allowed = cls.tokens >= 1 and cls.in_flight < cls.max_in_flight
+            if allowed:
+                cls.tokens -= 1
+                cls.in_flight += 1
+                cls.served += 1
+            else:
+                cls.throttled += 1
+
+        if not allowed:
+            self.send_response(429)
+            self.send_header('Retry-After', str(cls.retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        try:
+            time.sleep(cls.service_time)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+
+class GameSiteHandler(StubScoreboardHandler):
+    """Serve the saved scoreboard for scoreboard requests and the saved game page for every other path."""
+    page_delay = 0.05
+    scoreboard = STUB_PAGE
+    game_page = STUB_PAGE
+
+    def do_GET(self):
+        time.sleep(self.page_delay)  # Simulated server and network time per page
+        self.page = self.scoreboard if '/scoreboard/' in self.path else self.game_page
+        super().do_GET()
+
+
+def start_stub_server(handler=StubScoreboardHandler):
+    """Start the stub server on a free local port and return it with its scoreboard URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/nba/scoreboard/'
+
+
+def legacy_fetch(base_url, date):
+    """The original fetch path: one bare requests.get, and so one new connection, per date."""
+    date_str = date.strftime('%Y-%m-%d')
+    url = f'{base_url}?confId=&dateRange={date_str}&schedState='
+    headers = {
+        'User-Agent': 'Mozilla/5.0',
+        'Accept-Language': 'en-US,en;q=0.9',
+    }
+    response = requests.get(url, headers=headers)
+    return (response.text if response.status_code == 200 else None), date_str
+
+
+def run_fetches(fetch, dates, max_workers=None):
+    """Fetch every date through the given function and return (dates/sec, failures)."""
+    failures = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch, date) for date in dates]
+        for future in as_completed(futures):
+            html_content, _ = future.result()
+            if not html_content:
+                failures += 1
+    elapsed = time.perf_counter() - start
+    return len(dates) / elapsed, failures
+
+
+def load_fixtures():
+    """Load the saved scoreboard pages as (date_str, html) pairs, dated from their file names."""
+    fixtures = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.startswith('scoreboard_') and name.endswith('.html'):
+            with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as file:
+                fixtures.append((name[len('scoreboard_'):-len('.html')], file.read()))
+    return fixtures
+
+
+def quiet_parse(parser, html_content, date_str):
+    """Run a parser backend with its progress prints suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return PARSERS[parser](html_content, date_str)
+
+
+def check_parity(fixtures):
+    """Check that every parser backend returns the same rows as html.parser for each fixture."""
+    ok = True
+    for date_str, html_content in fixtures:
+        expected = quiet_parse('html.parser', html_content, date_str)
+        for parser in PARSERS:
+            rows = quiet_parse(parser, html_content, date_str)
+            if rows != expected:
+                print(f"parity mismatch: {parser} on {date_str}\n  expected {expected}\n  got      {rows}")
+                ok = False
+    print(f"parity: {'ok' if ok else 'FAILED'} ({len(fixtures)} fixtures, {len(PARSERS)} parsers)")
+    return ok
+
+
+def bench_fetch(args):
+    StubScoreboardHandler.connect_delay = args.connect_delay
+    server, base_url = start_stub_server()
+    dates = [datetime(2024, 1, 1) + timedelta(days=i) for i in range(args.days)]
+
+    legacy_rate, legacy_failures = run_fetches(lambda date: legacy_fetch(base_url, date), dates)
+    print(f"legacy (requests.get per date): {legacy_rate:8.1f} dates/sec, {legacy_failures} failures")
+
+    # The stub host is not rate limited, so leave the scraper's request rate uncapped
+    scraper = YahooSportsScoresScraper(base_url=base_url, max_workers=args.workers, cache_dir=None, max_rate=None)
+    pooled_rate, pooled_failures = run_fetches(scraper.fetch_scores, dates, max_workers=scraper.max_workers)
+    scraper.close()
+    print(f"pooled (keep-alive session):    {pooled_rate:8.1f} dates/sec, {pooled_failures} failures")
+    print(f"speedup: {pooled_rate / legacy_rate:.2f}x")
+
+    server.shutdown()
+
+
+def bench_throttle(args):
+    handler = ThrottlingScoreboardHandler
+    handler.rate, handler.max_in_flight = args.rate, args.max_in_flight
+    server, base_url = start_stub_server(handler)
+    dates = [datetime(2024, 1, 1) + timedelta(days=i) for i in range(args.days)]
+
+    handler.reset()
+    flood_rate, flood_failures = run_fetches(lambda date: legacy_fetch(base_url, date), dates, max_workers=args.workers)
+    print(f"flood ({args.workers} threads, no limiter):  {flood_rate:8.1f} dates/sec, {flood_failures} dates missing, "
+          f"{handler.throttled} requests throttled")
+
+    handler.reset()
+    scraper = YahooSportsScoresScraper(base_url=base_url, max_workers=args.workers, cache_dir=None,
+                                       max_rate=args.max_rate)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=scraper.max_workers) as executor:
+        missing = sum(1 for html_content, _ in scraper.fetch_all(executor, dates) if not html_content)
+    adaptive_rate = len(dates) / (time.perf_counter() - start)
+    print(f"adaptive (AIMD + token bucket): {adaptive_rate:8.1f} dates/sec, {missing} dates missing, "
+          f"{handler.throttled} requests throttled")
+    scraper.limiters.report()
+    print(f"server limit: {args.rate:.1f} requests/sec, {args.max_in_flight} in flight")
+    scraper.close()
+    server.shutdown()
+
+
+def serial_crawl(scraper, dates, game_store):
+    """The unpipelined baseline: fetch and parse each scoreboard, then each of its games, one after another."""
+    for date in dates:
+        html_content, date_str = scraper.fetch_scores(date)
+        scores = quiet_parse(scraper.parser, html_content, date_str)
+        scraper.store.write_date(date_str, scores)
+        for score in scores:
+            if not score.highlights_link.startswith('http'):
+                continue
+            url = urljoin(scraper.base_url, urlparse(score.highlights_link).path)
+            game_id = game_id_of(url)
+            game_store.write_game(date_str, game_id, parse_game_page(scraper.fetch_game(url, date_str), game_id))
+
+
+def bench_games(args):
+    handler = GameSiteHandler
+    handler.page_delay = args.page_delay
+    with open(os.path.join(FIXTURES_DIR, 'scoreboard_2024-10-22.html'), 'rb') as file:
+        handler.scoreboard = file.read()
+    with open(os.path.join(FIXTURES_DIR, 'game_new-york-knicks-boston-celtics-2024102202.html'), 'rb') as file:
+        handler.game_page = file.read()
+    server, base_url = start_stub_server(handler)
+    dates = [datetime(2024, 1, 1) + timedelta(days=i) for i in range(args.days)]
+
+    for mode in ('serial', 'pipelined'):
+        with tempfile.TemporaryDirectory() as directory:
+            scraper = YahooSportsScoresScraper(base_url=base_url, max_workers=args.workers, cache_dir=None,
+                                               max_rate=None, store_dir=os.path.join(directory, 'scores'))
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                if mode == 'serial':
+                    serial_crawl(scraper, dates, GameStore(os.path.join(directory, 'games')))
+                else:
+                    crawl_game_details(scraper, dates[0], dates[-1], os.path.join(directory, 'games'),
+                                       parse_workers=args.processes, queue_size=args.queue_size)
+            elapsed = time.perf_counter() - start
+            games = len(GameStore(os.path.join(directory, 'games')).load('line_scores', dates[0], dates[-1])) // 2
+            scraper.close()
+        print(f"{mode:<10} {len(dates) / elapsed:8.1f} dates/sec, {games / elapsed:8.1f} games/sec ({games} games)")
+        if mode == 'pipelined':
+            print(''.join(line + '\n' for line in output.getvalue().splitlines() if line.startswith('Stage ')), end='')
+    print(f"peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+    server.shutdown()
+
+
+def bench_parse(args):
+    fixtures = load_fixtures()
+    if not check_parity(fixtures):
+        sys.exit(1)
+
+    pages = [fixtures[i % len(fixtures)] for i in range(args.pages)]
+    for parser in PARSERS:
+        start = time.perf_counter()
+        for date_str, html_content in pages:
+            quiet_parse(parser, html_content, date_str)
+        elapsed = time.perf_counter() - start
+        print(f"{parser:<12} 1 thread:      {len(pages) / elapsed:8.1f} pages/sec")
+
+    processes = args.processes or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # Warm up the workers before timing
+        list(executor.map(quiet_parse, ['lxml'] * processes, [html for _, html in fixtures[:1]] * processes,
+                          [date_str for date_str, _ in fixtures[:1]] * processes))
+        start = time.perf_counter()
+        rows = list(executor.map(quiet_parse, ['lxml'] * len(pages), [html for _, html in pages],
+                                 [date_str for date_str, _ in pages], chunksize=16))
+        elapsed = time.perf_counter() - start
+    print(f"{'lxml':<12} {processes} processes: {len(pages) / elapsed:8.1f} pages/sec ({sum(map(len, rows))} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks for the scoreboard scraper.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fetch_parser = subparsers.add_parser('fetch', help='Compare fetch paths against a local stub scoreboard server.')
+    fetch_parser.add_argument('--days', type=int, default=500, help='Number of dates to fetch.')
+    fetch_parser.add_argument('--workers', type=int, default=8, help='Concurrency limit for the pooled path.')
+    fetch_parser.add_argument('--connect-delay', type=float, default=0.02,
+                              help='Seconds the stub server stalls on each new connection (simulated handshake).')
+    fetch_parser.set_defaults(func=bench_fetch)
+
+    throttle_parser = subparsers.add_parser('throttle', help='Fetch from a local server that throttles with 429s.')
+    throttle_parser.add_argument('--days', type=int, default=300, help='Number of dates to fetch.')
+    throttle_parser.add_argument('--workers', type=int, default=16, help='Threads for both fetch paths.')
+    throttle_parser.add_argument('--rate', type=float, default=40.0, help='Requests/sec the server allows.')
+    throttle_parser.add_argument('--max-in-flight', type=int, default=4, help='Concurrent requests the server allows.')
+    throttle_parser.add_argument('--max-rate', type=float, default=100.0, help="The scraper's request rate cap.")
+    throttle_parser.set_defaults(func=bench_throttle)
+
+    games_parser = subparsers.add_parser('games', help='Crawl game pages from a local site, serially and pipelined.')
+    games_parser.add_argument('--days', type=int, default=60, help='Number of dates to crawl.')
+    games_parser.add_argument('--workers', type=int, default=8, help='Threads of each fetch stage.')
+    games_parser.add_argument('--processes', type=int, default=None, help='Parse processes.')
+    games_parser.add_argument('--queue-size', type=int, default=None, help='Capacity of each stage queue.')
+    games_parser.add_argument('--page-delay', type=float, default=0.05, help='Seconds the site takes per page.')
+    games_parser.set_defaults(func=bench_games)
+
+    parse_parser = subparsers.add_parser('parse', help='Check parser parity on saved fixtures and measure throughput.')
+    parse_parser.add_argument('--pages', type=int, default=2000, help='Number of fixture pages to parse per backend.')
+    parse_parser.add_argument('--processes', type=int, default=None, help='Worker processes for the pooled run.')
+    parse_parser.set_defaults(func=bench_parse)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+CachedPage = namedtuple('CachedPage', ['body', 'etag', 'last_modified', 'final'])
+
+
+class ScoreboardCache:
+    """On-disk cache of scoreboard responses keyed by league and date.
+
+    Game pages share the cache under the '<league>-games' league, keyed by their URL path instead of a date.
+
+    Pages for finished dates are marked final and served without touching the network. Other pages keep their
+    ETag/Last-Modified validators so they can be revalidated with a conditional request. Bodies are stored
+    zlib-compressed, and the least recently used entries are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024):
+        """Open (or create) the cache database inside cache_dir."""
+        os.makedirs(cache_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'scoreboards.sqlite3'), check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                league TEXT NOT NULL,
+                date TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                final INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (league, date)
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)')
+        self.conn.commit()
+
+    def get(self, league, date_str):
+        """Return the cached page for a league and date, or None if it is not cached."""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT body, etag, last_modified, final FROM pages WHERE league = ? AND date = ?',
+                (league, date_str)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute('UPDATE pages SET accessed_at = ? WHERE league = ? AND date = ?',
+                              (time.time(), league, date_str))
+            self.conn.commit()
+        body, etag, last_modified, final = row
+        return CachedPage(zlib.decompress(body).decode('utf-8'), etag, last_modified, bool(final))
+
+    def put(self, league, date_str, body, etag=None, last_modified=None, final=False):
+        """Store a page, replacing any previous entry for the same league and date, then enforce the size cap."""
+        compressed = zlib.compress(body.encode('utf-8'))
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages (league, date, body, etag, last_modified, final, size, accessed_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (league, date_str, compressed, etag, last_modified, int(final), len(compressed), time.time())
+            )
+            self.evict()
+            self.conn.commit()
+
+    def mark_final(self, league, date_str):
+        """Mark a cached page as final after a 304 confirms it for a date that has since finished."""
+        with self.lock:
+            self.conn.execute('UPDATE pages SET final = 1, accessed_at = ? WHERE league = ? AND date = ?',
+                              (time.time(), league, date_str))
+            self.conn.commit()
+
+    def evict(self):
+        """Delete least recently used pages until the cache fits in max_bytes. Caller must hold the lock."""
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for league, date_str, size in self.conn.execute(
+                'SELECT league, date, size FROM pages ORDER BY accessed_at').fetchall():
+            self.conn.execute('DELETE FROM pages WHERE league = ? AND date = ?', (league, date_str))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        """Close the cache database."""
+        with self.lock:
+            self.conn.close()
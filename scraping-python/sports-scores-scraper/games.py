@@ -0,0 +1,192 @@
+import argparse
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urljoin, urlparse
+from lxml import etree
+from lxml import html as lxml_html
+from main import PARSERS, YahooSportsScoresScraper
+from pipeline import Pipeline
+from store import GameStore
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.metrics import METRICS, instrumented_run  # noqa: E402
+
+# Tables are found by their header labels rather than by class names: the line score is the table whose last
+# header is the total column 'T', and each box score table (starters, then bench) has a 'PTS' column.
+LINE_SCORE_XPATH = etree.XPath('//table[thead/tr/th[last()][normalize-space() = "T"]]')
+BOX_SCORE_XPATH = etree.XPath('//table[thead/tr/th[normalize-space() = "PTS"]]')
+HEADER_XPATH = etree.XPath('thead/tr/th')
+ROWS_XPATH = etree.XPath('tbody/tr')
+CELLS_XPATH = etree.XPath('th|td')
+PLAYER_NAME_XPATH = etree.XPath('string((th|td)[1]//a[1])')
+TEAM_HEADING_XPATH = etree.XPath('preceding::*[self::h2 or self::h3 or self::h4][1]')
+
+STAT_COLUMNS = ['MIN', 'FG', '3PT', 'FT', 'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TO', 'PF', '+/-', 'PTS']
+TEXT_STATS = {'MIN', 'FG', '3PT', 'FT'}  # Kept as shown, e.g. '9-21' made-attempted
+SUMMARY_ROWS = {'Totals', 'Team'}
+
+
+def game_id_of(url):
+    """Return a game's id, the last path segment of its page URL (e.g. 'new-york-knicks-boston-celtics-2024102202')."""
+    return urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+
+
+def to_int(text):
+    """Parse an integer stat such as '12', '-20' or '+7', or return None for blanks and placeholders."""
+    try:
+        return int(text.strip().replace('+', ''))
+    except ValueError:
+        return None
+
+
+def parse_game_page(html_content, game_id):
+    """Parse a game page into its line score and player box score.
+
+    A module-level function so it can run in a process pool.
+
+    Returns:
+        dict: 'line_scores' with one row per team (Game, Team, Periods, Total) and 'player_stats' with one row
+        per player (Game, Team, Player, Starter and the STAT_COLUMNS). Players who did not play have no stats.
+    """
+    tree = lxml_html.fromstring(html_content)
+    details = {'line_scores': [], 'player_stats': []}
+
+    for table in LINE_SCORE_XPATH(tree)[:1]:
+        for row in ROWS_XPATH(table):
+            cells = [cell.text_content().strip() for cell in CELLS_XPATH(row)]
+            if len(cells) >= 2:
+                details['line_scores'].append({
+                    'Game': game_id,
+                    'Team': cells[0],
+                    'Periods': [to_int(cell) for cell in cells[1:-1]],
+                    'Total': to_int(cells[-1]),
+                })
+
+    for table in BOX_SCORE_XPATH(tree):
+        headers = [header.text_content().strip() for header in HEADER_XPATH(table)]
+        heading = TEAM_HEADING_XPATH(table)
+        team = heading[0].text_content().strip() if heading else None
+        for row in ROWS_XPATH(table):
+            cells = CELLS_XPATH(row)
+            player = PLAYER_NAME_XPATH(row).strip() or cells[0].text_content().strip()
+            if not player or player in SUMMARY_ROWS:
+                continue
+            player_row = {'Game': game_id, 'Team': team, 'Player': player, 'Starter': headers[0] == 'Starters'}
+            # A 'DNP' row spans the stat columns with one cell, so only full rows carry stats
+            if len(cells) == len(headers):
+                for header, cell in zip(headers[1:], cells[1:]):
+                    if header in STAT_COLUMNS:
+                        text = cell.text_content().strip()
+                        player_row[header] = text if header in TEXT_STATS else to_int(text)
+            details['player_stats'].append(player_row)
+
+    return details
+
+
+def crawl_game_details(scraper, start_date, end_date, store_dir='nba_games', parse_workers=None, queue_size=None):
+    """Crawl every game between two dates through a staged pipeline and store its line score and box score.
+
+    Stages, each with its own threads and a bounded input queue:
+    scoreboard_fetch -> scoreboard_parse -> game_fetch -> game_parse -> write. The scoreboard scores are
+    written to the scraper's score store as well. Both fetch stages use scraper.max_workers threads through
+    the scraper's session, cache and rate limiter; both parse stages hand pages to one process pool and use
+    one thread per parse worker. While game pages of one day are downloading, later scoreboards are
+    already being fetched and parsed, and queue_size bounds how far ahead any stage gets.
+
+    Args:
+        scraper (YahooSportsScoresScraper): Provides fetching, the parser backend and the score store.
+        start_date (datetime): First date to crawl.
+        end_date (datetime): Last date to crawl.
+        store_dir (str): Root directory of the game details store.
+        parse_workers (int): Parse processes; defaults to scraper.parse_workers, or one per CPU.
+        queue_size (int): Capacity of every stage's input queue; defaults to twice the stage's threads.
+
+    Returns:
+        dict: Counts of dates, games and game pages that could not be fetched.
+    """
+    game_store = GameStore(store_dir)
+    parse_fn = PARSERS[scraper.parser]
+    parse_workers = parse_workers or scraper.parse_workers or os.cpu_count()
+    dates = (start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1))
+    totals = {'dates': 0, 'games': 0, 'dates_missing': 0, 'games_missing': 0}
+    totals_lock = threading.Lock()
+
+    def tally(key):
+        with totals_lock:
+            totals[key] += 1
+
+    def fetch_scoreboard(date):
+        result = scraper.fetch_retrying(scraper.fetch_page, date)
+        if result.body is None:
+            tally('dates_missing')
+            print(f"Scoreboard for {result.date_str} could not be fetched")
+            return []
+        return [('scoreboard_parse', (result.date_str, result.body))]
+
+    def parse_scoreboard(page):
+        date_str, html_content = page
+        scores = parse_executor.submit(parse_fn, html_content, date_str).result()
+        # Follow each game's link on the host the scoreboard came from
+        links = [urljoin(scraper.base_url, urlparse(score.highlights_link).path)
+                 for score in scores if score.highlights_link.startswith('http')]
+        return [('write', ('scores', date_str, scores))] + [('game_fetch', (date_str, link)) for link in links]
+
+    def fetch_game(game):
+        date_str, url = game
+        html_content = scraper.fetch_game(url, date_str)
+        if html_content is None:
+            tally('games_missing')
+            print(f"Game page {url} could not be fetched")
+            return []
+        return [('game_parse', (date_str, game_id_of(url), html_content))]
+
+    def parse_game(page):
+        date_str, game_id, html_content = page
+        details = parse_executor.submit(parse_game_page, html_content, game_id).result()
+        return [('write', ('game', date_str, game_id, details))]
+
+    def write(item):
+        if item[0] == 'scores':
+            _, date_str, scores = item
+            tally('dates')
+            scraper.store.write_date(date_str, scores)
+        else:
+            _, date_str, game_id, details = item
+            tally('games')
+            METRICS.count('players', len(details['player_stats']))
+            game_store.write_game(date_str, game_id, details)
+        return []
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as parse_executor:
+        pipeline = Pipeline()
+        pipeline.add_stage('scoreboard_fetch', fetch_scoreboard, scraper.max_workers, queue_size,
+                           outputs=['scoreboard_parse'])
+        pipeline.add_stage('scoreboard_parse', parse_scoreboard, parse_workers, queue_size,
+                           outputs=['write', 'game_fetch'])
+        pipeline.add_stage('game_fetch', fetch_game, scraper.max_workers, queue_size, outputs=['game_parse'])
+        pipeline.add_stage('game_parse', parse_game, parse_workers, queue_size, outputs=['write'])
+        # One writer, so the store is only ever written from one thread
+        pipeline.add_stage('write', write, 1, queue_size)
+        pipeline.run('scoreboard_fetch', dates)
+
+    pipeline.report()
+    scraper.limiters.report()
+    print(f"{totals['games']} games on {totals['dates']} dates saved to {game_store.root}")
+    return totals
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Crawl box scores and player stats of every game in a date range.')
+    parser.add_argument('start', type=lambda value: datetime.strptime(value, '%Y-%m-%d'), help='First date, YYYY-MM-DD.')
+    parser.add_argument('end', type=lambda value: datetime.strptime(value, '%Y-%m-%d'), help='Last date, YYYY-MM-DD.')
+    parser.add_argument('--store', default='nba_games', help='Root directory of the game details store.')
+    parser.add_argument('--queue-size', type=int, default=None, help='Capacity of each stage queue.')
+    args = parser.parse_args()
+
+    with instrumented_run('sports-games'):
+        scraper = YahooSportsScoresScraper()
+        crawl_game_details(scraper, args.start, args.end, args.store, queue_size=args.queue_size)
+        scraper.close()
@@ -1,95 +1,370 @@
+import os
+import sys
+import time
 import requests
-import pandas as pd
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque, namedtuple
+from datetime import date as date_type, datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from lxml import etree
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from urllib3.util.retry import Retry
+from cache import ScoreboardCache
+from rate_limit import RateLimiters, parse_retry_after
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.exporters import open_exporter  # noqa: E402
+from scraping_common.metrics import METRICS  # noqa: E402
+from scraping_common.records import GameScore, column_types  # noqa: E402
+
+SCORE_COLUMNS = list(GameScore.columns)
+
+# Precompiled selectors for the lxml parser. normalize-space(@class) mirrors how BeautifulSoup joins a
+# multi-valued class attribute before the substring checks in parse_scores_bs4.
+NO_GAMES_XPATH = etree.XPath('//span[text()[contains(., "No games in NBA Scores are scheduled on")]]')
+GAMES_XPATH = etree.XPath(
+    '//li[contains(normalize-space(@class), "Bgc(bg-mod)") and contains(normalize-space(@class), "Pos(r)")'
+    ' and contains(normalize-space(@class), "Mb(20px)") and contains(normalize-space(@class), "D(ib)")]'
+)
+TEAMS_XPATH = etree.XPath('.//li[contains(normalize-space(@class), "D(tb) team")]')
+TEAM_NAME_XPATH = etree.XPath('(.//span[contains(normalize-space(@class), "YahooSans Fw(700)! Fz(14px)!")])[1]')
+TEAM_SCORE_XPATH = etree.XPath('(.//span[contains(normalize-space(@class), "YahooSans Fw(700)! Va(m) Fz(24px)!")])[1]')
+HIGHLIGHTS_XPATH = etree.XPath('.//a[normalize-space(@class) = "D(b) Px(20px) Py(8px) C(#000) Bgc(#ededf3)"]/@href')
+
+
+def parse_scores_bs4(html_content, date_str):
+    """Parse scores from the fetched HTML content with BeautifulSoup's pure-Python html.parser."""
+    from bs4 import BeautifulSoup  # Only this backend needs bs4
+
+    soup = BeautifulSoup(html_content, 'html.parser')
+    scores = []
+
+    no_games_message = soup.find('span', string=lambda x: x and 'No games in NBA Scores are scheduled on' in x)
+    if no_games_message:
+        scores.append(GameScore(date_str, 'N/A', 'N/A', 'N/A', 'N/A', 'No games scheduled'))
+        return scores
+
+    games = soup.find_all('li', class_=lambda x: x and 'Bgc(bg-mod)' in x and 'Pos(r)' in x and 'Mb(20px)' in x and 'D(ib)' in x)
+    for game in games:
+        try:
+            teams = game.find_all('li', class_=lambda x: x and 'D(tb) team' in x)
+            if len(teams) == 2:
+                home_team_name_elem = teams[1].find('span', class_=lambda x: x and 'YahooSans Fw(700)! Fz(14px)!' in x)
+                away_team_name_elem = teams[0].find('span', class_=lambda x: x and 'YahooSans Fw(700)! Fz(14px)!' in x)
+                home_team_score_elem = teams[1].find('span', class_=lambda x: x and 'YahooSans Fw(700)! Va(m) Fz(24px)!' in x)
+                away_team_score_elem = teams[0].find('span', class_=lambda x: x and 'YahooSans Fw(700)! Va(m) Fz(24px)!' in x)
+
+                if home_team_name_elem and away_team_name_elem and home_team_score_elem and away_team_score_elem:
+                    home_team_name = home_team_name_elem.text
+                    away_team_name = away_team_name_elem.text
+                    home_team_score = int(home_team_score_elem.text)
+                    away_team_score = int(away_team_score_elem.text)
+
+                    # Extract the highlights link if available
+                    highlights_elem = game.find('a', class_="D(b) Px(20px) Py(8px) C(#000) Bgc(#ededf3)")
+                    highlights_link = f"https://sports.yahoo.com{highlights_elem['href']}" if highlights_elem else "No highlights available"
+
+                    scores.append(GameScore(date_str, home_team_name, home_team_score, away_team_name,
+                                            away_team_score, highlights_link))
+
+        except Exception as e:
+            print(f"Error parsing game on {date_str}: {e}")
+
+    print(f"{date_str} - Done Processing.")
+    return scores
+
+
+def parse_scores_lxml(html_content, date_str):
+    """Parse scores from the fetched HTML content with lxml and precompiled XPath selectors.
+
+    Produces the same rows as parse_scores_bs4, and is a module-level function so it can run in a process pool.
+    """
+    tree = lxml_html.fromstring(html_content)
+    scores = []
+
+    if NO_GAMES_XPATH(tree):
+        scores.append(GameScore(date_str, 'N/A', 'N/A', 'N/A', 'N/A', 'No games scheduled'))
+        return scores
+
+    for game in GAMES_XPATH(tree):
+        try:
+            score_info = parse_game_lxml(game, date_str)
+            if score_info:
+                scores.append(score_info)
+        except Exception as e:
+            print(f"Error parsing game on {date_str}: {e}")
+
+    print(f"{date_str} - Done Processing.")
+    return scores
+
+
+def parse_game_lxml(game, date_str):
+    """Extract one game's GameScore from a scoreboard game element, or None if it has no final or live score."""
+    teams = TEAMS_XPATH(game)
+    if len(teams) != 2:
+        return None
+
+    home_team_name_elem = TEAM_NAME_XPATH(teams[1])
+    away_team_name_elem = TEAM_NAME_XPATH(teams[0])
+    home_team_score_elem = TEAM_SCORE_XPATH(teams[1])
+    away_team_score_elem = TEAM_SCORE_XPATH(teams[0])
+    if not (home_team_name_elem and away_team_name_elem and home_team_score_elem and away_team_score_elem):
+        return None
+
+    # Extract the highlights link if available
+    highlights_href = HIGHLIGHTS_XPATH(game)
+    highlights_link = f"https://sports.yahoo.com{highlights_href[0]}" if highlights_href else "No highlights available"
+
+    return GameScore(date_str, home_team_name_elem[0].text_content(), int(home_team_score_elem[0].text_content()),
+                     away_team_name_elem[0].text_content(), int(away_team_score_elem[0].text_content()),
+                     highlights_link)
+
+
+def timed_parse(parse_fn, html_content, date_str):
+    """Parse in a worker process and return the scores with the seconds spent, for the parent's metrics."""
+    start = time.perf_counter()
+    scores = parse_fn(html_content, date_str)
+    return scores, time.perf_counter() - start
+
+
+# Responses that mean the host is overloaded or throttling; their dates are fetched again later
+RETRYABLE_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+FetchResult = namedtuple('FetchResult', ['body', 'date_str', 'retryable'])
+
+PARSERS = {
+    'lxml': parse_scores_lxml,
+    'html.parser': parse_scores_bs4,
+}
+
 
 class YahooSportsScoresScraper:
-    def __init__(self):
-        """Initialize the scraper with the Yahoo Sports base URL."""
-        self.base_url = 'https://sports.yahoo.com/nba/scoreboard/'
+    def __init__(self, base_url='https://sports.yahoo.com/nba/scoreboard/', max_workers=8, timeout=10,
+                 retries=3, backoff_factor=0.5, parser='lxml', parse_workers=None, league='nba',
+                 cache_dir='.scoreboard_cache', cache_max_bytes=512 * 1024 * 1024, settle_days=1,
+                 store_dir='nba_scores', max_rate=10.0, max_attempts=8):
+        """Initialize the scraper with the Yahoo Sports base URL and a pooled HTTP session.
+
+        Args:
+            base_url (str): The scoreboard URL to query.
+            max_workers (int): Maximum number of requests in flight at once; the rate limiter adapts the actual
+                concurrency below it to what the host sustains.
+            timeout (float): Connect/read timeout in seconds for each request.
+            retries (int): Number of immediate retries on connection errors.
+            backoff_factor (float): Exponential backoff factor between retries.
+            parser (str): Parser backend, 'lxml' (default) or 'html.parser' for the original BeautifulSoup path.
+            parse_workers (int): Worker processes for parsing; None uses one per CPU, 0 parses on the collector thread.
+            league (str): League name used to key cached pages.
+            cache_dir (str): Directory of the on-disk response cache, or None to disable caching.
+            cache_max_bytes (int): Size cap of the cache; least recently used pages are evicted beyond it.
+            settle_days (int): Days after which a date's scores are final and served from the cache without a request.
+            store_dir (str): Root directory of the season/date partitioned Parquet score store.
+            max_rate (float): Requests per second allowed to the host before it throttles, or None for no cap.
+            max_attempts (int): Times a throttled or failed date is fetched before it is reported missing.
+        """
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser '{parser}'. Choose from: {', '.join(PARSERS)}")
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.parser = parser
+        self.parse_workers = parse_workers
+        self.timeout = timeout
+        self.session = self.create_session(retries, backoff_factor)
+        self.league = league
+        self.settle_days = settle_days
+        self.cache = ScoreboardCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.store_dir = store_dir
+        self._store = None
+        self.max_attempts = max_attempts
+        self.limiters = RateLimiters(max_concurrency=max_workers, max_rate=max_rate)
+
+    @property
+    def store(self):
+        """The Parquet score store, opened on first use so that CSV runs never import pyarrow."""
+        if self._store is None:
+            from store import ScoreStore
+            self._store = ScoreStore(self.store_dir)
+        return self._store
+
+    def create_session(self, retries, backoff_factor):
+        """Create a keep-alive session whose connection pool is sized to the concurrency limit."""
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            # 429 and 5xx go back to fetch_page, Retry-After included, so the rate limiter sees every one
+            status_forcelist=(),
+            respect_retry_after_header=False,
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False,
+        )
+        # pool_block keeps the number of open connections at max_workers, so sockets are reused
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry, pool_block=True)
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def is_final(self, date):
+        """Return True if scores for the date can no longer change."""
+        day = date.date() if isinstance(date, datetime) else date
+        return day <= date_type.today() - timedelta(days=self.settle_days)
 
     def fetch_scores(self, date):
-        """Fetch game scores for a specific date."""
+        """Fetch game scores for a specific date and return (html_content or None, date_str)."""
+        result = self.fetch_page(date)
+        return result.body, result.date_str
+
+    @METRICS.timed('fetch_scores')
+    def fetch_page(self, date):
+        """Fetch the scoreboard page for a date through the host's rate limiter, serving finished dates from the cache.
+
+        Returns:
+            FetchResult: The page body (or None), the date string, and whether a failed fetch is worth retrying
+            (the host throttled, answered 5xx or could not be reached).
+        """
         date_str = date.strftime('%Y-%m-%d')
         url = f'{self.base_url}?confId=&dateRange={date_str}&schedState='
-        headers = {
-            'User-Agent': 'Mozilla/5.0',
-            'Accept-Language': 'en-US,en;q=0.9',
-        }
-        response = requests.get(url, headers=headers)
+        return self.fetch_url(url, self.league, date_str, self.is_final(date))
+
+    @METRICS.timed('fetch_game')
+    def fetch_game(self, url, date_str):
+        """Fetch a game page (a scoreboard's highlights link), retrying it in place while the host throttles.
+
+        Game pages are cached under '<league>-games' and keyed by their URL path; pages of finished dates are
+        served from the cache without a request.
+
+        Returns:
+            str: The page body, or None if it could not be fetched within max_attempts.
+        """
+        final = self.is_final(datetime.strptime(date_str, '%Y-%m-%d'))
+        return self.fetch_retrying(self.fetch_url, url, f'{self.league}-games', urlparse(url).path, final).body
+
+    def fetch_retrying(self, fetch, *args):
+        """Call fetch(*args) again while it fails with a retryable FetchResult, up to max_attempts times in all.
+
+        The rate limiter has already slowed down by the time a throttled fetch runs again. This is the in-place
+        counterpart of fetch_all's requeueing, for callers that fetch one page per thread.
+        """
+        for _ in range(self.max_attempts - 1):
+            result = fetch(*args)
+            if result.body is not None or not result.retryable:
+                return result
+            METRICS.count('requeued')
+        return fetch(*args)
 
-        if response.status_code == 200:
-            return response.text, date_str
+    def fetch_url(self, url, cache_league, cache_key, final):
+        """Fetch a page through the host's rate limiter, caching it under (cache_league, cache_key).
+
+        A cached page marked final is served without a request; other cached pages are revalidated with
+        conditional requests, and final is recorded with the page once it is downloaded or confirmed.
+
+        Returns:
+            FetchResult: The page body (or None), cache_key, and whether a failed fetch is worth retrying.
+        """
+        cached = self.cache.get(cache_league, cache_key) if self.cache else None
+        if cached and cached.final:
+            METRICS.count('cache_final_hits')
+            return FetchResult(cached.body, cache_key, False)
+
+        # Revalidate pages that may still change instead of downloading them again
+        headers = {}
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+
+        limiter = self.limiters.for_url(url)
+        with METRICS.timer('rate_limit_wait'):
+            limiter.acquire()
+        # Released whatever happens, or the host's in-flight count stays raised; anything that fails before a
+        # response counts as throttled
+        throttled, retry_after = True, None
+        try:
+            with METRICS.timer('http_get'):
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            throttled = response.status_code in RETRYABLE_STATUSES
+            retry_after = parse_retry_after(response.headers.get('Retry-After')) if throttled else None
+        except requests.RequestException as e:
+            print(f"Failed to fetch data for {cache_key}: {e}")
+            METRICS.count('fetch_failures')
+            return FetchResult(None, cache_key, True)
+        finally:
+            limiter.release(throttled, retry_after)
+
+        if response.status_code == 304 and cached:
+            METRICS.count('not_modified')
+            if final:
+                self.cache.mark_final(cache_league, cache_key)
+            return FetchResult(cached.body, cache_key, False)
+        elif response.status_code == 200:
+            METRICS.count('pages_downloaded')
+            if self.cache:
+                self.cache.put(cache_league, cache_key, response.text, response.headers.get('ETag'),
+                               response.headers.get('Last-Modified'), final=final)
+            return FetchResult(response.text, cache_key, False)
+        elif throttled:
+            METRICS.count('throttled')
+            return FetchResult(None, cache_key, True)
         else:
-            print(f"Failed to fetch data for {date_str}. Status code: {response.status_code}")
-            return None, date_str
+            print(f"Failed to fetch data for {cache_key}. Status code: {response.status_code}")
+            METRICS.count('fetch_failures')
+            return FetchResult(None, cache_key, False)
+
+    def fetch_all(self, executor, dates):
+        """Fetch every date on the executor and yield (html_content, date_str) as pages arrive.
 
+        Throttled and failed dates go back into the queue instead of being dropped; the rate limiter has already
+        slowed down by the time they run again. A date that still fails after max_attempts is yielded with None.
+        At most twice max_workers fetches are submitted at once and new ones only as pages are consumed, so a
+        caller that falls behind holds a bounded number of pages however long the date range is.
+        """
+        queued = deque(dates)
+        window = 2 * self.max_workers
+        attempts = {}
+        pending = {}
+        while queued or pending:
+            while queued and len(pending) < window:
+                date = queued.popleft()
+                pending[executor.submit(self.fetch_page, date)] = date
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                date = pending.pop(future)
+                result = future.result()
+                attempts[date] = attempts.get(date, 0) + 1
+                if result.body is None and result.retryable and attempts[date] < self.max_attempts:
+                    METRICS.count('requeued')
+                    queued.append(date)
+                else:
+                    yield result.body, result.date_str
+
+    @METRICS.timed('parse')
     def parse_scores(self, html_content, date_str):
-        """Parse scores from the fetched HTML content."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        scores = []
-
-        no_games_message = soup.find('span', string=lambda x: x and 'No games in NBA Scores are scheduled on' in x)
-        if no_games_message:
-            scores.append({
-                'Date': date_str,
-                'Home Team': 'N/A',
-                'Away Team': 'N/A',
-                'Home Score': 'N/A',
-                'Away Score': 'N/A',
-                'Highlights Link': 'No games scheduled'
-            })
-            return scores
-
-        games = soup.find_all('li', class_=lambda x: x and 'Bgc(bg-mod)' in x and 'Pos(r)' in x and 'Mb(20px)' in x and 'D(ib)' in x)
-        for game in games:
-            try:
-                teams = game.find_all('li', class_=lambda x: x and 'D(tb) team' in x)
-                if len(teams) == 2:
-                    home_team_name_elem = teams[1].find('span', class_=lambda x: x and 'YahooSans Fw(700)! Fz(14px)!' in x)
-                    away_team_name_elem = teams[0].find('span', class_=lambda x: x and 'YahooSans Fw(700)! Fz(14px)!' in x)
-                    home_team_score_elem = teams[1].find('span', class_=lambda x: x and 'YahooSans Fw(700)! Va(m) Fz(24px)!' in x)
-                    away_team_score_elem = teams[0].find('span', class_=lambda x: x and 'YahooSans Fw(700)! Va(m) Fz(24px)!' in x)
-
-                    if home_team_name_elem and away_team_name_elem and home_team_score_elem and away_team_score_elem:
-                        home_team_name = home_team_name_elem.text
-                        away_team_name = away_team_name_elem.text
-                        home_team_score = int(home_team_score_elem.text)
-                        away_team_score = int(away_team_score_elem.text)
-
-                        # Extract the highlights link if available
-                        highlights_elem = game.find('a', class_="D(b) Px(20px) Py(8px) C(#000) Bgc(#ededf3)")
-                        highlights_link = f"https://sports.yahoo.com{highlights_elem['href']}" if highlights_elem else "No highlights available"
-
-                        score_info = {
-                            'Date': date_str,
-                            'Home Team': home_team_name,
-                            'Home Score': home_team_score,
-                            'Away Team': away_team_name,
-                            'Away Score': away_team_score,
-                            'Highlights Link': highlights_link
-                        }
-                        scores.append(score_info)
-
-            except Exception as e:
-                print(f"Error parsing game on {date_str}: {e}")
-
-        print(f"{date_str} - Done Processing.")
-        return scores
+        """Parse scores from the fetched HTML content with the configured parser backend."""
+        return PARSERS[self.parser](html_content, date_str)
 
-    def save_to_csv(self, scores, start_date, end_date):
-        """Save scores to a CSV file with date range in the filename."""
-        df = pd.DataFrame(scores)
-        # Sort the data by date in ascending order
-        df['Date'] = pd.to_datetime(df['Date'])  # Convert to datetime for sorting
-        df = df.sort_values(by='Date')           # Sort by the date column
-        filename = f'nba_scores_{start_date.strftime("%Y%m%d")}_to_{end_date.strftime("%Y%m%d")}.csv'
-        df.to_csv(filename, index=False)
+    def save_to_csv(self, scores, start_date, end_date, fmt='csv'):
+        """Save scores to a CSV (or JSON Lines) file with date range in the filename, without pandas."""
+        filename = f'nba_scores_{start_date.strftime("%Y%m%d")}_to_{end_date.strftime("%Y%m%d")}.{fmt}'
+        with METRICS.timer('write'), open_exporter(filename, SCORE_COLUMNS, types=column_types(GameScore)) as exporter:
+            # Dates are YYYY-MM-DD strings, so they sort chronologically as they are
+            exporter.write_many(sorted(scores, key=lambda score: score.date))
         print(f"Scores saved to {filename}")
 
-    def scrape_historical_scores(self, start_date, end_date):
-        """Scrape historical scores between two dates using concurrency."""
+    def scrape_historical_scores(self, start_date, end_date, output='store'):
+        """Scrape historical scores between two dates using concurrency.
+
+        Args:
+            start_date (datetime): First date to scrape.
+            end_date (datetime): Last date to scrape.
+            output (str): 'store' writes each date to its partition in the score store as soon as it is parsed;
+                'csv' or 'jsonl' collects every row and writes a single nba_scores_<start>_to_<end>.<output> at
+                the end.
+        """
         current_date = start_date
         date_list = []
 
@@ -98,23 +373,78 @@ class YahooSportsScoresScraper:
             current_date += timedelta(days=1)
 
         all_scores = []
+        parse_fn = PARSERS[self.parser]
+
+        def collect(date_str, scores):
+            METRICS.count('games', len(scores))
+            if output == 'store':
+                with METRICS.timer('write'):
+                    self.store.write_date(date_str, scores)
+            else:
+                all_scores.extend(scores)
+
+        missing = []
+
+        # Using ThreadPoolExecutor to handle concurrency for each day, capped at the session pool size; the
+        # rate limiter keeps the requests actually in flight at what the host sustains.
+        # Parsing is handed to a process pool so the collector keeps draining fetches while pages are parsed;
+        # every finished parse is written as soon as the collector sees it, and at most two pages per parse
+        # process wait in the pool, so memory stays flat over a long backfill.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            if self.parse_workers == 0:
+                for html_content, date_str in self.fetch_all(executor, date_list):
+                    if html_content:
+                        with METRICS.timer('parse'):
+                            scores = parse_fn(html_content, date_str)
+                        collect(date_str, scores)
+                    else:
+                        missing.append(date_str)
+            else:
+                parse_workers = self.parse_workers or os.cpu_count()
+                max_in_flight = 2 * parse_workers
+                in_flight = {}
+
+                def drain(block):
+                    """Collect every finished parse; with block, wait until at least one has finished."""
+                    done, _ = wait(in_flight, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        scores, seconds = future.result()
+                        METRICS.observe('parse', seconds)
+                        collect(in_flight.pop(future), scores)
+
+                with ProcessPoolExecutor(max_workers=parse_workers) as parse_executor:
+                    for html_content, date_str in self.fetch_all(executor, date_list):
+                        if not html_content:
+                            missing.append(date_str)
+                            continue
+                        in_flight[parse_executor.submit(timed_parse, parse_fn, html_content, date_str)] = date_str
+                        drain(block=len(in_flight) >= max_in_flight)
+
+                    while in_flight:
+                        drain(block=True)
+
+        self.limiters.report()
+        if missing:
+            METRICS.count('dates_missing', len(missing))
+            print(f"{len(missing)} dates could not be fetched: {', '.join(sorted(missing))}")
 
-        # Using ThreadPoolExecutor to handle concurrency for each day
-        with ThreadPoolExecutor() as executor:
-            future_to_date = {executor.submit(self.fetch_scores, date): date for date in date_list}
+        if output == 'store':
+            print(f"Scores saved to {self.store.root}")
+        elif all_scores:
+            self.save_to_csv(all_scores, start_date, end_date, fmt=output)
 
-            for future in as_completed(future_to_date):
-                html_content, date_str = future.result()
-                if html_content:
-                    parsed_scores = self.parse_scores(html_content, date_str)
-                    all_scores.extend(parsed_scores)
+    def load_scores(self, start_date, end_date, columns=None, filter=None):
+        """Load stored scores for a date range into a DataFrame; see ScoreStore.load."""
+        return self.store.load(start_date, end_date, columns=columns, filter=filter)
 
-        if all_scores:
-            self.save_to_csv(all_scores, start_date, end_date)
+    def close(self):
+        """Close the pooled HTTP session and the response cache."""
+        self.session.close()
+        if self.cache:
+            self.cache.close()
 
 
 if __name__ == "__main__":
-    start_date = datetime(2024, 9, 24)  # Adjust start date
-    end_date = datetime(2024, 10, 24)   # Adjust end date
-    scraper = YahooSportsScoresScraper()
-    scraper.scrape_historical_scores(start_date, end_date)
+    # Same as python -m scraping_common.cli scores from the scraping-python folder
+    from scraping_common.cli import run
+    run(['scores', *sys.argv[1:]])
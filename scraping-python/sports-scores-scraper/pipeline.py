@@ -0,0 +1,127 @@
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.metrics import METRICS  # noqa: E402
+
+DONE = object()  # Sentinel telling a stage worker that its input is closed
+
+
+class Stage:
+    """One pipeline stage: worker threads that take items from a bounded input queue and send results on."""
+
+    def __init__(self, name, fn, workers, queue_size, outputs):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.outputs = outputs
+        self.open_inputs = 0
+        self.running = workers
+        self.processed = 0
+        self.errors = 0
+        self.peak_depth = 0
+
+
+class Pipeline:
+    """Staged producer/consumer pipeline connected by bounded queues.
+
+    Each stage has its own worker threads and a bounded input queue. A stage function takes one item and returns
+    an iterable of (stage_name, item) pairs to send on, so a stage can fan out to several items and to more than
+    one downstream stage. A full queue blocks the stage that sends to it. Fetching and parsing therefore overlap,
+    and memory stays bounded by the queue sizes however long the input is. A stage is closed once every stage
+    feeding it has finished; exceptions are counted and printed, and the item is dropped.
+
+    Every stage's busy time is recorded as pipeline_<name>, and the time it spent blocked on a full downstream
+    queue as pipeline_<name>_blocked, so the bottleneck stage is the one its upstream is blocked on.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    def add_stage(self, name, fn, workers=1, queue_size=None, outputs=()):
+        """Add a stage; fn(item) returns (stage_name, item) pairs, each naming one of outputs.
+
+        Args:
+            name (str): Stage name, used for routing and metrics.
+            fn (callable): Processes one item.
+            workers (int): Worker threads, and so items processed at once.
+            queue_size (int): Capacity of the input queue; defaults to twice the workers.
+            outputs (tuple): Names of the stages this one sends to.
+        """
+        self.stages[name] = Stage(name, fn, workers, queue_size or 2 * workers, tuple(outputs))
+        return self
+
+    def send(self, stage, target, item):
+        """Put an item on a downstream stage's queue, blocking while the queue is full."""
+        if target not in stage.outputs:
+            raise ValueError(f"Stage '{stage.name}' does not send to '{target}'")
+        start = time.perf_counter()
+        self.put(self.stages[target], item)
+        METRICS.observe(f'pipeline_{stage.name}_blocked', time.perf_counter() - start)
+
+    def put(self, stage, item):
+        """Put an item on a stage's queue and track the queue's peak depth."""
+        stage.inbox.put(item)
+        stage.peak_depth = max(stage.peak_depth, stage.inbox.qsize())
+
+    def work(self, stage):
+        """Run one worker of a stage until its input is closed, then close downstream stages it was last to feed."""
+        while True:
+            item = stage.inbox.get()
+            if item is DONE:
+                break
+            try:
+                with METRICS.timer(f'pipeline_{stage.name}'):
+                    results = list(stage.fn(item) or ())
+                for target, result in results:
+                    self.send(stage, target, result)
+                with self.lock:
+                    stage.processed += 1
+            except Exception as e:
+                with self.lock:
+                    stage.errors += 1
+                METRICS.count(f'pipeline_{stage.name}_errors')
+                print(f"Error in pipeline stage {stage.name}: {e}")
+
+        with self.lock:
+            stage.running -= 1
+            finished = stage.running == 0
+        if finished:
+            for target in stage.outputs:
+                self.close_input(self.stages[target])
+
+    def close_input(self, stage):
+        """Record that one feeding stage finished; once all have, tell every worker of the stage to stop."""
+        with self.lock:
+            stage.open_inputs -= 1
+            closed = stage.open_inputs == 0
+        if closed:
+            for _ in range(stage.workers):
+                stage.inbox.put(DONE)
+
+    def run(self, first, items):
+        """Feed items to the first stage from this thread and wait until every stage has drained."""
+        for stage in self.stages.values():
+            stage.open_inputs = sum(stage.name in other.outputs for other in self.stages.values())
+        self.stages[first].open_inputs += 1  # The feed from this thread
+
+        threads = [threading.Thread(target=self.work, args=(stage,), name=f'{stage.name}-{index}', daemon=True)
+                   for stage in self.stages.values() for index in range(stage.workers)]
+        for thread in threads:
+            thread.start()
+        for item in items:
+            self.put(self.stages[first], item)
+        self.close_input(self.stages[first])
+        for thread in threads:
+            thread.join()
+
+    def report(self):
+        """Print how many items each stage processed, its errors and its input queue's peak depth."""
+        for stage in self.stages.values():
+            print(f"Stage {stage.name}: {stage.processed} items, {stage.errors} errors, {stage.workers} workers, "
+                  f"queue peak {stage.peak_depth}/{stage.inbox.maxsize}")
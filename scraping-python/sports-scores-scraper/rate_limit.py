@@ -0,0 +1,145 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+def parse_retry_after(value):
+    """Return the seconds to wait from a Retry-After header (delta-seconds or an HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostRateLimiter:
+    """Token-bucket rate limit with AIMD concurrency for requests to one host.
+
+    While responses succeed, the number of requests in flight grows additively by about one per round of
+    responses and the request rate by rate_increase every second; both are cut multiplicatively when the host
+    throttles (429, 5xx or a connection error). A Retry-After from the host pauses every request to it until
+    that time. The result settles near the highest rate and concurrency the host sustains.
+    """
+
+    def __init__(self, max_concurrency=8, initial_concurrency=None, min_concurrency=1, max_rate=10.0, min_rate=0.5,
+                 rate_increase=1.0, decrease=0.7, cooldown=1.0):
+        """Create the limiter.
+
+        Args:
+            max_concurrency (int): Upper bound on requests in flight.
+            initial_concurrency (int): Requests in flight allowed at first; defaults to half of max_concurrency.
+            min_concurrency (int): Lower bound that throttling never cuts below.
+            max_rate (float): Upper bound on requests per second, or None for no rate limit.
+            min_rate (float): Lower bound on requests per second.
+            rate_increase (float): Requests per second added to the rate for every second of successes.
+            decrease (float): Factor applied to concurrency and rate when the host throttles.
+            cooldown (float): Seconds to pause after a throttle without Retry-After; throttles within this
+                window of a cut count as the same congestion event and are not cut again.
+        """
+        self.condition = threading.Condition()
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = float(initial_concurrency or max(min_concurrency, max_concurrency // 2))
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate = max_rate
+        self.rate_increase = rate_increase
+        self.tokens = 1.0
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = float('-inf')
+        self.successes = 0
+        self.throttles = 0
+
+    def refill(self, now):
+        """Add the tokens earned since the last refill, up to one: requests are spaced evenly, never burst."""
+        if self.rate is not None:
+            self.tokens = min(1.0, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self):
+        """Block until a request to the host may start; every acquire must be paired with a release."""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                self.refill(now)
+                if now < self.blocked_until:
+                    timeout = self.blocked_until - now
+                elif self.in_flight >= int(self.limit):
+                    timeout = None  # Woken by a release
+                elif self.rate is not None and self.tokens < 1:
+                    timeout = (1 - self.tokens) / self.rate
+                else:
+                    if self.rate is not None:
+                        self.tokens -= 1
+                    self.in_flight += 1
+                    return
+                self.condition.wait(timeout)
+
+    def release(self, throttled=False, retry_after=None):
+        """Finish a request and adapt to its outcome.
+
+        Args:
+            throttled (bool): Whether the host answered 429 or 5xx, or the request failed to connect.
+            retry_after (float): Seconds the host asked to wait, from its Retry-After header.
+        """
+        with self.condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                self.throttles += 1
+                self.blocked_until = max(self.blocked_until,
+                                         now + (retry_after if retry_after is not None else self.cooldown))
+                if now - self.last_decrease >= self.cooldown:
+                    self.last_decrease = now
+                    self.limit = max(self.min_concurrency, self.limit * self.decrease)
+                    if self.rate is not None:
+                        self.rate = max(self.min_rate, self.rate * self.decrease)
+            else:
+                self.successes += 1
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                if self.rate is not None:
+                    # One success per 1 / rate seconds, so the rate climbs by rate_increase per second
+                    self.rate = min(self.max_rate, self.rate + self.rate_increase / self.rate)
+            self.condition.notify_all()
+
+    def report(self):
+        """Return a one-line summary of the limiter's state."""
+        rate = f"{self.rate:.1f}/s" if self.rate is not None else "unlimited"
+        return (f"{self.successes} ok, {self.throttles} throttled, concurrency {self.limit:.1f}/{self.max_concurrency}, "
+                f"rate {rate}")
+
+
+class RateLimiters:
+    """One HostRateLimiter per host, created on first use with the same options."""
+
+    def __init__(self, **options):
+        self.options = options
+        self.lock = threading.Lock()
+        self.hosts = {}
+
+    def for_url(self, url):
+        """Return the limiter of the URL's host."""
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostRateLimiter(**self.options)
+            return self.hosts[host]
+
+    def report(self):
+        """Print every host's limiter state."""
+        for host, limiter in self.hosts.items():
+            print(f"Rate limit {host}: {limiter.report()}")
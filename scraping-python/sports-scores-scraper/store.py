@@ -0,0 +1,167 @@
+import os
+import shutil
+import sys
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # For scraping_common
+from scraping_common.records import GameScore, to_columns  # noqa: E402
+
+# Columns stored in each partition file; Date and season live in the partition path
+SCHEMA = pa.schema([
+    ('Home Team', pa.string()),
+    ('Home Score', pa.int32()),
+    ('Away Team', pa.string()),
+    ('Away Score', pa.int32()),
+    ('Highlights Link', pa.string()),
+])
+# Game details, one file per game in each date partition
+LINE_SCORE_SCHEMA = pa.schema([
+    ('Game', pa.string()),
+    ('Team', pa.string()),
+    ('Periods', pa.list_(pa.int32())),
+    ('Total', pa.int32()),
+])
+PLAYER_STATS_SCHEMA = pa.schema([
+    ('Game', pa.string()),
+    ('Team', pa.string()),
+    ('Player', pa.string()),
+    ('Starter', pa.bool_()),
+    ('MIN', pa.string()),
+    ('FG', pa.string()),
+    ('3PT', pa.string()),
+    ('FT', pa.string()),
+    ('OREB', pa.int32()),
+    ('DREB', pa.int32()),
+    ('REB', pa.int32()),
+    ('AST', pa.int32()),
+    ('STL', pa.int32()),
+    ('BLK', pa.int32()),
+    ('TO', pa.int32()),
+    ('PF', pa.int32()),
+    ('+/-', pa.int32()),
+    ('PTS', pa.int32()),
+])
+PARTITIONING = ds.partitioning(pa.schema([('season', pa.int32()), ('date', pa.string())]), flavor='hive')
+
+
+def season_of(date_str):
+    """Return the season a date belongs to, named by the year it starts (the 2024-25 season is 2024)."""
+    day = datetime.strptime(date_str, '%Y-%m-%d')
+    return day.year if day.month >= 7 else day.year - 1
+
+
+class ScoreStore:
+    """Append-only Parquet store of game scores partitioned as season=<year>/date=<YYYY-MM-DD>.
+
+    Each scraped date is written to its own partition as soon as it is parsed, and re-scraping a date replaces
+    only that partition. Range queries prune partitions by season and date, so reads only touch matching files.
+    """
+
+    def __init__(self, root):
+        """Use (or create) the store rooted at the given directory."""
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def partition_dir(self, date_str):
+        """Return the partition directory for a date."""
+        return os.path.join(self.root, f'season={season_of(date_str)}', f'date={date_str}')
+
+    def write_date(self, date_str, scores):
+        """Replace the partition for a date with the given GameScore records."""
+        rows = [score for score in scores if score.date == date_str]
+        partition = self.partition_dir(date_str)
+        if not rows:
+            shutil.rmtree(partition, ignore_errors=True)
+            return
+
+        # The records are transposed into columns in one batch; Date lives in the partition path
+        columns = to_columns(rows, GameScore)
+        for column in ('Home Score', 'Away Score'):
+            columns[column] = [none_if_na(value) for value in columns[column]]
+        table = pa.Table.from_pydict({name: columns[name] for name in SCHEMA.names}, schema=SCHEMA)
+
+        write_file(partition, 'part-0.parquet', table)
+
+    def dataset(self):
+        """Open the store as a pyarrow dataset."""
+        return ds.dataset(self.root, format='parquet', partitioning=PARTITIONING,
+                          exclude_invalid_files=True, ignore_prefixes=['.', '_'])
+
+    def range_filter(self, start_date, end_date):
+        """Build a filter expression for dates between start_date and end_date (inclusive)."""
+        start_str, end_str = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+        return ((ds.field('season') >= season_of(start_str)) & (ds.field('season') <= season_of(end_str)) &
+                (ds.field('date') >= start_str) & (ds.field('date') <= end_str))
+
+    def scan(self, start_date, end_date, columns=None, filter=None, batch_size=64 * 1024):
+        """Yield record batches for a date range, pushing the date range and any extra filter down to the scan.
+
+        Args:
+            start_date (datetime): First date to load.
+            end_date (datetime): Last date to load.
+            columns (list): Columns to load; defaults to all columns plus 'date'.
+            filter (pyarrow.dataset.Expression): Extra predicate, e.g. ds.field('Home Team') == 'Celtics'.
+            batch_size (int): Maximum rows per record batch.
+        """
+        expression = self.range_filter(start_date, end_date)
+        if filter is not None:
+            expression = expression & filter
+        if columns is not None and 'date' not in columns:
+            columns = ['date'] + list(columns)
+        yield from self.dataset().to_batches(columns=columns, filter=expression, batch_size=batch_size)
+
+    def load(self, start_date, end_date, columns=None, filter=None):
+        """Load a date range into a pandas DataFrame sorted by date, in the same column layout as the CSV output."""
+        batches = list(self.scan(start_date, end_date, columns=columns, filter=filter))
+        if batches:
+            table = pa.Table.from_batches(batches)
+        else:
+            table = pa.table({'date': pa.array([], pa.string())})
+        df = table.to_pandas().rename(columns={'date': 'Date'})
+        df['Date'] = df['Date'].astype('datetime64[ns]')
+        df = df[['Date'] + [column for column in df.columns if column not in ('Date', 'season')]]
+        return df.sort_values(by='Date', kind='stable').reset_index(drop=True)
+
+
+class GameStore:
+    """Parquet store of game details: line_scores/ and player_stats/, partitioned like the score store.
+
+    Each game is written to its own file in its date's partition as soon as its page is parsed, so a backfill
+    never holds more than one game in memory, and re-scraping a game replaces only that game's files.
+    """
+
+    SCHEMAS = {'line_scores': LINE_SCORE_SCHEMA, 'player_stats': PLAYER_STATS_SCHEMA}
+
+    def __init__(self, root):
+        """Use (or create) the store rooted at the given directory."""
+        self.root = root
+        self.tables = {name: ScoreStore(os.path.join(root, name)) for name in self.SCHEMAS}
+
+    def write_game(self, date_str, game_id, details):
+        """Replace a game's files with its details, a {table name: rows} dict (see games.parse_game_page)."""
+        for name, schema in self.SCHEMAS.items():
+            rows = details.get(name, [])
+            table = pa.Table.from_pydict({field.name: [row.get(field.name) for row in rows] for field in schema},
+                                         schema=schema)
+            write_file(self.tables[name].partition_dir(date_str), f'game-{game_id}.parquet', table)
+
+    def load(self, name, start_date, end_date, columns=None, filter=None):
+        """Load a date range of one table, 'line_scores' or 'player_stats', into a DataFrame; see ScoreStore.load."""
+        return self.tables[name].load(start_date, end_date, columns=columns, filter=filter)
+
+
+def write_file(partition, name, table):
+    """Write a table into a partition directory under the given file name, replacing any previous file."""
+    # Write next to the target and rename, so readers never see a half-written file
+    os.makedirs(partition, exist_ok=True)
+    tmp_path = os.path.join(partition, f'.{name}.tmp')  # Dot prefix keeps it out of dataset scans
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, os.path.join(partition, name))
+
+
+def none_if_na(value):
+    """Map the 'N/A' placeholder used by the parsers to a null score."""
+    return None if value == 'N/A' else value
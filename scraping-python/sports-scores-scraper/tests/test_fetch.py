@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+from test_scoreboard_parsers import scores_main  # noqa: E402
+
+
+class BrokenSession:
+    """Session whose requests fail with an error that is not a requests.RequestException."""
+
+    def get(self, url, **kwargs):
+        raise ValueError('broken response')
+
+    def close(self):
+        pass
+
+
+def test_unexpected_error_releases_the_rate_limiter():
+    scraper = scores_main.YahooSportsScoresScraper(base_url='http://scores.invalid/', cache_dir=None, max_workers=2)
+    scraper.session = BrokenSession()
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            scraper.fetch_url('http://scores.invalid/?date=2024-10-22', 'nba', '2024-10-22', False)
+    limiter = scraper.limiters.for_url('http://scores.invalid/')
+    assert limiter.in_flight == 0
+    assert limiter.throttles == 3
+    scraper.close()
@@ -0,0 +1,35 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(PROJECT_DIR, 'fixtures')
+
+# Every project names its module main, so load this one under its own name to run next to the other projects' tests
+sys.path.insert(0, PROJECT_DIR)
+spec = importlib.util.spec_from_file_location('sports_scores_main', os.path.join(PROJECT_DIR, 'main.py'))
+scores_main = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(scores_main)
+
+SCOREBOARDS = sorted(name for name in os.listdir(FIXTURES_DIR) if name.startswith('scoreboard_'))
+
+
+def read_scoreboard(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as file:
+        return name[len('scoreboard_'):-len('.html')], file.read()
+
+
+@pytest.mark.parametrize('name', SCOREBOARDS)
+def test_parsers_return_identical_rows(name):
+    date_str, html_content = read_scoreboard(name)
+    rows = {parser: parse(html_content, date_str) for parser, parse in scores_main.PARSERS.items()}
+    assert rows['lxml'] == rows['html.parser']
+
+
+def test_scoreboard_with_games_is_parsed():
+    date_str, html_content = read_scoreboard('scoreboard_2024-10-22.html')
+    scores = scores_main.parse_scores_lxml(html_content, date_str)
+    assert scores
+    assert all(score.date == '2024-10-22' and isinstance(score.home_score, int) for score in scores)
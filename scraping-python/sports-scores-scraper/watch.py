@@ -0,0 +1,192 @@
+import argparse
+import hashlib
+import json
+import sys
+import time
+from collections import deque
+from datetime import datetime
+import requests
+from lxml import html as lxml_html
+from main import GAMES_XPATH, RETRYABLE_STATUSES, YahooSportsScoresScraper, parse_game_lxml
+from rate_limit import parse_retry_after
+
+LATENCY_WINDOW = 1000  # Recent poll-to-event latencies kept for the p50
+
+
+def game_status(game):
+    """Return 'final' for finished games and 'live' for games that have a score but are not final yet."""
+    return 'final' if 'Final' in game.text_content() else 'live'
+
+
+def parse_live_games(html_content, date_str):
+    """Parse the current scoreboard into {(away team, home team): row} with a 'Status' column on each row."""
+    games = {}
+    tree = lxml_html.fromstring(html_content)
+    for game in GAMES_XPATH(tree):
+        try:
+            score_info = parse_game_lxml(game, date_str)
+        except Exception as e:
+            print(f"Error parsing game on {date_str}: {e}", file=sys.stderr)
+            continue
+        if score_info:
+            row = {**score_info.as_dict(), 'Status': game_status(game)}
+            games[(row['Away Team'], row['Home Team'])] = row
+    return games
+
+
+def print_event(event):
+    """Write an event to stdout as one JSON line."""
+    print(json.dumps(event), flush=True)
+
+
+class ScoreboardWatcher:
+    """Poll today's scoreboard and emit only the games that changed.
+
+    The poll interval drops to min_interval while any game is live and doubles up to max_interval while none
+    are. Polls use conditional GETs, and bodies whose content hash is unchanged are not parsed again.
+    """
+
+    def __init__(self, scraper, on_event=print_event, min_interval=15, max_interval=300):
+        """Watch through the given scraper's session; on_event is called with each event dict."""
+        self.scraper = scraper
+        self.on_event = on_event
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.retry_after = None
+        self.date_str = None
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+        self.games = {}
+        self.started_at = time.time()
+        self.requests = 0
+        self.not_modified = 0
+        self.unchanged_bodies = 0
+        self.events = 0
+        # The latency p50 covers the most recent events only, so a watcher left running for a season stays small
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.max_latency = 0.0
+
+    def reset(self, date_str):
+        """Start tracking a new scoreboard date."""
+        self.date_str = date_str
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+        self.games = {}
+
+    def fetch(self):
+        """Conditionally fetch today's scoreboard; return the body, or None if it has not changed."""
+        self.retry_after = None
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        url = f'{self.scraper.base_url}?confId=&dateRange={self.date_str}&schedState='
+        response = self.scraper.session.get(url, headers=headers, timeout=self.scraper.timeout)
+        self.requests += 1
+        if response.status_code == 304:
+            self.not_modified += 1
+            return None
+        if response.status_code in RETRYABLE_STATUSES:
+            # Honoured by run() even past max_interval
+            self.retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        response.raise_for_status()
+
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        if body_hash == self.body_hash:
+            self.unchanged_bodies += 1
+            return None
+        self.body_hash = body_hash
+        return response.text
+
+    def diff(self, games):
+        """Yield (event type, row) for every game that is new, changed score, or went final."""
+        for key, row in games.items():
+            previous = self.games.get(key)
+            if previous is None:
+                yield 'final' if row['Status'] == 'final' else 'new', row
+            elif previous['Status'] != 'final' and row['Status'] == 'final':
+                yield 'final', row
+            elif (previous['Home Score'], previous['Away Score']) != (row['Home Score'], row['Away Score']):
+                yield 'score', row
+
+    def poll(self):
+        """Poll once, emit events for changed games, and return the number of events emitted."""
+        poll_started = time.perf_counter()
+        date_str = datetime.now().strftime('%Y-%m-%d')
+        if date_str != self.date_str:
+            self.reset(date_str)
+
+        html_content = self.fetch()
+        if html_content is None:
+            self.adapt_interval(0)
+            return 0
+
+        games = parse_live_games(html_content, date_str)
+        emitted = 0
+        for event_type, row in self.diff(games):
+            latency = time.perf_counter() - poll_started
+            self.latencies.append(latency)
+            self.max_latency = max(self.max_latency, latency)
+            self.on_event({'Event': event_type, **row, 'Latency Ms': round(latency * 1000, 1)})
+            emitted += 1
+        self.events += emitted
+        self.games = games
+        self.adapt_interval(emitted)
+        return emitted
+
+    def adapt_interval(self, emitted):
+        """Poll fast while games are live, and back off while the slate is idle, scheduled or finished."""
+        if any(row['Status'] == 'live' for row in self.games.values()):
+            self.interval = self.min_interval
+        elif not emitted:
+            self.interval = min(self.interval * 2, self.max_interval)
+
+    def metrics(self):
+        """Return request counts, requests per hour and poll-to-event latency statistics."""
+        hours = max(time.time() - self.started_at, 1e-9) / 3600
+        latencies = sorted(self.latencies)
+        return {
+            'requests': self.requests,
+            'requests_per_hour': round(self.requests / hours, 1),
+            'not_modified': self.not_modified,
+            'unchanged_bodies': self.unchanged_bodies,
+            'events': self.events,
+            'latency_ms_p50': round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            'latency_ms_max': round(self.max_latency * 1000, 1) if latencies else None,
+            'interval_s': self.interval,
+        }
+
+    def run(self, max_polls=None):
+        """Poll until interrupted (or for max_polls polls), then print the metrics to stderr."""
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                try:
+                    self.poll()
+                except requests.RequestException as e:
+                    print(f"Poll failed for {self.date_str}: {e}", file=sys.stderr)
+                    self.interval = max(min(self.interval * 2, self.max_interval), self.retry_after or 0)
+                polls += 1
+                if max_polls is None or polls < max_polls:
+                    time.sleep(self.interval)
+        except KeyboardInterrupt:
+            pass
+        print(json.dumps({'metrics': self.metrics()}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream changed NBA games from today's scoreboard as JSON lines.")
+    parser.add_argument('--min-interval', type=float, default=15, help='Seconds between polls while games are live.')
+    parser.add_argument('--max-interval', type=float, default=300, help='Longest wait between polls when idle.')
+    args = parser.parse_args()
+
+    scraper = YahooSportsScoresScraper(cache_dir=None)
+    ScoreboardWatcher(scraper, min_interval=args.min_interval, max_interval=args.max_interval).run()
+    scraper.close()